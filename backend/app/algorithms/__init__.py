@@ -1,10 +1,31 @@
 from .base import SearchAlgorithm
+from .csr import CSRGraph, as_csr, shortest_path_lengths, shortest_path_tree
 from .bfs import BFSAlgorithm
 from .dfs import DFSAlgorithm
 from .ucs import UCSAlgorithm
 from .astar import AStarAlgorithm
 from .dijkstra import DijkstraAlgorithm
 from .bidirectional import BidirectionalAlgorithm
+from .bidirectional_dijkstra import BidirectionalDijkstraAlgorithm
+from .ch import CHAlgorithm, ContractionHierarchy
+from .matrix import MatrixAlgorithm, DistanceMatrix
+from .many_to_many import one_to_many_distances, many_to_many_distances
+from .tour import optimize_tour, nearest_neighbor_tour, tour_length
+from .vrp import VRPProblem, VRPSolution, solve_vrp
+from .ksp import KShortestPaths
+from .dynamic import EdgeChange, update_distances
+from .traffic import TrafficProfiles
+from .time_dependent import TimeDependentAStar
+from .snapshot import read_snapshot, write_snapshot
+from .heuristics import (
+    Heuristic,
+    ZeroHeuristic,
+    HaversineHeuristic,
+    LandmarkHeuristic,
+    MaxHeuristic,
+    build_heuristic,
+    find_landmarks,
+)
 
 ALGORITHMS = {
     "bfs": BFSAlgorithm,
@@ -13,15 +34,49 @@ ALGORITHMS = {
     "astar": AStarAlgorithm,
     "dijkstra": DijkstraAlgorithm,
     "bidirectional": BidirectionalAlgorithm,
+    "bidirectional_dijkstra": BidirectionalDijkstraAlgorithm,
+    "ch": CHAlgorithm,
+    "matrix": MatrixAlgorithm,
 }
 
 __all__ = [
     "SearchAlgorithm",
+    "CSRGraph",
+    "as_csr",
+    "shortest_path_lengths",
+    "shortest_path_tree",
     "BFSAlgorithm",
     "DFSAlgorithm",
     "UCSAlgorithm",
     "AStarAlgorithm",
     "DijkstraAlgorithm",
     "BidirectionalAlgorithm",
+    "BidirectionalDijkstraAlgorithm",
+    "CHAlgorithm",
+    "ContractionHierarchy",
+    "MatrixAlgorithm",
+    "DistanceMatrix",
+    "one_to_many_distances",
+    "many_to_many_distances",
+    "optimize_tour",
+    "nearest_neighbor_tour",
+    "tour_length",
+    "VRPProblem",
+    "VRPSolution",
+    "solve_vrp",
+    "KShortestPaths",
+    "EdgeChange",
+    "update_distances",
+    "TrafficProfiles",
+    "TimeDependentAStar",
+    "read_snapshot",
+    "write_snapshot",
     "ALGORITHMS",
+    "Heuristic",
+    "ZeroHeuristic",
+    "HaversineHeuristic",
+    "LandmarkHeuristic",
+    "MaxHeuristic",
+    "build_heuristic",
+    "find_landmarks",
 ]
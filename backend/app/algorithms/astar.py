@@ -1,47 +1,49 @@
-from typing import List, Tuple
+from typing import List, Tuple, Optional, Union
+import heapq
 import networkx as nx
-from .base import SearchAlgorithm
+from .base import SearchAlgorithm, reconstruct_path
+from .csr import CSRGraph
+from .heuristics import Heuristic, ZeroHeuristic
 
 
 class AStarAlgorithm(SearchAlgorithm):
     """A* Search Algorithm"""
 
-    def heuristic(self, node: str, goal: str) -> float:
-        """
-        Heuristic function that estimates the cost from node to goal.
-        Uses actual shortest path length as heuristic (admissible and consistent).
-        """
-        try:
-            return nx.shortest_path_length(self.graph, node, goal, weight="distance")
-        except nx.NetworkXNoPath:
-            return float('inf')
+    def __init__(self, graph: Union[CSRGraph, nx.Graph], heuristic: Optional[Heuristic] = None):
+        super().__init__(graph)
+        # Precomputed heuristics are built once per graph load by GraphService;
+        # without one A* falls back to h = 0 and behaves like Dijkstra.
+        self.heuristic = heuristic or ZeroHeuristic()
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         A* uses both actual cost and heuristic estimate.
         Guarantees optimal path with admissible heuristic.
         """
-        frontier = [(start, [start], 0)]
-        visited = set()
+        h = self.heuristic.bind(goal)
+
+        # Priority queue: (f, g, state)
+        frontier = [(h(start), 0, start)]
+        best_cost = {start: 0}
+        parents = {start: None}
 
         while frontier:
-            (state, path, cost) = frontier.pop(0)
+            _, cost, state = heapq.heappop(frontier)
 
-            if state in visited:
+            # Skip stale entries superseded by a cheaper push
+            if cost > best_cost[state]:
                 continue
 
-            visited.add(state)
             self.nodes_explored += 1
 
             if state == goal:
-                return path, cost
-
-            for neighbor in self.graph[state]:
-                if neighbor not in visited:
-                    new_cost = cost + self.graph[state][neighbor]["distance"]
-                    frontier.append((neighbor, path + [neighbor], new_cost))
+                return reconstruct_path(parents, goal), cost
 
-            # Sort by f(n) = g(n) + h(n)
-            frontier.sort(key=lambda x: x[2] + self.heuristic(x[0], goal))
+            for neighbor, distance in self.graph.neighbors(state):
+                new_cost = cost + distance
+                if new_cost < best_cost.get(neighbor, float('inf')):
+                    best_cost[neighbor] = new_cost
+                    parents[neighbor] = state
+                    heapq.heappush(frontier, (new_cost + h(neighbor), new_cost, neighbor))
 
-        raise Exception(f"No path found from {start} to {goal}")
+        return None
@@ -1,24 +1,83 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional, Union
 import time
 import networkx as nx
+from .csr import CSRGraph, as_csr
+
+
+def reconstruct_path(parents: Dict[int, Optional[int]], goal: int) -> List[int]:
+    """
+    Walk predecessor links back from goal to the root (whose parent is None).
+    Searches record one parent per node instead of copying a path per push.
+    """
+    path = [goal]
+    parent = parents[goal]
+    while parent is not None:
+        path.append(parent)
+        parent = parents[parent]
+    path.reverse()
+    return path
+
+
+def join_paths(
+    forward_parents: Dict[int, Optional[int]],
+    backward_parents: Dict[int, Optional[int]],
+    meeting: int
+) -> List[int]:
+    """Join a forward and a backward search tree at their meeting node"""
+    forward = reconstruct_path(forward_parents, meeting)
+    backward = reconstruct_path(backward_parents, meeting)
+    return forward + backward[-2::-1]
 
 
 class SearchAlgorithm(ABC):
     """Base class for all search algorithms"""
 
-    def __init__(self, graph: nx.Graph):
-        self.graph = graph
+    def __init__(self, graph: Union[CSRGraph, nx.Graph]):
+        # Searches run over the integer-id CSR snapshot; networkx graphs are converted once
+        self.graph = as_csr(graph)
         self.nodes_explored = 0
+        # Wall time of the last execute(), from the monotonic perf counter
+        self.execution_time_ns = 0
         self.execution_time = 0.0
 
     @abstractmethod
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
+        """
+        Search for a path between node ids of the CSR snapshot.
+        Returns: (path of node ids, total_distance), or None if goal is unreachable
+        """
+        pass
+
+    def _search_many(self, start: int, goals: List[int]) -> Dict[int, Tuple[List[int], float]]:
+        """
+        Search from one start to several goals.
+        Returns: {goal: (path of node ids, total_distance)} for every reachable goal
+
+        Searches that grow a single-source tree override this to answer all
+        goals with one search; the default runs one search per goal.
+        """
+        results = {}
+        for goal in dict.fromkeys(goals):
+            result = self._search(start, goal)
+            if result is not None:
+                results[goal] = result
+        return results
+
     def search(self, start: str, goal: str) -> Tuple[List[str], float]:
         """
         Search for a path from start to goal.
         Returns: (path, total_distance)
         """
-        pass
+        if start not in self.graph or goal not in self.graph:
+            raise Exception(f"No path found from {start} to {goal}")
+
+        result = self._search(self.graph.node_id(start), self.graph.node_id(goal))
+        if result is None:
+            raise Exception(f"No path found from {start} to {goal}")
+
+        path, distance = result
+        return self.graph.to_names(path), distance
 
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Return performance metrics for the search"""
@@ -27,14 +86,18 @@ class SearchAlgorithm(ABC):
             "execution_time": self.execution_time,
         }
 
+    def _set_execution_time(self, start_ns: int):
+        self.execution_time_ns = time.perf_counter_ns() - start_ns
+        self.execution_time = self.execution_time_ns / 1e9
+
     def execute(self, start: str, goal: str) -> Dict[str, Any]:
         """Execute the search and return results with metrics"""
         self.nodes_explored = 0
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
 
         try:
             path, distance = self.search(start, goal)
-            self.execution_time = time.time() - start_time
+            self._set_execution_time(start_time)
 
             return {
                 "algorithm": self.__class__.__name__,
@@ -46,7 +109,7 @@ class SearchAlgorithm(ABC):
                 "error": None
             }
         except Exception as e:
-            self.execution_time = time.time() - start_time
+            self._set_execution_time(start_time)
             return {
                 "algorithm": self.__class__.__name__,
                 "path": [],
@@ -56,3 +119,31 @@ class SearchAlgorithm(ABC):
                 "success": False,
                 "error": str(e)
             }
+
+    def execute_many(self, start: str, goals: List[str]) -> List[Dict[str, Any]]:
+        """
+        Execute searches from start to each goal and return one result per goal.
+        Metrics describe the shared search, so every result reports its totals.
+        """
+        self.nodes_explored = 0
+        start_time = time.perf_counter_ns()
+
+        ids = self.graph.ids
+        found = {}
+        if start in ids:
+            found = self._search_many(ids[start], [ids[goal] for goal in goals if goal in ids])
+        self._set_execution_time(start_time)
+
+        results = []
+        for goal in goals:
+            result = found.get(ids.get(goal))
+            results.append({
+                "algorithm": self.__class__.__name__,
+                "path": self.graph.to_names(result[0]) if result else [],
+                "total_distance": result[1] if result else 0,
+                "nodes_explored": self.nodes_explored,
+                "execution_time": self.execution_time,
+                "success": result is not None,
+                "error": None if result else f"No path found from {start} to {goal}"
+            })
+        return results
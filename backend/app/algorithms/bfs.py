@@ -1,29 +1,39 @@
-from typing import List, Tuple
-from .base import SearchAlgorithm
+from typing import Dict, List, Tuple, Optional
+from collections import deque
+from .base import SearchAlgorithm, reconstruct_path
 
 
 class BFSAlgorithm(SearchAlgorithm):
     """Breadth-First Search Algorithm"""
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         BFS explores all neighbors at the current depth before moving deeper.
         Does not guarantee shortest path by distance, but finds path with fewest nodes.
         """
-        queue = [(start, [start], 0)]
-        visited = {start}
+        return self._search_many(start, [goal]).get(goal)
 
-        while queue:
-            (state, path, cost) = queue.pop(0)
+    def _search_many(self, start: int, goals: List[int]) -> Dict[int, Tuple[List[int], float]]:
+        """One breadth-first tree from start answers every goal"""
+        remaining = set(goals)
+        results = {}
+        queue = deque([(start, 0)])
+        # Parent pointers double as the visited set
+        parents = {start: None}
+
+        while queue and remaining:
+            (state, cost) = queue.popleft()
             self.nodes_explored += 1
 
-            if state == goal:
-                return path, cost
+            if state in remaining:
+                remaining.discard(state)
+                results[state] = (reconstruct_path(parents, state), cost)
+                if not remaining:
+                    break
 
-            for neighbor in self.graph[state]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_cost = cost + self.graph[state][neighbor]["distance"]
-                    queue.append((neighbor, path + [neighbor], new_cost))
+            for neighbor, distance in self.graph.neighbors(state):
+                if neighbor not in parents:
+                    parents[neighbor] = state
+                    queue.append((neighbor, cost + distance))
 
-        raise Exception(f"No path found from {start} to {goal}")
+        return results
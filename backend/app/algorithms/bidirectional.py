@@ -1,11 +1,12 @@
-from typing import List, Tuple, Set, Dict
-from .base import SearchAlgorithm
+from typing import List, Tuple, Optional
+from collections import deque
+from .base import SearchAlgorithm, join_paths
 
 
 class BidirectionalAlgorithm(SearchAlgorithm):
     """Bidirectional Search Algorithm"""
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         Searches from both start and goal simultaneously.
         Can be faster than unidirectional search.
@@ -14,48 +15,48 @@ class BidirectionalAlgorithm(SearchAlgorithm):
             return [start], 0
 
         # Forward search from start
-        forward_queue = [(start, [start], 0)]
-        forward_visited = {start: ([], 0)}
+        forward_queue = deque([(start, 0)])
+        forward_parents = {start: None}
+        forward_cost = {start: 0}
 
         # Backward search from goal
-        backward_queue = [(goal, [goal], 0)]
-        backward_visited = {goal: ([], 0)}
+        backward_queue = deque([(goal, 0)])
+        backward_parents = {goal: None}
+        backward_cost = {goal: 0}
 
         while forward_queue and backward_queue:
             # Expand forward
             if forward_queue:
-                f_state, f_path, f_cost = forward_queue.pop(0)
+                f_state, f_cost = forward_queue.popleft()
                 self.nodes_explored += 1
 
                 # Check if paths meet
-                if f_state in backward_visited:
-                    b_path, b_cost = backward_visited[f_state]
-                    total_path = f_path + list(reversed(b_path[:-1]))
-                    return total_path, f_cost + b_cost
-
-                for neighbor in self.graph[f_state]:
-                    if neighbor not in forward_visited:
-                        new_cost = f_cost + self.graph[f_state][neighbor]["distance"]
-                        new_path = f_path + [neighbor]
-                        forward_queue.append((neighbor, new_path, new_cost))
-                        forward_visited[neighbor] = (new_path, new_cost)
+                if f_state in backward_parents:
+                    total_path = join_paths(forward_parents, backward_parents, f_state)
+                    return total_path, f_cost + backward_cost[f_state]
+
+                for neighbor, distance in self.graph.neighbors(f_state):
+                    if neighbor not in forward_parents:
+                        new_cost = f_cost + distance
+                        forward_queue.append((neighbor, new_cost))
+                        forward_parents[neighbor] = f_state
+                        forward_cost[neighbor] = new_cost
 
             # Expand backward
             if backward_queue:
-                b_state, b_path, b_cost = backward_queue.pop(0)
+                b_state, b_cost = backward_queue.popleft()
                 self.nodes_explored += 1
 
                 # Check if paths meet
-                if b_state in forward_visited:
-                    f_path, f_cost = forward_visited[b_state]
-                    total_path = f_path + list(reversed(b_path[:-1]))
-                    return total_path, f_cost + b_cost
-
-                for neighbor in self.graph[b_state]:
-                    if neighbor not in backward_visited:
-                        new_cost = b_cost + self.graph[b_state][neighbor]["distance"]
-                        new_path = b_path + [neighbor]
-                        backward_queue.append((neighbor, new_path, new_cost))
-                        backward_visited[neighbor] = (new_path, new_cost)
-
-        raise Exception(f"No path found from {start} to {goal}")
+                if b_state in forward_parents:
+                    total_path = join_paths(forward_parents, backward_parents, b_state)
+                    return total_path, forward_cost[b_state] + b_cost
+
+                for neighbor, distance in self.graph.neighbors(b_state):
+                    if neighbor not in backward_parents:
+                        new_cost = b_cost + distance
+                        backward_queue.append((neighbor, new_cost))
+                        backward_parents[neighbor] = b_state
+                        backward_cost[neighbor] = new_cost
+
+        return None
@@ -0,0 +1,62 @@
+from typing import List, Tuple, Optional
+import heapq
+from .base import SearchAlgorithm, join_paths
+
+
+class BidirectionalDijkstraAlgorithm(SearchAlgorithm):
+    """Weighted Bidirectional Dijkstra's Algorithm"""
+
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
+        """
+        Runs Dijkstra forward from start and backward from goal with two heaps.
+        Stops once top_f + top_b >= best meeting distance, which guarantees the
+        shortest path while settling roughly half the nodes of one-way Dijkstra.
+        """
+        if start == goal:
+            return [start], 0
+
+        heaps = ([(0, start)], [(0, goal)])
+        costs = ({start: 0}, {goal: 0})
+        parents = ({start: None}, {goal: None})
+        settled = (set(), set())
+
+        best = float('inf')
+        meeting = None
+
+        while heaps[0] and heaps[1]:
+            # Drop entries superseded by a cheaper push
+            for side in (0, 1):
+                heap = heaps[side]
+                while heap and (heap[0][1] in settled[side] or heap[0][0] > costs[side][heap[0][1]]):
+                    heapq.heappop(heap)
+            if not heaps[0] or not heaps[1]:
+                break
+
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+
+            # Expand the side whose closest frontier node is nearer
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            cost, state = heapq.heappop(heaps[side])
+            settled[side].add(state)
+            self.nodes_explored += 1
+
+            own_costs, other_costs = costs[side], costs[1 - side]
+            for neighbor, distance in self.graph.neighbors(state):
+                if neighbor in settled[side]:
+                    continue
+                new_cost = cost + distance
+                if new_cost < own_costs.get(neighbor, float('inf')):
+                    own_costs[neighbor] = new_cost
+                    parents[side][neighbor] = state
+                    heapq.heappush(heaps[side], (new_cost, neighbor))
+
+                    # Both searches have reached this node: candidate path
+                    if neighbor in other_costs and new_cost + other_costs[neighbor] < best:
+                        best = new_cost + other_costs[neighbor]
+                        meeting = neighbor
+
+        if meeting is None:
+            return None
+
+        return join_paths(parents[0], parents[1], meeting), best
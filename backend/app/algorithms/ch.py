@@ -0,0 +1,274 @@
+from typing import Dict, List, Optional, Tuple, Union
+import heapq
+import networkx as nx
+import numpy as np
+from .base import SearchAlgorithm
+from .csr import CSRGraph, as_csr
+
+
+class ContractionHierarchy:
+    """
+    Contraction Hierarchies preprocessing for an undirected CSR snapshot.
+
+    Nodes are contracted one by one in order of importance; whenever removing
+    a node would lengthen a shortest path between two of its neighbors, a
+    shortcut edge is added between them. The result is stored as an upward
+    graph in CSR form (edges from each node to higher-ranked nodes), where
+    `up_middle` holds the contracted node a shortcut bypasses (-1 for roads).
+    Because the graph is undirected the same upward graph serves both the
+    forward and the backward query.
+
+    Contraction stops early if the remaining graph becomes too dense (as on
+    expander-like graphs). The leftover core nodes get the highest ranks and
+    keep every edge between them, so queries fall back to plain bidirectional
+    Dijkstra inside the core and distances stay exact.
+    """
+
+    def __init__(
+        self,
+        rank: np.ndarray,
+        up_indptr: np.ndarray,
+        up_indices: np.ndarray,
+        up_weights: np.ndarray,
+        up_middle: np.ndarray,
+    ):
+        self.rank = rank
+        self.up_indptr = up_indptr
+        self.up_indices = up_indices
+        self.up_weights = up_weights
+        self.up_middle = up_middle
+
+    @property
+    def num_shortcuts(self) -> int:
+        return int(np.count_nonzero(self.up_middle >= 0))
+
+    @classmethod
+    def build(
+        cls,
+        graph: Union[CSRGraph, nx.Graph],
+        witness_settle_limit: int = 200,
+        core_degree: int = 32
+    ) -> "ContractionHierarchy":
+        """
+        Contract nodes using the edge-difference ordering with lazy updates.
+        Witness searches settle at most `witness_settle_limit` nodes; hitting the
+        limit only adds a redundant shortcut, never a wrong distance. Nodes with
+        more than `core_degree` remaining neighbors are left in the core.
+        """
+        graph = as_csr(graph)
+        n = graph.num_nodes
+
+        # Remaining (not yet contracted) graph with the cheapest edge per pair
+        adjacency: List[Dict[int, float]] = [{} for _ in range(n)]
+        middle: Dict[Tuple[int, int], int] = {}
+        for u in range(n):
+            for v, weight in graph.neighbors(u):
+                if u != v and weight < adjacency[u].get(v, float('inf')):
+                    adjacency[u][v] = weight
+                    adjacency[v][u] = weight
+                    middle[(min(u, v), max(u, v))] = -1
+
+        def witness_distance(source: int, excluded: int, targets: set, limit: float) -> Dict[int, float]:
+            """Bounded Dijkstra in the remaining graph that avoids `excluded`"""
+            costs = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            remaining = set(targets)
+            while heap and remaining and settled < witness_settle_limit:
+                cost, node = heapq.heappop(heap)
+                if cost > costs[node]:
+                    continue
+                if cost > limit:
+                    break
+                settled += 1
+                remaining.discard(node)
+                for neighbor, weight in adjacency[node].items():
+                    if neighbor == excluded:
+                        continue
+                    new_cost = cost + weight
+                    if new_cost < costs.get(neighbor, float('inf')):
+                        costs[neighbor] = new_cost
+                        heapq.heappush(heap, (new_cost, neighbor))
+            return costs
+
+        def shortcuts(node: int) -> List[Tuple[int, int, float]]:
+            """Shortcuts needed to contract `node` without changing any distance"""
+            neighbors = list(adjacency[node].items())
+            needed = []
+            for i, (u, weight_u) in enumerate(neighbors):
+                targets = {w: weight_u + weight_w for w, weight_w in neighbors[i + 1:]}
+                if not targets:
+                    continue
+                costs = witness_distance(u, node, set(targets), max(targets.values()))
+                for w, via in targets.items():
+                    if costs.get(w, float('inf')) > via:
+                        needed.append((u, w, via))
+            return needed
+
+        deleted_neighbors = [0] * n
+
+        def priority(node: int, needed: List[Tuple[int, int, float]]) -> int:
+            return len(needed) - len(adjacency[node]) + deleted_neighbors[node]
+
+        heap = [(priority(node, shortcuts(node)), node) for node in range(n)]
+        heapq.heapify(heap)
+        rank = np.zeros(n, dtype=np.int64)
+        upward: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+        contracted = [False] * n
+        order = 0
+
+        while heap:
+            _, node = heapq.heappop(heap)
+            if contracted[node]:
+                continue
+
+            if len(adjacency[node]) > core_degree:
+                break
+
+            # Lazy update: priorities of remaining nodes drift as neighbors are contracted
+            needed = shortcuts(node)
+            current = priority(node, needed)
+            if heap and current > heap[0][0]:
+                heapq.heappush(heap, (current, node))
+                continue
+
+            for u, w, via in needed:
+                if via < adjacency[u].get(w, float('inf')):
+                    adjacency[u][w] = via
+                    adjacency[w][u] = via
+                    middle[(min(u, w), max(u, w))] = node
+
+            rank[node] = order
+            order += 1
+            contracted[node] = True
+            for neighbor, weight in adjacency[node].items():
+                upward[node].append((neighbor, weight, middle[(min(node, neighbor), max(node, neighbor))]))
+                del adjacency[neighbor][node]
+                deleted_neighbors[neighbor] += 1
+            adjacency[node] = {}
+
+        # Core: remaining nodes keep all edges among themselves, in both directions
+        for node in range(n):
+            if not contracted[node]:
+                rank[node] = order
+                order += 1
+                for neighbor, weight in adjacency[node].items():
+                    upward[node].append((neighbor, weight, middle[(min(node, neighbor), max(node, neighbor))]))
+
+        up_indptr = np.zeros(n + 1, dtype=np.int64)
+        up_indptr[1:] = np.cumsum([len(edges) for edges in upward])
+        return cls(
+            rank,
+            up_indptr,
+            np.array([v for edges in upward for v, _, _ in edges], dtype=np.int32),
+            np.array([w for edges in upward for _, w, _ in edges], dtype=np.float64),
+            np.array([m for edges in upward for _, _, m in edges], dtype=np.int32),
+        )
+
+    def upward_edges(self, node: int):
+        """Iterate (higher-ranked neighbor, weight, middle) triples of a node"""
+        lo, hi = self.up_indptr[node], self.up_indptr[node + 1]
+        return zip(
+            self.up_indices[lo:hi].tolist(),
+            self.up_weights[lo:hi].tolist(),
+            self.up_middle[lo:hi].tolist(),
+        )
+
+    def _middle(self, low: int, high: int) -> int:
+        """Middle node of the edge between `low` and a higher-ranked node `high`"""
+        for neighbor, _, mid in self.upward_edges(low):
+            if neighbor == high:
+                return mid
+        raise KeyError((low, high))
+
+    def unpack(self, u: int, v: int, mid: int) -> List[int]:
+        """Expand an upward-graph edge u-v into the road path from u to v"""
+        path = [u]
+        stack = [(u, v, mid)]
+        while stack:
+            a, b, m = stack.pop()
+            if m < 0:
+                path.append(b)
+                continue
+            # The bypassed node was contracted first, so it stores both halves
+            stack.append((m, b, self._middle(m, b)))
+            stack.append((a, m, self._middle(m, a)))
+        return path
+
+
+class CHAlgorithm(SearchAlgorithm):
+    """Contraction Hierarchies query"""
+
+    def __init__(self, graph: Union[CSRGraph, nx.Graph], hierarchy: Optional[ContractionHierarchy] = None):
+        super().__init__(graph)
+        # GraphService contracts the graph once per load; building here is a fallback
+        self.hierarchy = hierarchy or ContractionHierarchy.build(self.graph)
+
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
+        """
+        Bidirectional Dijkstra that only follows edges towards higher-ranked
+        nodes, then unpacks the shortcuts on the best path into real roads.
+        """
+        if start == goal:
+            return [start], 0
+
+        hierarchy = self.hierarchy
+        heaps = ([(0.0, start)], [(0.0, goal)])
+        costs = ({start: 0.0}, {goal: 0.0})
+        # parent node and middle of the upward edge used to reach each node
+        parents: Tuple[Dict[int, Tuple[int, int]], Dict[int, Tuple[int, int]]] = ({}, {})
+        best = float('inf')
+        meeting = None
+
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                cost, state = heapq.heappop(heap)
+                if cost > costs[side][state]:
+                    continue
+                # A side is done once nothing left in it can improve the best path
+                if cost >= best:
+                    heap.clear()
+                    continue
+
+                self.nodes_explored += 1
+                other = costs[1 - side].get(state)
+                if other is not None and cost + other < best:
+                    best = cost + other
+                    meeting = state
+
+                for neighbor, weight, mid in hierarchy.upward_edges(state):
+                    new_cost = cost + weight
+                    if new_cost < costs[side].get(neighbor, float('inf')):
+                        costs[side][neighbor] = new_cost
+                        parents[side][neighbor] = (state, mid)
+                        heapq.heappush(heap, (new_cost, neighbor))
+
+        if meeting is None:
+            return None
+
+        return self._unpack_path(parents, start, goal, meeting), best
+
+    def _unpack_path(self, parents, start: int, goal: int, meeting: int) -> List[int]:
+        """Follow both search trees from the meeting node and expand every shortcut"""
+        forward_edges = []
+        node = meeting
+        while node != start:
+            parent, mid = parents[0][node]
+            forward_edges.append((parent, node, mid))
+            node = parent
+        forward_edges.reverse()
+
+        backward_edges = []
+        node = meeting
+        while node != goal:
+            parent, mid = parents[1][node]
+            backward_edges.append((node, parent, mid))
+            node = parent
+
+        path = [start]
+        for u, v, mid in forward_edges + backward_edges:
+            path.extend(self.hierarchy.unpack(u, v, mid)[1:])
+        return path
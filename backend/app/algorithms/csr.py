@@ -0,0 +1,275 @@
+from typing import Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+import heapq
+import networkx as nx
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Immutable compressed-sparse-row snapshot of an undirected weighted graph.
+
+    Nodes are integer ids 0..n-1. The neighbors of node u are
+    indices[indptr[u]:indptr[u + 1]] with matching weights; every undirected
+    edge is stored once per direction. Names are only used to translate
+    requests and results at the API boundary.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[Hashable],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        latitudes: Optional[np.ndarray] = None,
+        longitudes: Optional[np.ndarray] = None,
+        populations: Optional[np.ndarray] = None,
+        ids: Optional[Mapping[Hashable, int]] = None,
+    ):
+        n = len(names)
+        # With `ids` given, names and ids are used as is (e.g. tables read from a snapshot file)
+        self.names = names if ids is not None else list(names)
+        self.ids: Mapping[Hashable, int] = ids if ids is not None else {name: i for i, name in enumerate(self.names)}
+        self.indptr = np.ascontiguousarray(indptr, dtype=np.int64)
+        self.indices = np.ascontiguousarray(indices, dtype=np.int32)
+        self.weights = np.ascontiguousarray(weights, dtype=np.float64)
+        self.latitudes = np.full(n, np.nan) if latitudes is None else np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.full(n, np.nan) if longitudes is None else np.asarray(longitudes, dtype=np.float64)
+        self.populations = np.full(n, np.nan) if populations is None else np.asarray(populations, dtype=np.float64)
+        self._connected: Optional[bool] = None
+
+        if len(self.indptr) != n + 1 or len(self.indices) != len(self.weights):
+            raise ValueError("Inconsistent CSR arrays")
+
+        for array in (self.indptr, self.indices, self.weights, self.latitudes, self.longitudes, self.populations):
+            array.flags.writeable = False
+
+    @classmethod
+    def from_networkx(cls, graph: nx.Graph, weight: str = "distance") -> "CSRGraph":
+        """Build a snapshot from a networkx graph, keeping its neighbor order"""
+        names = list(graph.nodes())
+        ids = {name: i for i, name in enumerate(names)}
+        adjacency = graph.adj
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(adjacency[name]) for name in names])
+        indices = [ids[neighbor] for name in names for neighbor in adjacency[name]]
+        weights = [edge[weight] for name in names for edge in adjacency[name].values()]
+
+        attrs = graph.nodes
+
+        def column(key: str) -> np.ndarray:
+            values = [attrs[name].get(key) for name in names]
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        return cls(
+            names,
+            indptr,
+            np.array(indices, dtype=np.int32),
+            np.array(weights, dtype=np.float64),
+            column("latitude"),
+            column("longitude"),
+            column("population"),
+        )
+
+    def to_networkx(self, weight: str = "distance") -> nx.Graph:
+        """Build a networkx graph with the snapshot's edges and node attributes"""
+        graph = nx.Graph()
+        for node, name in enumerate(self.names):
+            attrs = {}
+            for key, values in (("latitude", self.latitudes), ("longitude", self.longitudes), ("population", self.populations)):
+                if not np.isnan(values[node]):
+                    attrs[key] = values[node].item() if key != "population" else int(values[node])
+            graph.add_node(name, **attrs)
+
+        sources = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        names = self.to_names(range(self.num_nodes))
+        graph.add_weighted_edges_from(
+            (names[u], names[v], w)
+            for u, v, w in zip(sources.tolist(), self.indices.tolist(), self.weights.tolist())
+            if u <= v
+        )
+        if weight != "weight":
+            for _, _, data in graph.edges(data=True):
+                data[weight] = data.pop("weight")
+        return graph
+
+    @classmethod
+    def from_edges(
+        cls,
+        names: List[Hashable],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        latitudes: Optional[np.ndarray] = None,
+        longitudes: Optional[np.ndarray] = None,
+        populations: Optional[np.ndarray] = None,
+    ) -> "CSRGraph":
+        """
+        Build a snapshot from undirected edge arrays of node ids.
+        Neighbors are ordered by edge position, as networkx would insert them.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        both_sources = np.concatenate([sources, targets])
+        both_targets = np.concatenate([targets, sources])
+        positions = np.tile(np.arange(len(sources)), 2)
+        order = np.lexsort((positions, both_sources))
+
+        indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(both_sources, minlength=len(names)))
+
+        return cls(
+            names,
+            indptr,
+            both_targets[order],
+            np.concatenate([weights, weights])[order],
+            latitudes,
+            longitudes,
+            populations,
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.names)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of undirected edges"""
+        return len(self.indices) // 2
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: Hashable) -> bool:
+        return name in self.ids
+
+    def node_id(self, name: Hashable) -> int:
+        """Translate a node name to its integer id (KeyError if unknown)"""
+        return self.ids[name]
+
+    def node_name(self, node: int) -> Hashable:
+        """Translate an integer id back to its node name"""
+        return self.names[node]
+
+    def to_names(self, path: Iterable[int]) -> List[Hashable]:
+        """Translate a path of ids back to node names"""
+        names = self.names
+        return [names[node] for node in path]
+
+    def is_connected(self) -> bool:
+        """Whether every node is reachable from node 0 (computed once per snapshot)"""
+        if self._connected is None:
+            seen = bytearray(self.num_nodes)
+            stack = [0] if self.num_nodes else []
+            indptr, indices = self.indptr, self.indices
+            while stack:
+                node = stack.pop()
+                if seen[node]:
+                    continue
+                seen[node] = 1
+                stack.extend(v for v in indices[indptr[node]:indptr[node + 1]].tolist() if not seen[v])
+            self._connected = self.num_nodes > 0 and all(seen)
+        return self._connected
+
+    def degree(self, node: int) -> int:
+        return int(self.indptr[node + 1] - self.indptr[node])
+
+    def neighbors(self, node: int) -> Iterator[Tuple[int, float]]:
+        """Iterate (neighbor id, edge weight) pairs of a node"""
+        lo, hi = self.indptr[node], self.indptr[node + 1]
+        # One bulk conversion per node is much cheaper than indexing numpy scalars
+        return zip(self.indices[lo:hi].tolist(), self.weights[lo:hi].tolist())
+
+    def edge_weight(self, u: int, v: int) -> float:
+        """Weight of edge u-v (KeyError if absent)"""
+        lo, hi = self.indptr[u], self.indptr[u + 1]
+        hits = np.nonzero(self.indices[lo:hi] == v)[0]
+        if len(hits) == 0:
+            raise KeyError((u, v))
+        return float(self.weights[lo + hits[0]])
+
+    def with_edge_changes(self, changes: Iterable[Tuple[int, int, float]]) -> "CSRGraph":
+        """
+        New snapshot with undirected edges (u, v, weight) added or reweighted,
+        or removed when weight is inf. Node ids are unchanged; existing neighbors
+        keep their order and new ones are appended, as networkx would do.
+        """
+        n = self.num_nodes
+        sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.indptr))
+        weights = self.weights.copy()
+        keep = np.ones(len(self.indices), dtype=bool)
+        added: List[Tuple[int, int, float]] = []
+
+        for u, v, weight in changes:
+            for a, b in ((u, v), (v, u)):
+                lo, hi = self.indptr[a], self.indptr[a + 1]
+                hits = np.nonzero(self.indices[lo:hi] == b)[0]
+                if len(hits):
+                    if np.isinf(weight):
+                        keep[lo + hits[0]] = False
+                    else:
+                        weights[lo + hits[0]] = weight
+                elif not np.isinf(weight):
+                    added.append((a, b, weight))
+
+        new_sources = np.array([a for a, _, _ in added], dtype=np.int64)
+        all_sources = np.concatenate([sources[keep], new_sources])
+        all_targets = np.concatenate([self.indices[keep], np.array([b for _, b, _ in added], dtype=np.int32)])
+        all_weights = np.concatenate([weights[keep], np.array([w for _, _, w in added], dtype=np.float64)])
+        positions = np.concatenate([np.nonzero(keep)[0], len(keep) + np.arange(len(added))])
+        order = np.lexsort((positions, all_sources))
+
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum(np.bincount(all_sources, minlength=n))
+
+        return CSRGraph(
+            self.names,
+            indptr,
+            all_targets[order],
+            all_weights[order],
+            self.latitudes,
+            self.longitudes,
+            self.populations,
+            ids=self.ids,
+        )
+
+
+def as_csr(graph: Union[nx.Graph, CSRGraph], weight: str = "distance") -> CSRGraph:
+    """Return `graph` as a CSR snapshot, converting networkx graphs"""
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_networkx(graph, weight=weight)
+
+
+def shortest_path_tree(graph: CSRGraph, source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Single-source Dijkstra from `source`.
+    Returns: (distances, parents) with inf / -1 for unreachable nodes and -1 as the root's parent
+    """
+    dist = np.full(graph.num_nodes, np.inf)
+    parents = np.full(graph.num_nodes, -1, dtype=np.int32)
+    best = {source: 0.0}
+    parent_of = {source: -1}
+    heap = [(0.0, source)]
+
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if cost > best[node]:
+            continue
+        dist[node] = cost
+        parents[node] = parent_of[node]
+        for neighbor, weight in graph.neighbors(node):
+            new_cost = cost + weight
+            if new_cost < best.get(neighbor, np.inf):
+                best[neighbor] = new_cost
+                parent_of[neighbor] = node
+                heapq.heappush(heap, (new_cost, neighbor))
+
+    return dist, parents
+
+
+def shortest_path_lengths(graph: CSRGraph, source: int) -> np.ndarray:
+    """Single-source Dijkstra distances from `source` (inf where unreachable)"""
+    return shortest_path_tree(graph, source)[0]
@@ -1,29 +1,29 @@
-from typing import List, Tuple
-from .base import SearchAlgorithm
+from typing import List, Tuple, Optional
+from .base import SearchAlgorithm, reconstruct_path
 
 
 class DFSAlgorithm(SearchAlgorithm):
     """Depth-First Search Algorithm"""
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         DFS explores as far as possible along each branch before backtracking.
         Does not guarantee optimal path.
         """
-        stack = [(start, [start], 0)]
-        visited = {start}
+        stack = [(start, 0)]
+        # Parent pointers double as the visited set
+        parents = {start: None}
 
         while stack:
-            (state, path, cost) = stack.pop()
+            (state, cost) = stack.pop()
             self.nodes_explored += 1
 
             if state == goal:
-                return path, cost
+                return reconstruct_path(parents, goal), cost
 
-            for neighbor in self.graph[state]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_cost = cost + self.graph[state][neighbor]["distance"]
-                    stack.append((neighbor, path + [neighbor], new_cost))
+            for neighbor, distance in self.graph.neighbors(state):
+                if neighbor not in parents:
+                    parents[neighbor] = state
+                    stack.append((neighbor, cost + distance))
 
-        raise Exception(f"No path found from {start} to {goal}")
+        return None
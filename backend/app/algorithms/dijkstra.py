@@ -1,35 +1,47 @@
-from typing import List, Tuple
+from typing import Dict, List, Tuple, Optional
 import heapq
-from .base import SearchAlgorithm
+from .base import SearchAlgorithm, reconstruct_path
 
 
 class DijkstraAlgorithm(SearchAlgorithm):
     """Dijkstra's Algorithm using heap-based priority queue"""
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         Dijkstra's algorithm finds shortest path using a min-heap.
         More efficient than UCS for dense graphs.
         """
-        # Priority queue: (cost, state, path)
-        heap = [(0, start, [start])]
-        visited = set()
+        return self._search_many(start, [goal]).get(goal)
 
-        while heap:
-            cost, state, path = heapq.heappop(heap)
+    def _search_many(self, start: int, goals: List[int]) -> Dict[int, Tuple[List[int], float]]:
+        """
+        Nodes are settled in order of distance, so a single search answers
+        every goal and stops as soon as the last one is settled.
+        """
+        remaining = set(goals)
+        results = {}
+        # Priority queue: (cost, state, parent)
+        heap = [(0, start, -1)]
+        # A node's parent is fixed when it is settled, so parents is also the visited set
+        parents = {}
+
+        while heap and remaining:
+            cost, state, parent = heapq.heappop(heap)
 
-            if state in visited:
+            if state in parents:
                 continue
 
-            visited.add(state)
+            parents[state] = parent if parent >= 0 else None
             self.nodes_explored += 1
 
-            if state == goal:
-                return path, cost
+            if state in remaining:
+                remaining.discard(state)
+                results[state] = (reconstruct_path(parents, state), cost)
+                if not remaining:
+                    break
 
-            for neighbor in self.graph[state]:
-                if neighbor not in visited:
-                    new_cost = cost + self.graph[state][neighbor]["distance"]
-                    heapq.heappush(heap, (new_cost, neighbor, path + [neighbor]))
+            for neighbor, distance in self.graph.neighbors(state):
+                if neighbor not in parents:
+                    heapq.heappush(heap, (cost + distance, neighbor, state))
 
-        raise Exception(f"No path found from {start} to {goal}")
+        return results
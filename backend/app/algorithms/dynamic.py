@@ -0,0 +1,67 @@
+from typing import List, Tuple, Union
+import heapq
+import numpy as np
+from .csr import CSRGraph, shortest_path_lengths
+
+# (u, v, weight before, weight after) with inf for an absent edge
+EdgeChange = Tuple[int, int, float, float]
+
+# Relative slack when deciding whether an edge lies on a shortest path
+TIGHT_TOLERANCE = 1e-9
+
+
+def is_tight(
+    to_u: Union[float, np.ndarray],
+    to_v: Union[float, np.ndarray],
+    weight: float
+) -> Union[bool, np.ndarray]:
+    """
+    Whether edge u-v of this weight can lie on a shortest path, given the
+    distances of u and v from (or to) the same node. Ties count as tight so
+    callers err on the side of recomputing.
+    """
+    with np.errstate(invalid="ignore"):
+        forward = to_u + weight <= to_v + TIGHT_TOLERANCE * (1 + np.abs(to_v))
+        backward = to_v + weight <= to_u + TIGHT_TOLERANCE * (1 + np.abs(to_u))
+    reachable = np.isfinite(to_u) | np.isfinite(to_v)
+    return (forward | backward) & reachable
+
+
+def update_distances(
+    graph: CSRGraph,
+    source: int,
+    distances: np.ndarray,
+    changes: List[EdgeChange]
+) -> np.ndarray:
+    """
+    Shortest distances from `source` after edge changes, given those before.
+
+    `graph` is the updated snapshot. If a heavier or removed edge lay on a
+    shortest path from the source the row is recomputed; otherwise the old
+    distances still hold and lighter or new edges are propagated from their
+    endpoints, visiting only the nodes that get closer.
+    """
+    for u, v, old, new in changes:
+        if new > old and is_tight(distances[u], distances[v], old):
+            return shortest_path_lengths(graph, source)
+
+    best = distances.tolist()
+    heap = []
+    for u, v, old, new in changes:
+        if new < old:
+            for a, b in ((u, v), (v, u)):
+                if best[a] + new < best[b]:
+                    best[b] = best[a] + new
+                    heapq.heappush(heap, (best[b], b))
+
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if cost > best[node]:
+            continue
+        for neighbor, weight in graph.neighbors(node):
+            new_cost = cost + weight
+            if new_cost < best[neighbor]:
+                best[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+
+    return np.array(best, dtype=np.float64)
@@ -0,0 +1,295 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Union
+import copy
+import math
+import networkx as nx
+import numpy as np
+from .csr import CSRGraph, as_csr, shortest_path_lengths
+from .dynamic import EdgeChange, update_distances
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+class Heuristic(ABC):
+    """Base class for admissible A* heuristics over CSR node ids"""
+
+    @abstractmethod
+    def bind(self, goal: int) -> Callable[[int], float]:
+        """
+        Prepare the heuristic for a fixed goal.
+        Returns: estimator h(node) giving a lower bound on the distance to goal
+        """
+        pass
+
+    def updated(self, graph: CSRGraph, changes: List[EdgeChange]) -> "Heuristic":
+        """Heuristic for `graph`, the snapshot after `changes` (reused when it does not depend on edges)"""
+        return self
+
+
+class ZeroHeuristic(Heuristic):
+    """Trivial heuristic, turns A* into Dijkstra"""
+
+    def bind(self, goal: int) -> Callable[[int], float]:
+        return lambda node: 0.0
+
+
+class _VectorHeuristic(Heuristic):
+    """
+    Heuristic that can also give its bounds for every node at once.
+    A* only evaluates the nodes it reaches, so `bind` evaluates nodes on
+    demand (memoized, as A* revisits them) rather than materializing the
+    whole vector for each goal.
+    """
+
+    @abstractmethod
+    def estimates(self, goal: int) -> np.ndarray:
+        """Return lower bounds from every node to the goal"""
+        pass
+
+    def _estimator(self, goal: int) -> Callable[[int], float]:
+        """Unmemoized per-node lower bound to the goal"""
+        return self.estimates(goal).tolist().__getitem__
+
+    def bind(self, goal: int) -> Callable[[int], float]:
+        estimate = self._estimator(goal)
+        known: Dict[int, float] = {}
+
+        def memoized(node: int) -> float:
+            value = known.get(node)
+            if value is None:
+                value = known[node] = estimate(node)
+            return value
+        return memoized
+
+
+class HaversineHeuristic(_VectorHeuristic):
+    """
+    Great-circle distance between city coordinates.
+
+    Road distances are not guaranteed to exceed the straight-line distance in
+    our datasets, so the great-circle distance is multiplied by `scale`, the
+    smallest ratio of edge weight to edge great-circle length. With that scale
+    the estimate never exceeds any edge and stays admissible and consistent.
+    """
+
+    def __init__(self, latitudes: np.ndarray, longitudes: np.ndarray, scale: float = 1.0):
+        self.latitudes = np.radians(np.asarray(latitudes, dtype=float))
+        self.longitudes = np.radians(np.asarray(longitudes, dtype=float))
+        self.scale = scale
+        # Coordinates as lists for per-node evaluation, converted on first use
+        self._lists = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_lists'] = None
+        return state
+
+    @staticmethod
+    def distance(lat1, lon1, lat2, lon2):
+        """Great-circle distance in km between points given in radians"""
+        h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+    @classmethod
+    def from_graph(cls, graph: Union[CSRGraph, nx.Graph]) -> Optional["HaversineHeuristic"]:
+        """
+        Build from the snapshot's node coordinates.
+        Returns None if any node has no coordinates, since the bound would not hold there.
+        """
+        graph = as_csr(graph)
+        if graph.num_nodes == 0 or np.isnan(graph.latitudes).any() or np.isnan(graph.longitudes).any():
+            return None
+
+        heuristic = cls(graph.latitudes, graph.longitudes)
+
+        # Calibrate so that scale * great-circle <= road distance on every edge
+        sources = np.repeat(np.arange(graph.num_nodes), np.diff(graph.indptr))
+        targets = graph.indices
+        straight = heuristic.distance(
+            heuristic.latitudes[sources], heuristic.longitudes[sources],
+            heuristic.latitudes[targets], heuristic.longitudes[targets]
+        )
+        positive = straight > 0
+        if positive.any():
+            heuristic.scale = float(min(1.0, np.min(graph.weights[positive] / straight[positive])))
+        heuristic.scale = max(heuristic.scale, 0.0)
+        return heuristic
+
+    def updated(self, graph: CSRGraph, changes: List[EdgeChange]) -> "HaversineHeuristic":
+        """Lower the scale if a lighter or new edge is now shorter than the scaled straight line"""
+        scale = self.scale
+        for u, v, old, new in changes:
+            straight = self.distance(self.latitudes[u], self.longitudes[u], self.latitudes[v], self.longitudes[v])
+            if new < old and straight > 0:
+                scale = min(scale, new / straight)
+        heuristic = copy.copy(self)
+        heuristic.scale = float(scale)
+        return heuristic
+
+    def _coordinates(self):
+        """Latitudes, longitudes and latitude cosines as lists, converted once for scalar evaluation"""
+        if self._lists is None:
+            self._lists = (self.latitudes.tolist(), self.longitudes.tolist(), np.cos(self.latitudes).tolist())
+        return self._lists
+
+    def _estimator(self, goal: int) -> Callable[[int], float]:
+        latitudes, longitudes, cosines = self._coordinates()
+        goal_lat, goal_lon, goal_cos = latitudes[goal], longitudes[goal], cosines[goal]
+        factor = 2 * EARTH_RADIUS_KM * self.scale
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+
+        def estimate(node: int) -> float:
+            h = sin((goal_lat - latitudes[node]) / 2) ** 2 + goal_cos * cosines[node] * sin((goal_lon - longitudes[node]) / 2) ** 2
+            return factor * asin(sqrt(min(h, 1.0)))
+        return estimate
+
+    def estimates(self, goal: int) -> np.ndarray:
+        return self.scale * self.distance(
+            self.latitudes, self.longitudes,
+            self.latitudes[goal], self.longitudes[goal]
+        )
+
+
+class LandmarkHeuristic(_VectorHeuristic):
+    """
+    ALT (A*, Landmarks, Triangle inequality) lower bounds.
+
+    Shortest distances from a few landmarks to every node are computed once;
+    h(v) = max over landmarks L of |d(L, goal) - d(L, v)|.
+    """
+
+    def __init__(self, landmarks: List[int], distances: np.ndarray):
+        self.landmarks = landmarks
+        self.distances = distances
+        # Landmark distances of each node as lists for per-node evaluation, converted on first use
+        self._node_rows: Optional[List[List[float]]] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_node_rows'] = None
+        return state
+
+    @classmethod
+    def from_graph(cls, graph: Union[CSRGraph, nx.Graph], num_landmarks: int = 8) -> Optional["LandmarkHeuristic"]:
+        """Select landmarks by farthest-point sampling and precompute their distance rows"""
+        graph = as_csr(graph)
+        if graph.num_nodes == 0 or num_landmarks <= 0:
+            return None
+
+        landmarks: List[int] = []
+        rows: List[np.ndarray] = []
+        # Distance from each node to its closest chosen landmark
+        closest = np.full(graph.num_nodes, np.inf)
+        candidate = 0
+
+        for _ in range(min(num_landmarks, graph.num_nodes)):
+            row = shortest_path_lengths(graph, candidate)
+            landmarks.append(candidate)
+            rows.append(row)
+
+            # Next landmark: the reachable node farthest from all chosen ones
+            closest = np.minimum(closest, row)
+            reachable = np.where(np.isfinite(closest), closest, -1.0)
+            candidate = int(np.argmax(reachable))
+            if reachable[candidate] <= 0:
+                break
+
+        return cls(landmarks, np.vstack(rows))
+
+    def updated(self, graph: CSRGraph, changes: List[EdgeChange]) -> "LandmarkHeuristic":
+        """Keep the landmarks and repair their distance rows for the changed edges"""
+        rows = [
+            update_distances(graph, landmark, row, changes)
+            for landmark, row in zip(self.landmarks, self.distances)
+        ]
+        return LandmarkHeuristic(self.landmarks, np.vstack(rows))
+
+    def _rows_by_node(self) -> List[List[float]]:
+        """Distances from every landmark, one list per node, converted once for scalar evaluation"""
+        if self._node_rows is None:
+            self._node_rows = self.distances.T.tolist()
+        return self._node_rows
+
+    def _estimator(self, goal: int) -> Callable[[int], float]:
+        rows = self._rows_by_node()
+        # Landmarks that cannot reach the goal give no information
+        usable = [(i, distance) for i, distance in enumerate(rows[goal]) if distance < math.inf]
+
+        def estimate(node: int) -> float:
+            row = rows[node]
+            best = 0.0
+            for i, to_goal in usable:
+                to_node = row[i]
+                if to_node < math.inf:
+                    diff = to_goal - to_node if to_goal > to_node else to_node - to_goal
+                    if diff > best:
+                        best = diff
+            return best
+        return estimate
+
+    def estimates(self, goal: int) -> np.ndarray:
+        goal_column = self.distances[:, goal:goal + 1]
+        with np.errstate(invalid="ignore"):
+            diff = np.abs(self.distances - goal_column)
+        # Landmarks that cannot reach both nodes give no information
+        diff[~np.isfinite(diff)] = 0.0
+        return diff.max(axis=0)
+
+
+class MaxHeuristic(_VectorHeuristic):
+    """Pointwise maximum of admissible heuristics, which is itself admissible"""
+
+    def __init__(self, heuristics: List[_VectorHeuristic]):
+        self.heuristics = heuristics
+
+    def updated(self, graph: CSRGraph, changes: List[EdgeChange]) -> "MaxHeuristic":
+        return MaxHeuristic([h.updated(graph, changes) for h in self.heuristics])
+
+    def _estimator(self, goal: int) -> Callable[[int], float]:
+        estimators = [h._estimator(goal) for h in self.heuristics]
+        if len(estimators) == 2:
+            first, second = estimators
+            return lambda node: max(first(node), second(node))
+        return lambda node: max(estimate(node) for estimate in estimators)
+
+    def estimates(self, goal: int) -> np.ndarray:
+        return np.max([h.estimates(goal) for h in self.heuristics], axis=0)
+
+
+def find_landmarks(heuristic: Heuristic) -> Optional[LandmarkHeuristic]:
+    """The landmark bounds inside a heuristic built by build_heuristic, if any"""
+    if isinstance(heuristic, LandmarkHeuristic):
+        return heuristic
+    if isinstance(heuristic, MaxHeuristic):
+        for inner in heuristic.heuristics:
+            if isinstance(inner, LandmarkHeuristic):
+                return inner
+    return None
+
+
+def build_heuristic(
+    graph: Union[CSRGraph, nx.Graph],
+    num_landmarks: int = 8,
+    landmarks: Optional[LandmarkHeuristic] = None
+) -> Heuristic:
+    """
+    Precompute the best available heuristic for a graph.
+    Combines haversine and landmark bounds when both can be built;
+    precomputed `landmarks` (e.g. from a snapshot) are used instead of new ones.
+    """
+    graph = as_csr(graph)
+    if landmarks is None:
+        landmarks = LandmarkHeuristic.from_graph(graph, num_landmarks=num_landmarks)
+    heuristics = [
+        h for h in (
+            HaversineHeuristic.from_graph(graph),
+            landmarks,
+        )
+        if h is not None
+    ]
+
+    if not heuristics:
+        return ZeroHeuristic()
+    if len(heuristics) == 1:
+        return heuristics[0]
+    return MaxHeuristic(heuristics)
@@ -0,0 +1,120 @@
+from typing import List, Optional, Set, Tuple
+import heapq
+from itertools import count
+import numpy as np
+from .csr import CSRGraph, shortest_path_tree
+
+
+class KShortestPaths:
+    """
+    Yen's k shortest loopless paths on a CSR snapshot.
+
+    All spur searches end at the same goal, so one Dijkstra tree rooted at the
+    goal serves every one of them: its distances are exact lower bounds (A*
+    heuristic) once edges and nodes are removed, and whenever the tree's own
+    path from the spur node avoids the removed parts it is returned without
+    any search. The tree can be computed once and passed in for reuse.
+    """
+
+    def __init__(self, graph: CSRGraph, goal: int, tree: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        self.graph = graph
+        self.goal = goal
+        distances, next_hop = tree if tree is not None else shortest_path_tree(graph, goal)
+        self.to_goal = distances.tolist()
+        self.next_hop = next_hop.tolist()
+        self.nodes_explored = 0
+
+    def _tree_path(self, node: int) -> Tuple[List[int], List[float]]:
+        """Shortest path from node to the goal and the cost to reach each of its nodes"""
+        path = [node]
+        while path[-1] != self.goal:
+            path.append(self.next_hop[path[-1]])
+        base = self.to_goal[node]
+        return path, [base - self.to_goal[v] for v in path]
+
+    def _spur(
+        self,
+        spur: int,
+        removed_nodes: Set[int],
+        removed_edges: Set[Tuple[int, int]]
+    ) -> Optional[Tuple[List[int], List[float]]]:
+        """Shortest spur -> goal path avoiding the removed nodes and edges"""
+        if self.to_goal[spur] == float('inf'):
+            return None
+
+        path, costs = self._tree_path(spur)
+        if not removed_nodes.intersection(path) and not any(
+            (u, v) in removed_edges for u, v in zip(path, path[1:])
+        ):
+            return path, costs
+
+        # A* guided by the tree: removing parts of the graph only makes paths longer
+        h = self.to_goal
+        sequence = count()
+        heap = [(h[spur], next(sequence), 0.0, spur, -1)]
+        best = {spur: 0.0}
+        parents = {}
+        while heap:
+            _, _, cost, node, parent = heapq.heappop(heap)
+            if node in parents:
+                continue
+            parents[node] = parent
+            self.nodes_explored += 1
+            if node == self.goal:
+                path = [node]
+                while parents[path[-1]] >= 0:
+                    path.append(parents[path[-1]])
+                path.reverse()
+                return path, [best[v] for v in path]
+            for neighbor, weight in self.graph.neighbors(node):
+                if neighbor in removed_nodes or neighbor in parents or (node, neighbor) in removed_edges:
+                    continue
+                new_cost = cost + weight
+                if new_cost < best.get(neighbor, float('inf')):
+                    best[neighbor] = new_cost
+                    heapq.heappush(heap, (new_cost + h[neighbor], next(sequence), new_cost, neighbor, node))
+        return None
+
+    def search(self, start: int, k: int) -> List[Tuple[List[int], float]]:
+        """
+        Up to k loopless paths from start to the goal in order of length.
+        Returns: list of (path of node ids, total_distance)
+        """
+        if k < 1 or self.to_goal[start] == float('inf'):
+            return []
+
+        first, first_costs = self._tree_path(start)
+        found = [(first, first_costs)]
+        seen = {tuple(first)}
+        candidates = []
+        sequence = count()
+
+        while len(found) < k:
+            previous, previous_costs = found[-1]
+            for i in range(len(previous) - 1):
+                root = previous[:i + 1]
+                # Edges that would recreate a path already found with this root
+                removed_edges = set()
+                for path, _ in found:
+                    if path[:i + 1] == root and len(path) > i + 1:
+                        removed_edges.add((path[i], path[i + 1]))
+                        removed_edges.add((path[i + 1], path[i]))
+
+                spur = self._spur(previous[i], set(root[:-1]), removed_edges)
+                if spur is None:
+                    continue
+                spur_path, spur_costs = spur
+                path = root[:-1] + spur_path
+                if tuple(path) in seen:
+                    continue
+                seen.add(tuple(path))
+                root_cost = previous_costs[i]
+                costs = previous_costs[:i] + [root_cost + c for c in spur_costs]
+                heapq.heappush(candidates, (costs[-1], next(sequence), path, costs))
+
+            if not candidates:
+                break
+            _, _, path, costs = heapq.heappop(candidates)
+            found.append((path, costs))
+
+        return [(path, costs[-1]) for path, costs in found]
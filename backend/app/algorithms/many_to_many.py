@@ -0,0 +1,68 @@
+from typing import List, Optional, Sequence
+import heapq
+import numpy as np
+from .csr import CSRGraph
+from .matrix import DistanceMatrix
+
+
+def one_to_many_distances(graph: CSRGraph, source: int, targets: Sequence[int]) -> np.ndarray:
+    """
+    Dijkstra from `source` that stops as soon as every target is settled.
+    Returns: distances aligned with `targets` (inf where unreachable)
+    """
+    n = graph.num_nodes
+    best = [float('inf')] * n
+    settled = bytearray(n)
+    wanted = bytearray(n)
+    for target in targets:
+        wanted[target] = 1
+    remaining = sum(wanted)
+    best[source] = 0.0
+    heap = [(0.0, source)]
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+
+    while heap and remaining:
+        cost, node = heapq.heappop(heap)
+        if settled[node]:
+            continue
+        settled[node] = 1
+        if wanted[node]:
+            remaining -= 1
+        lo, hi = indptr[node], indptr[node + 1]
+        for neighbor, weight in zip(indices[lo:hi].tolist(), weights[lo:hi].tolist()):
+            new_cost = cost + weight
+            if new_cost < best[neighbor]:
+                best[neighbor] = new_cost
+                heapq.heappush(heap, (new_cost, neighbor))
+
+    return np.array([best[target] if settled[target] else np.inf for target in targets], dtype=np.float64)
+
+
+def many_to_many_distances(
+    graph: CSRGraph,
+    sources: Sequence[int],
+    targets: Sequence[int],
+    matrix: Optional[DistanceMatrix] = None
+) -> np.ndarray:
+    """
+    Origin-destination distances as a len(sources) x len(targets) array.
+    Slices the all-pairs matrix when one is available, otherwise runs one
+    early-stopping Dijkstra per distinct source.
+    """
+    if matrix is not None:
+        return matrix.distances[np.ix_(sources, targets)]
+
+    result = np.empty((len(sources), len(targets)), dtype=np.float64)
+    rows: dict = {}
+    for i, source in enumerate(sources):
+        if source not in rows:
+            rows[source] = one_to_many_distances(graph, source, targets)
+        result[i] = rows[source]
+    return result
+
+
+def split_sources(sources: List[int], parts: int) -> List[List[int]]:
+    """Split sources into at most `parts` contiguous chunks of near-equal size"""
+    parts = max(1, min(parts, len(sources)))
+    bounds = np.linspace(0, len(sources), parts + 1).astype(int)
+    return [sources[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
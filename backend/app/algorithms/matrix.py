@@ -0,0 +1,220 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+import heapq
+import networkx as nx
+import numpy as np
+from .base import SearchAlgorithm
+from .csr import CSRGraph, as_csr, shortest_path_tree
+from .dynamic import EdgeChange
+
+# Above this many nodes the O(n^3) Floyd-Warshall loses to one Dijkstra per node
+FLOYD_WARSHALL_MAX_NODES = 400
+
+_worker_graph: Optional[CSRGraph] = None
+
+
+def _init_worker(graph: CSRGraph):
+    """Receive the snapshot once per worker process instead of once per task"""
+    global _worker_graph
+    _worker_graph = graph
+
+
+def _tree_rows(targets: List[int]) -> List[Tuple[int, np.ndarray, np.ndarray]]:
+    return [(target, *shortest_path_tree(_worker_graph, target)) for target in targets]
+
+
+def _repair_column(graph: CSRGraph, distances: np.ndarray, next_hop: np.ndarray, target: int, nodes: List[int]):
+    """
+    Re-solve the distances and next hops of `nodes` towards `target` in place.
+    The other nodes of the column must already be exact: each affected node
+    starts from its best unaffected neighbor and Dijkstra runs among the rest.
+    """
+    column = distances[:, target].tolist()
+    inside = set(nodes)
+    best = {}
+    hop = {}
+    heap = []
+    for node in nodes:
+        best[node], hop[node] = np.inf, -1
+        for neighbor, weight in graph.neighbors(node):
+            if neighbor not in inside and column[neighbor] + weight < best[node]:
+                best[node], hop[node] = column[neighbor] + weight, neighbor
+        if hop[node] >= 0:
+            heapq.heappush(heap, (best[node], node))
+
+    settled = set()
+    while heap:
+        cost, node = heapq.heappop(heap)
+        if node in settled:
+            continue
+        settled.add(node)
+        for neighbor, weight in graph.neighbors(node):
+            if neighbor in inside and neighbor not in settled and cost + weight < best[neighbor]:
+                best[neighbor], hop[neighbor] = cost + weight, node
+                heapq.heappush(heap, (best[neighbor], neighbor))
+
+    for node in nodes:
+        distances[node, target] = best[node]
+        next_hop[node, target] = hop[node]
+
+
+class DistanceMatrix:
+    """
+    All-pairs shortest distances and next hops as dense NumPy arrays.
+
+    distances[i, j] is the length of the shortest route from i to j and
+    next_hop[i, j] the node that follows i on that route (-1 if unreachable),
+    so any route is read off in O(path length).
+    """
+
+    def __init__(self, distances: np.ndarray, next_hop: np.ndarray):
+        self.distances = distances
+        self.next_hop = next_hop
+
+    @classmethod
+    def build(cls, graph: Union[CSRGraph, nx.Graph], workers: Optional[int] = None) -> "DistanceMatrix":
+        """Choose Floyd-Warshall for small graphs and parallel Dijkstra otherwise"""
+        graph = as_csr(graph)
+        if graph.num_nodes <= FLOYD_WARSHALL_MAX_NODES:
+            return cls.floyd_warshall(graph)
+        return cls.repeated_dijkstra(graph, workers=workers)
+
+    @classmethod
+    def floyd_warshall(cls, graph: Union[CSRGraph, nx.Graph]) -> "DistanceMatrix":
+        """Vectorized Floyd-Warshall: one O(n^2) NumPy update per intermediate node"""
+        graph = as_csr(graph)
+        n = graph.num_nodes
+        sources = np.repeat(np.arange(n), np.diff(graph.indptr))
+
+        distances = np.full((n, n), np.inf)
+        # Parallel edges keep the cheapest weight
+        np.minimum.at(distances, (sources, graph.indices), graph.weights)
+        np.fill_diagonal(distances, 0.0)
+
+        next_hop = np.where(np.isfinite(distances), np.arange(n)[None, :], -1).astype(np.int32)
+
+        for k in range(n):
+            through = distances[:, k:k + 1] + distances[k:k + 1, :]
+            shorter = through < distances
+            distances = np.where(shorter, through, distances)
+            next_hop = np.where(shorter, next_hop[:, k:k + 1], next_hop)
+
+        return cls(distances, next_hop)
+
+    @classmethod
+    def repeated_dijkstra(
+        cls,
+        graph: Union[CSRGraph, nx.Graph],
+        workers: Optional[int] = None,
+        chunk_size: int = 64
+    ) -> "DistanceMatrix":
+        """
+        One Dijkstra per target over a process pool.
+        In an undirected graph the parent of v in the tree rooted at t is the
+        next hop from v towards t, so each tree fills one next_hop column.
+        """
+        graph = as_csr(graph)
+        n = graph.num_nodes
+        distances = np.empty((n, n))
+        next_hop = np.empty((n, n), dtype=np.int32)
+        chunks = [list(range(i, min(i + chunk_size, n))) for i in range(0, n, chunk_size)]
+
+        def fill(rows):
+            for target, dist, parents in rows:
+                distances[:, target] = dist
+                next_hop[:, target] = parents
+                next_hop[target, target] = target
+
+        if workers == 1:
+            _init_worker(graph)
+            for chunk in chunks:
+                fill(_tree_rows(chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,)) as pool:
+                for rows in pool.map(_tree_rows, chunks):
+                    fill(rows)
+
+        return cls(distances, next_hop)
+
+    def updated(self, graph: CSRGraph, changes: List[EdgeChange]) -> "DistanceMatrix":
+        """
+        Matrix for `graph`, the snapshot after `changes`, without a full rebuild.
+
+        Lighter and new edges are applied first in closed form: the best i -> j
+        route through u -> v is distances[i, u] + w + distances[v, j]. Then, per
+        target column, only the nodes whose next-hop chain crosses a heavier or
+        removed edge are re-solved, from their unaffected neighbors.
+        """
+        distances = self.distances.copy()
+        next_hop = self.next_hop.copy()
+
+        for u, v, old, new in changes:
+            if new >= old:
+                continue
+            for a, b in ((u, v), (v, u)):
+                through = distances[:, a:a + 1] + new + distances[b:b + 1, :]
+                shorter = through < distances
+                hop = next_hop[:, a].copy()
+                hop[a] = b
+                distances = np.where(shorter, through, distances)
+                next_hop = np.where(shorter, hop[:, None], next_hop)
+
+        # Nodes whose route to column j starts along a heavier edge
+        cut = np.zeros(distances.shape, dtype=bool)
+        for u, v, old, new in changes:
+            if new > old:
+                cut[u] |= next_hop[u] == v
+                cut[v] |= next_hop[v] == u
+
+        columns = np.nonzero(cut.any(axis=0))[0]
+        if len(columns):
+            hops = next_hop[:, columns]
+            reachable = hops >= 0
+            parents = np.where(reachable, hops, 0)
+            column_index = np.arange(len(columns))[None, :]
+            # Everything routed through a cut node is affected too
+            affected = cut[:, columns]
+            while True:
+                grown = affected | (reachable & affected[parents, column_index])
+                if (grown == affected).all():
+                    break
+                affected = grown
+
+            for k, target in enumerate(columns):
+                _repair_column(graph, distances, next_hop, int(target), np.nonzero(affected[:, k])[0].tolist())
+
+        return DistanceMatrix(distances, next_hop)
+
+    def distance(self, start: int, goal: int) -> float:
+        return float(self.distances[start, goal])
+
+    def path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Follow next hops from start to goal (None if unreachable)"""
+        if self.next_hop[start, goal] < 0:
+            return None
+        path = [start]
+        node = start
+        while node != goal:
+            node = int(self.next_hop[node, goal])
+            path.append(node)
+        return path
+
+
+class MatrixAlgorithm(SearchAlgorithm):
+    """Lookup in a precomputed all-pairs distance/next-hop matrix"""
+
+    def __init__(self, graph: Union[CSRGraph, nx.Graph], matrix: Optional[DistanceMatrix] = None):
+        super().__init__(graph)
+        # GraphService precomputes the matrix for small graphs; building here is a fallback
+        self.matrix = matrix or DistanceMatrix.build(self.graph)
+
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
+        """
+        Reads the route off the next-hop matrix in O(path length).
+        Only the nodes on the returned path are visited.
+        """
+        path = self.matrix.path(start, goal)
+        if path is None:
+            return None
+        self.nodes_explored += len(path)
+        return path, self.matrix.distance(start, goal)
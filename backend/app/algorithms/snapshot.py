@@ -0,0 +1,190 @@
+from typing import Iterator, List, Mapping, Optional, Sequence, Tuple
+import mmap
+import os
+import struct
+import tempfile
+import numpy as np
+from .csr import CSRGraph
+from .heuristics import LandmarkHeuristic
+
+MAGIC = b"RTGRAPH\0"
+FORMAT_VERSION = 1
+
+# magic, format version, flags, nodes, CSR positions, name bytes, landmarks
+HEADER = struct.Struct("<8sIIqqqq")
+# Sections start on 64-byte boundaries so every array is aligned for zero-copy reads
+ALIGNMENT = 64
+
+FLAG_CONNECTED = 1
+FLAG_LANDMARKS = 2
+
+
+class NameTable(Sequence):
+    """City names stored as one UTF-8 buffer with offsets, decoded on access"""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+
+    def encoded(self, node: int) -> bytes:
+        return self.data[self.offsets[node]:self.offsets[node + 1]].tobytes()
+
+    def __getitem__(self, node):
+        if isinstance(node, slice):
+            return [self[i] for i in range(*node.indices(len(self)))]
+        if node < 0:
+            node += len(self)
+        return self.encoded(node).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        data, offsets = self.data.tobytes(), self.offsets.tolist()
+        for lo, hi in zip(offsets, offsets[1:]):
+            yield data[lo:hi].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class NameIndex(Mapping):
+    """Name -> node id lookup by binary search over names sorted by their UTF-8 bytes"""
+
+    def __init__(self, names: NameTable, order: np.ndarray):
+        self.names = names
+        self.order = order
+
+    def __getitem__(self, name) -> int:
+        if not isinstance(name, str):
+            raise KeyError(name)
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self.order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.names.encoded(int(self.order[mid])) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.order) and self.names.encoded(int(self.order[lo])) == key:
+            return int(self.order[lo])
+        raise KeyError(name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def _padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def _sections(graph: CSRGraph, landmarks: Optional[LandmarkHeuristic]) -> Tuple[List[np.ndarray], int]:
+    """Arrays in file order and the total size of the encoded names"""
+    encoded = [str(name).encode("utf-8") for name in graph.names]
+    offsets = np.zeros(len(encoded) + 1, dtype="<i8")
+    offsets[1:] = np.cumsum([len(name) for name in encoded])
+    # Byte order sorts the same as str order, so lookups can binary search it
+    order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype="<i4")
+
+    sections = [
+        graph.indptr.astype("<i8"),
+        graph.indices.astype("<i4"),
+        graph.weights.astype("<f8"),
+        graph.latitudes.astype("<f8"),
+        graph.longitudes.astype("<f8"),
+        graph.populations.astype("<f8"),
+        offsets,
+        order,
+        np.frombuffer(b"".join(encoded), dtype=np.uint8),
+    ]
+    if landmarks is not None:
+        sections.append(np.asarray(landmarks.landmarks, dtype="<i4"))
+        sections.append(np.asarray(landmarks.distances, dtype="<f8"))
+    return sections, int(offsets[-1])
+
+
+def write_snapshot(path: str, graph: CSRGraph, landmarks: Optional[LandmarkHeuristic] = None):
+    """
+    Write a graph (and optionally its landmark rows) as a binary snapshot.
+    The file is written next to `path` and renamed over it, so readers never
+    see a partial snapshot.
+    """
+    if any(not isinstance(name, str) for name in graph.names):
+        raise ValueError("Snapshots only support string node names")
+
+    sections, name_bytes = _sections(graph, landmarks)
+    flags = (FLAG_CONNECTED if graph.is_connected() else 0) | (FLAG_LANDMARKS if landmarks is not None else 0)
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, flags,
+        graph.num_nodes, len(graph.indices), name_bytes,
+        len(landmarks.landmarks) if landmarks is not None else 0
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            offset = len(header)
+            for array in sections:
+                f.write(b"\0" * _padding(offset))
+                offset += _padding(offset)
+                f.write(array.tobytes())
+                offset += array.nbytes
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Tuple[CSRGraph, Optional[LandmarkHeuristic]]:
+    """
+    Map a snapshot file into memory.
+    Arrays are read-only views of the mapping, so loading copies nothing and
+    pages are read from disk (or shared page cache) as searches touch them.
+
+    Returns:
+        (graph, landmark heuristic or None if the snapshot has no landmarks)
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a graph snapshot")
+    magic, version, flags, n, m, name_bytes, num_landmarks = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a graph snapshot")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported graph snapshot version {version} (expected {FORMAT_VERSION})")
+
+    layout = [
+        ("<i8", n + 1), ("<i4", m), ("<f8", m),
+        ("<f8", n), ("<f8", n), ("<f8", n),
+        ("<i8", n + 1), ("<i4", n), (np.uint8, name_bytes),
+    ]
+    if flags & FLAG_LANDMARKS:
+        layout += [("<i4", num_landmarks), ("<f8", num_landmarks * n)]
+
+    arrays = []
+    offset = HEADER.size
+    for dtype, count in layout:
+        offset += _padding(offset)
+        size = np.dtype(dtype).itemsize * count
+        if offset + size > len(buffer):
+            raise ValueError(f"Graph snapshot {path} is truncated")
+        arrays.append(np.frombuffer(buffer, dtype=dtype, count=count, offset=offset))
+        offset += size
+
+    indptr, indices, weights, latitudes, longitudes, populations, name_offsets, order, data = arrays[:9]
+    names = NameTable(data, name_offsets)
+    graph = CSRGraph(
+        names, indptr, indices, weights, latitudes, longitudes, populations,
+        ids=NameIndex(names, order)
+    )
+    # Known when the snapshot was written, so no traversal is needed after loading
+    graph._connected = bool(flags & FLAG_CONNECTED)
+
+    landmarks = None
+    if flags & FLAG_LANDMARKS:
+        landmarks = LandmarkHeuristic(arrays[9].tolist(), arrays[10].reshape(num_landmarks, n))
+    return graph, landmarks
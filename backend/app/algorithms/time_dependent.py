@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import heapq
+import networkx as nx
+from .base import SearchAlgorithm, reconstruct_path
+from .csr import CSRGraph
+from .heuristics import Heuristic, ZeroHeuristic
+from .traffic import TrafficProfiles
+
+
+class TimeDependentAStar(SearchAlgorithm):
+    """
+    A* on travel time with time-of-day speeds (time-dependent Dijkstra without a heuristic).
+
+    Costs are arrival times: leaving node u at time t, an edge is driven at
+    the speed of the bucket t falls in, switching speed at bucket boundaries.
+    That keeps edges FIFO, so settling each node once at its earliest arrival
+    stays exact. The heuristic must bound travel time in hours, e.g. one built
+    on TrafficProfiles.lower_bound_graph.
+    """
+
+    def __init__(
+        self,
+        graph: Union[CSRGraph, nx.Graph],
+        profiles: TrafficProfiles,
+        departure: float = 0.0,
+        heuristic: Optional[Heuristic] = None
+    ):
+        super().__init__(graph)
+        self.profiles = profiles
+        self.departure = departure
+        self.heuristic = heuristic or ZeroHeuristic()
+        self.travel_time: Optional[float] = None
+
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
+        """
+        Returns the fastest path and its length in distance units;
+        its duration in hours is left in self.travel_time.
+        """
+        estimate = self.heuristic.bind(goal)
+        profiles = self.profiles
+        indptr, indices = self.graph.indptr, self.graph.indices
+        bucket_hours, buckets = profiles.bucket_hours, profiles.buckets
+        inf = float('inf')
+        # Bucket of the last settled node; searches mostly stay within one
+        bucket_start = bucket_end = 0.0
+        durations = None
+
+        # Priority queue: (estimated arrival at goal, arrival, node, parent)
+        frontier = [(estimate(start), self.departure, start, -1)]
+        best_arrival = {start: self.departure}
+        # A node's parent is fixed when it is settled, so parents is also the settled set
+        parents = {}
+
+        while frontier:
+            _, time, node, parent = heapq.heappop(frontier)
+            if node in parents:
+                continue
+
+            parents[node] = parent if parent >= 0 else None
+            self.nodes_explored += 1
+
+            if node == goal:
+                self.travel_time = time - self.departure
+                path = reconstruct_path(parents, goal)
+                return path, sum(self.graph.edge_weight(u, v) for u, v in zip(path, path[1:]))
+
+            if not bucket_start <= time < bucket_end:
+                index = int(time // bucket_hours)
+                durations = profiles.durations(index % buckets)
+                bucket_start, bucket_end = index * bucket_hours, (index + 1) * bucket_hours
+            time_left = bucket_end - time
+
+            lo, hi = indptr[node], indptr[node + 1]
+            for position, neighbor, duration in zip(range(lo, hi), indices[lo:hi].tolist(), durations[lo:hi].tolist()):
+                # Edges that end within the current bucket need no bucket walk
+                if duration <= time_left:
+                    arrival = time + duration
+                else:
+                    arrival = profiles.arrival(position, time)
+                if arrival < best_arrival.get(neighbor, inf):
+                    best_arrival[neighbor] = arrival
+                    heapq.heappush(frontier, (arrival + estimate(neighbor), arrival, neighbor, node))
+
+        return None
+
+    def execute(self, start: str, goal: str) -> Dict[str, Any]:
+        """Execute the search and add departure, arrival and travel time (hours)"""
+        self.travel_time = None
+        result = super().execute(start, goal)
+        result["departure_time"] = self.departure
+        result["travel_time"] = self.travel_time
+        result["arrival_time"] = self.departure + self.travel_time if self.travel_time is not None else None
+        return result
@@ -0,0 +1,183 @@
+from typing import Any, Dict, List, Optional, Tuple
+import time
+import numpy as np
+
+# Moves must gain more than this to count, so float noise cannot cycle
+IMPROVEMENT_EPSILON = 1e-9
+
+
+def _padded(distances: np.ndarray, return_to_start: bool) -> np.ndarray:
+    """
+    Distance matrix with one extra sentinel node placed after the last stop.
+    For a round trip the sentinel is a copy of the start; for an open route
+    it is free to reach, so the final leg costs nothing.
+    """
+    n = len(distances)
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = distances
+    if return_to_start:
+        padded[n, :n] = distances[0]
+        padded[:n, n] = distances[:, 0]
+    return padded
+
+
+def tour_length(distances: np.ndarray, order: List[int], return_to_start: bool = True) -> float:
+    """Total length of visiting `order`, optionally returning to order[0]"""
+    order = np.asarray(order)
+    length = distances[order[:-1], order[1:]].sum()
+    if return_to_start and len(order) > 1:
+        length += distances[order[-1], order[0]]
+    return float(length)
+
+
+def nearest_neighbor_tour(distances: np.ndarray, start: int = 0) -> List[int]:
+    """Greedy construction: always travel to the closest unvisited stop"""
+    n = len(distances)
+    unvisited = np.ones(n, dtype=bool)
+    unvisited[start] = False
+    order = [start]
+    for _ in range(n - 1):
+        row = np.where(unvisited, distances[order[-1]], np.inf)
+        nxt = int(np.argmin(row))
+        order.append(nxt)
+        unvisited[nxt] = False
+    return order
+
+
+def two_opt_move(padded: np.ndarray, seq: np.ndarray) -> Optional[Tuple[float, int, int]]:
+    """
+    Best 2-opt move: reverse seq[i..j] for 1 <= i < j <= n - 1.
+    All O(n^2) candidate deltas are evaluated in one NumPy expression.
+    Returns: (delta, i, j) of the best improving move, or None
+    """
+    n = len(seq) - 1
+    if n < 3:
+        return None
+    edges = padded[seq[:-1], seq[1:]]
+    positions = np.arange(1, n)
+    prev_i, first = seq[positions - 1], seq[positions]
+    last, next_j = seq[positions], seq[positions + 1]
+
+    delta = (
+        padded[np.ix_(prev_i, last)]
+        + padded[np.ix_(first, next_j)]
+        - edges[positions - 1][:, None]
+        - edges[positions][None, :]
+    )
+    delta[np.tril_indices(len(positions))] = np.inf
+
+    best = np.unravel_index(np.argmin(delta), delta.shape)
+    if delta[best] >= -IMPROVEMENT_EPSILON:
+        return None
+    return float(delta[best]), int(positions[best[0]]), int(positions[best[1]])
+
+
+def or_opt_move(padded: np.ndarray, seq: np.ndarray, max_segment: int = 3) -> Optional[Tuple[float, int, int, int, bool]]:
+    """
+    Best Or-opt move: relocate a segment of 1..max_segment stops (optionally
+    reversed) between two other consecutive stops. Deltas for every segment
+    start and insertion edge are evaluated at once per segment length.
+    Returns: (delta, i, length, p, reversed) moving seq[i:i + length] between
+    seq[p] and seq[p + 1], or None
+    """
+    n = len(seq) - 1
+    edges = padded[seq[:-1], seq[1:]]
+    best = None
+
+    for length in range(1, min(max_segment, n - 2) + 1):
+        starts = np.arange(1, n - length + 1)
+        head, tail = seq[starts], seq[starts + length - 1]
+        before, after = seq[starts - 1], seq[starts + length]
+        removal_gain = edges[starts - 1] + edges[starts + length - 1] - padded[before, after]
+
+        slots = np.arange(n)
+        u, v = seq[slots], seq[slots + 1]
+        forward = padded[np.ix_(head, u)].T + padded[np.ix_(tail, v)].T
+        backward = padded[np.ix_(tail, u)].T + padded[np.ix_(head, v)].T
+        # rows: insertion edge p, columns: segment start i
+        insertion = np.minimum(forward, backward) - edges[slots][:, None]
+        delta = insertion - removal_gain[None, :]
+
+        # An insertion edge may not touch the segment itself
+        touching = (slots[:, None] >= starts[None, :] - 1) & (slots[:, None] <= starts[None, :] + length - 1)
+        delta[touching] = np.inf
+
+        p, i = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[p, i] < -IMPROVEMENT_EPSILON and (best is None or delta[p, i] < best[0]):
+            reverse = bool(backward[p, i] < forward[p, i])
+            best = (float(delta[p, i]), int(starts[i]), length, int(slots[p]), reverse)
+
+    return best
+
+
+def _apply_or_opt(seq: np.ndarray, i: int, length: int, p: int, reverse: bool) -> np.ndarray:
+    segment = seq[i:i + length]
+    if reverse:
+        segment = segment[::-1]
+    rest = np.concatenate([seq[:i], seq[i + length:]])
+    # Position of the insertion edge's first node once the segment is removed
+    insert_at = p + 1 if p < i else p - length + 1
+    return np.concatenate([rest[:insert_at], segment, rest[insert_at:]])
+
+
+def optimize_tour(
+    distances: np.ndarray,
+    start: int = 0,
+    return_to_start: bool = True,
+    time_budget: float = 1.0
+) -> Tuple[List[int], float, Dict[str, Any]]:
+    """
+    Order stops to minimize total distance.
+
+    Builds a nearest-neighbor tour from `start`, then applies best-improvement
+    2-opt until it converges, then Or-opt, alternating until neither improves
+    or `time_budget` seconds have passed. The start stays first.
+
+    Args:
+        distances: Symmetric stop-to-stop distance matrix
+        start: Index of the stop the tour starts from
+        return_to_start: Close the tour back at the start
+        time_budget: Seconds allowed for local search
+
+    Returns:
+        (order of stop indices, total distance, statistics)
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    n = len(distances)
+    deadline = time.perf_counter() + time_budget
+
+    order = nearest_neighbor_tour(distances, start)
+    initial = tour_length(distances, order, return_to_start)
+    stats = {"initial_distance": initial, "two_opt_moves": 0, "or_opt_moves": 0, "timed_out": False}
+    if n < 3:
+        return order, initial, stats
+
+    padded = _padded(distances, return_to_start)
+    # The trailing sentinel (index n) keeps both ends of the sequence fixed
+    seq = np.array(order + [n])
+
+    improved = True
+    while improved:
+        improved = False
+        while time.perf_counter() < deadline:
+            move = two_opt_move(padded, seq)
+            if move is None:
+                break
+            _, i, j = move
+            seq[i:j + 1] = seq[i:j + 1][::-1].copy()
+            stats["two_opt_moves"] += 1
+            improved = True
+
+        if time.perf_counter() >= deadline:
+            stats["timed_out"] = True
+            break
+
+        move = or_opt_move(padded, seq)
+        if move is not None:
+            _, i, length, p, reverse = move
+            seq = _apply_or_opt(seq, i, length, p, reverse)
+            stats["or_opt_moves"] += 1
+            improved = True
+
+    order = seq[:-1].tolist()
+    return order, tour_length(distances, order, return_to_start), stats
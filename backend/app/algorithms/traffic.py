@@ -0,0 +1,159 @@
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from .csr import CSRGraph
+
+HOURS_PER_DAY = 24.0
+
+
+def edge_positions(graph: CSRGraph, sources: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """CSR positions of the directed edges sources[i] -> targets[i] (-1 where absent)"""
+    n = graph.num_nodes
+    wanted = np.asarray(sources, dtype=np.int64) * n + np.asarray(targets, dtype=np.int64)
+    if len(graph.indices) == 0:
+        return np.full(len(wanted), -1, dtype=np.int64)
+
+    keys = np.repeat(np.arange(n, dtype=np.int64), np.diff(graph.indptr)) * n + graph.indices
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    found = np.minimum(np.searchsorted(sorted_keys, wanted), len(keys) - 1)
+    return np.where(sorted_keys[found] == wanted, order[found], -1)
+
+
+class TrafficProfiles:
+    """
+    Time-of-day speeds for the directed edges of a CSR snapshot.
+
+    The day is split into equal buckets. speeds[r, b] is the speed (distance
+    units per hour) of profile r during bucket b, and profile_of[p] the profile
+    of the edge stored at CSR position p. Identical profiles are stored once and
+    row 0 is the constant default speed used by edges without a profile.
+    """
+
+    def __init__(self, graph: CSRGraph, profile_of: np.ndarray, speeds: np.ndarray):
+        self.weights = graph.weights
+        self.profile_of = np.ascontiguousarray(profile_of, dtype=np.int32)
+        self.speeds = np.ascontiguousarray(speeds, dtype=np.float32)
+        self.buckets = self.speeds.shape[1]
+        self.bucket_hours = HOURS_PER_DAY / self.buckets
+        self.max_speed = float(self.speeds.max())
+        # Edge durations per bucket, filled as searches reach each bucket
+        self._durations: List[Optional[np.ndarray]] = [None] * self.buckets
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_durations'] = [None] * self.buckets
+        return state
+
+    @classmethod
+    def constant(cls, graph: CSRGraph, speed: float, buckets: int = 96) -> "TrafficProfiles":
+        """Every edge at the same speed all day"""
+        return cls(graph, np.zeros(len(graph.indices), dtype=np.int32), np.full((1, buckets), speed))
+
+    @classmethod
+    def from_frame(
+        cls,
+        graph: CSRGraph,
+        frame: pd.DataFrame,
+        buckets: int = 96,
+        default_speed: float = 60.0,
+        bidirectional: bool = True
+    ) -> "TrafficProfiles":
+        """
+        Build from rows of (city1, city2, bucket, speed).
+        Each row sets the speed from city1 to city2 during one bucket, and the
+        reverse direction too when `bidirectional`. Buckets an edge has no row
+        for keep the default speed.
+        """
+        cities = set(frame['city1']).union(frame['city2'])
+        missing = sorted(city for city in cities if city not in graph)
+        if missing:
+            raise ValueError(f"Cities not found in graph: {missing[:10]}")
+
+        ids = {city: graph.node_id(city) for city in cities}
+        sources = frame['city1'].map(ids).to_numpy(dtype=np.int64)
+        targets = frame['city2'].map(ids).to_numpy(dtype=np.int64)
+        bucket = frame['bucket'].to_numpy(dtype=np.int64)
+        speed = frame['speed'].to_numpy(dtype=np.float64)
+
+        if ((bucket < 0) | (bucket >= buckets)).any():
+            raise ValueError(f"Buckets must be between 0 and {buckets - 1}")
+        if not (speed > 0).all():
+            raise ValueError("Speeds must be positive")
+
+        if bidirectional:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            bucket, speed = np.tile(bucket, 2), np.tile(speed, 2)
+
+        positions = edge_positions(graph, sources, targets)
+        if (positions < 0).any():
+            first = int(np.argmax(positions < 0))
+            raise ValueError(
+                f"Connection {graph.node_name(int(sources[first]))} - "
+                f"{graph.node_name(int(targets[first]))} does not exist"
+            )
+
+        edges, rows = np.unique(positions, return_inverse=True)
+        table = np.full((len(edges), buckets), default_speed)
+        table[rows, bucket] = speed
+        # Many edges share a profile (e.g. one per road class), so store each once
+        unique, profile = np.unique(table, axis=0, return_inverse=True)
+
+        profile_of = np.zeros(len(graph.indices), dtype=np.int32)
+        profile_of[edges] = profile.reshape(-1) + 1
+        return cls(graph, profile_of, np.vstack([np.full((1, buckets), default_speed), unique]))
+
+    @property
+    def num_profiled_edges(self) -> int:
+        """Number of directed edges with a profile of their own"""
+        return int(np.count_nonzero(self.profile_of))
+
+    def remap(self, graph: CSRGraph, new_graph: CSRGraph) -> "TrafficProfiles":
+        """Profiles for a snapshot with changed edges; new edges get the default speed"""
+        sources = np.repeat(np.arange(new_graph.num_nodes, dtype=np.int64), np.diff(new_graph.indptr))
+        positions = edge_positions(graph, sources, new_graph.indices)
+        profile_of = np.where(positions >= 0, self.profile_of[np.maximum(positions, 0)], 0)
+        return TrafficProfiles(new_graph, profile_of, self.speeds)
+
+    def lower_bound_graph(self, graph: CSRGraph) -> CSRGraph:
+        """
+        Snapshot weighted by the least time (hours) each edge can take in
+        either direction, so distance heuristics built on it bound travel time.
+        """
+        hours = graph.weights / self.speeds.max(axis=1)[self.profile_of]
+        sources = np.repeat(np.arange(graph.num_nodes, dtype=np.int64), np.diff(graph.indptr))
+        hours = np.minimum(hours, hours[edge_positions(graph, graph.indices, sources)])
+        return CSRGraph(
+            graph.names, graph.indptr, graph.indices, hours,
+            graph.latitudes, graph.longitudes, graph.populations, ids=graph.ids
+        )
+
+    def bucket(self, time: float) -> int:
+        """Bucket of a time given in hours (days wrap around)"""
+        return int(time // self.bucket_hours) % self.buckets
+
+    def durations(self, bucket: int) -> np.ndarray:
+        """Hours to drive each edge at the speeds of one bucket"""
+        durations = self._durations[bucket]
+        if durations is None:
+            durations = self.weights / self.speeds[self.profile_of, bucket]
+            self._durations[bucket] = durations
+        return durations
+
+    def arrival(self, position: int, time: float) -> float:
+        """
+        Arrival time after entering the edge at CSR `position` at `time`.
+        Speed changes at bucket boundaries are honored mid-edge, so leaving
+        later never means arriving earlier.
+        """
+        speeds = self.speeds[self.profile_of[position]].tolist()
+        remaining = float(self.weights[position])
+        while True:
+            index = int(time // self.bucket_hours)
+            speed = speeds[index % self.buckets]
+            bucket_end = (index + 1) * self.bucket_hours
+            reach = speed * (bucket_end - time)
+            if reach >= remaining:
+                return time + remaining / speed
+            remaining -= reach
+            time = bucket_end
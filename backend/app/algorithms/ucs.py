@@ -1,36 +1,52 @@
-from typing import List, Tuple
-from .base import SearchAlgorithm
+from typing import Dict, List, Tuple, Optional
+import heapq
+from itertools import count
+from .base import SearchAlgorithm, reconstruct_path
 
 
 class UCSAlgorithm(SearchAlgorithm):
     """Uniform Cost Search Algorithm"""
 
-    def search(self, start: str, goal: str) -> Tuple[List[str], float]:
+    def _search(self, start: int, goal: int) -> Optional[Tuple[List[int], float]]:
         """
         UCS always expands the node with lowest cumulative cost.
         Guarantees optimal path when all edge costs are non-negative.
         """
-        queue = [(start, [start], 0)]
-        visited = set()
-
-        while queue:
-            (state, path, cost) = queue.pop(0)
-
-            if state in visited:
+        return self._search_many(start, [goal]).get(goal)
+
+    def _search_many(self, start: int, goals: List[int]) -> Dict[int, Tuple[List[int], float]]:
+        """Expand in cost order until every goal has been expanded"""
+        remaining = set(goals)
+        results = {}
+        # Binary heap with lazy decrease-key: a cheaper route to a node is pushed
+        # as a new entry and the outdated one is skipped when popped. The sequence
+        # number keeps equal-cost entries in insertion (FIFO) order.
+        sequence = count()
+        queue = [(0, next(sequence), start, None)]
+        best_cost = {start: 0}
+        # A node's parent is fixed when it is expanded, so parents is also the visited set
+        parents = {}
+
+        while queue and remaining:
+            (cost, _, state, parent) = heapq.heappop(queue)
+
+            if state in parents:
                 continue
 
-            visited.add(state)
+            parents[state] = parent
             self.nodes_explored += 1
 
-            if state == goal:
-                return path, cost
-
-            for neighbor in self.graph[state]:
-                if neighbor not in visited:
-                    new_cost = cost + self.graph[state][neighbor]["distance"]
-                    queue.append((neighbor, path + [neighbor], new_cost))
+            if state in remaining:
+                remaining.discard(state)
+                results[state] = (reconstruct_path(parents, state), cost)
+                if not remaining:
+                    break
 
-            # Sort by cost (priority queue behavior)
-            queue.sort(key=lambda x: x[2])
+            for neighbor, distance in self.graph.neighbors(state):
+                if neighbor not in parents:
+                    new_cost = cost + distance
+                    if new_cost < best_cost.get(neighbor, float('inf')):
+                        best_cost[neighbor] = new_cost
+                        heapq.heappush(queue, (new_cost, next(sequence), neighbor, state))
 
-        raise Exception(f"No path found from {start} to {goal}")
+        return results
@@ -0,0 +1,341 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import math
+import os
+import time
+import numpy as np
+
+# Arrivals may exceed a window by this much (float noise), and moves must gain more
+EPSILON = 1e-9
+
+
+class VRPProblem:
+    """
+    Capacitated vehicle routing problem with time windows.
+
+    Locations are indices into `distances`. Each vehicle starts and ends at
+    its depot location; each delivery has a location, a demand, a time window
+    [ready, due] in which service must start and a service duration. Travel
+    time is distance / speed, and vehicles may wait for a window to open.
+    """
+
+    def __init__(
+        self,
+        distances: np.ndarray,
+        vehicle_depots: List[int],
+        capacities: List[float],
+        locations: List[int],
+        demands: List[float],
+        ready: Optional[List[float]] = None,
+        due: Optional[List[float]] = None,
+        service_times: Optional[List[float]] = None,
+        speed: float = 1.0
+    ):
+        n = len(locations)
+        self.distances = np.asarray(distances, dtype=np.float64)
+        self.vehicle_depots = list(vehicle_depots)
+        self.capacities = [float(c) for c in capacities]
+        self.locations = list(locations)
+        self.demands = [float(d) for d in demands]
+        self.ready = [0.0] * n if ready is None else [float(t) for t in ready]
+        self.due = [math.inf] * n if due is None else [float(t) for t in due]
+        self.service_times = [0.0] * n if service_times is None else [float(t) for t in service_times]
+        self.speed = float(speed)
+        # Route evaluation is a scalar loop, which is faster over nested lists than NumPy
+        self._rows = self.distances.tolist()
+
+    @property
+    def num_vehicles(self) -> int:
+        return len(self.vehicle_depots)
+
+    @property
+    def num_deliveries(self) -> int:
+        return len(self.locations)
+
+    def load(self, route: List[int]) -> float:
+        return sum(self.demands[d] for d in route)
+
+    def evaluate(self, vehicle: int, route: List[int]) -> Optional[float]:
+        """Distance driven by `vehicle` on `route`, or None if it breaks capacity or a window"""
+        if not route:
+            return 0.0
+        if self.load(route) > self.capacities[vehicle] + EPSILON:
+            return None
+
+        rows, locations, speed = self._rows, self.locations, self.speed
+        depot = self.vehicle_depots[vehicle]
+        here, clock, distance = depot, 0.0, 0.0
+        for delivery in route:
+            there = locations[delivery]
+            leg = rows[here][there]
+            distance += leg
+            clock = max(clock + leg / speed, self.ready[delivery])
+            if clock > self.due[delivery] + EPSILON:
+                return None
+            clock += self.service_times[delivery]
+            here = there
+        distance += rows[here][depot]
+        # Stops that cannot reach each other make the route infeasible, not infinitely long
+        return distance if distance < math.inf else None
+
+    def schedule(self, vehicle: int, route: List[int]) -> List[Tuple[float, float]]:
+        """(arrival, service start) time of each delivery on a feasible route"""
+        rows, depot = self._rows, self.vehicle_depots[vehicle]
+        here, clock, times = depot, 0.0, []
+        for delivery in route:
+            arrival = clock + rows[here][self.locations[delivery]] / self.speed
+            start = max(arrival, self.ready[delivery])
+            times.append((arrival, start))
+            clock = start + self.service_times[delivery]
+            here = self.locations[delivery]
+        return times
+
+
+class VRPSolution:
+    """Routes per vehicle (lists of delivery indices) and the deliveries left unserved"""
+
+    def __init__(self, routes: List[List[int]], unassigned: List[int], total_distance: float, restart: int = 0):
+        self.routes = routes
+        self.unassigned = unassigned
+        self.total_distance = total_distance
+        self.restart = restart
+
+    def key(self) -> Tuple[int, float]:
+        """Serving more deliveries always beats driving less"""
+        return len(self.unassigned), self.total_distance
+
+
+def savings_routes(problem: VRPProblem, rng: np.random.Generator, noise: float = 0.0) -> Tuple[List[List[int]], List[int]]:
+    """
+    Clarke-Wright savings construction, run per depot.
+
+    Every delivery goes to the nearest depot that has vehicles and starts on
+    its own route; routes are merged end to end in order of decreasing saving
+    d(depot, i) + d(depot, j) - d(i, j) while the merge stays feasible for the
+    depot's largest vehicle. With `noise` > 0 savings are randomly perturbed,
+    which gives restarts different starting points.
+    """
+    distances = problem.distances
+    by_depot: Dict[int, List[int]] = {}
+    for vehicle in sorted(range(problem.num_vehicles), key=lambda v: -problem.capacities[v]):
+        by_depot.setdefault(problem.vehicle_depots[vehicle], []).append(vehicle)
+
+    depots = list(by_depot)
+    locations = np.array(problem.locations, dtype=np.int64)
+    nearest = np.array(depots)[np.argmin(distances[np.ix_(depots, locations)], axis=0)] if len(locations) else []
+
+    routes: List[List[int]] = [[] for _ in range(problem.num_vehicles)]
+    unassigned: List[int] = []
+
+    for depot, vehicles in by_depot.items():
+        largest = vehicles[0]
+        members = [d for d in range(problem.num_deliveries) if nearest[d] == depot]
+        open_routes: Dict[int, List[int]] = {}
+        route_of: Dict[int, int] = {}
+        for delivery in members:
+            if problem.evaluate(largest, [delivery]) is None:
+                unassigned.append(delivery)
+            else:
+                open_routes[delivery] = [delivery]
+                route_of[delivery] = delivery
+
+        served = np.array([d for d in members if d in route_of], dtype=np.int64)
+        if len(served) > 1:
+            at = locations[served]
+            savings = distances[depot, at][:, None] + distances[depot, at][None, :] - distances[np.ix_(at, at)]
+            if noise > 0:
+                savings = savings * (1.0 + noise * rng.standard_normal(savings.shape))
+            rows, cols = np.triu_indices(len(served), k=1)
+            for pair in np.argsort(-savings[rows, cols], kind="stable"):
+                i, j = int(served[rows[pair]]), int(served[cols[pair]])
+                a, b = route_of[i], route_of[j]
+                if a == b:
+                    continue
+                first, second = open_routes[a], open_routes[b]
+                candidates = []
+                if first[-1] == i and second[0] == j:
+                    candidates.append(first + second)
+                if second[-1] == j and first[0] == i:
+                    candidates.append(second + first)
+                if first[-1] == i and second[-1] == j:
+                    candidates.append(first + second[::-1])
+                if first[0] == i and second[0] == j:
+                    candidates.append(first[::-1] + second)
+                for merged in candidates:
+                    if problem.evaluate(largest, merged) is not None:
+                        del open_routes[b]
+                        open_routes[a] = merged
+                        for delivery in merged:
+                            route_of[delivery] = a
+                        break
+
+        # Heaviest routes go to the biggest vehicles; routes without a fitting vehicle wait for repair
+        for route in sorted(open_routes.values(), key=lambda r: -problem.load(r)):
+            vehicle = next((v for v in vehicles if not routes[v] and problem.evaluate(v, route) is not None), None)
+            if vehicle is None:
+                unassigned.extend(route)
+            else:
+                routes[vehicle] = route
+
+    return routes, unassigned
+
+
+def local_search(
+    problem: VRPProblem,
+    routes: List[List[int]],
+    unassigned: List[int],
+    rng: np.random.Generator,
+    deadline: float
+) -> Tuple[List[List[int]], List[int]]:
+    """
+    First-improvement local search until no move helps or the deadline passes:
+    insert unserved deliveries at their cheapest feasible position, relocate a
+    delivery to another position or vehicle, swap deliveries between vehicles,
+    and reverse segments within a route (2-opt). Moves are tried in a random
+    order drawn from `rng`.
+    """
+    routes = [list(route) for route in routes]
+    unassigned = list(unassigned)
+    costs = [problem.evaluate(v, route) for v, route in enumerate(routes)]
+    vehicles = list(range(problem.num_vehicles))
+
+    def best_insertion(delivery: int):
+        best = None
+        for v in vehicles:
+            route = routes[v]
+            for position in range(len(route) + 1):
+                candidate = route[:position] + [delivery] + route[position:]
+                cost = problem.evaluate(v, candidate)
+                if cost is not None and (best is None or cost - costs[v] < best[0]):
+                    best = (cost - costs[v], v, candidate, cost)
+        return best
+
+    improved = True
+    while improved and time.perf_counter() < deadline:
+        improved = False
+
+        for delivery in list(unassigned):
+            insertion = best_insertion(delivery)
+            if insertion is not None:
+                _, v, candidate, cost = insertion
+                routes[v], costs[v] = candidate, cost
+                unassigned.remove(delivery)
+                improved = True
+
+        # Relocate: remove a delivery and reinsert it wherever it is cheapest
+        placed = [(v, d) for v in vehicles for d in routes[v]]
+        for index in rng.permutation(len(placed)):
+            if time.perf_counter() >= deadline:
+                break
+            v, delivery = placed[index]
+            if delivery not in routes[v]:
+                continue
+            position = routes[v].index(delivery)
+            shorter = routes[v][:position] + routes[v][position + 1:]
+            shorter_cost = problem.evaluate(v, shorter)
+            if shorter_cost is None:
+                continue
+            saved = costs[v] - shorter_cost
+            original, original_cost = routes[v], costs[v]
+            routes[v], costs[v] = shorter, shorter_cost
+            insertion = best_insertion(delivery)
+            if insertion is not None and insertion[0] < saved - EPSILON:
+                _, target, candidate, cost = insertion
+                routes[target], costs[target] = candidate, cost
+                improved = True
+            else:
+                routes[v], costs[v] = original, original_cost
+
+        # Swap deliveries between two vehicles in place
+        for a in rng.permutation(problem.num_vehicles):
+            if time.perf_counter() >= deadline:
+                break
+            for b in range(a + 1, problem.num_vehicles):
+                for i in range(len(routes[a])):
+                    for j in range(len(routes[b])):
+                        new_a = routes[a][:i] + [routes[b][j]] + routes[a][i + 1:]
+                        new_b = routes[b][:j] + [routes[a][i]] + routes[b][j + 1:]
+                        cost_a = problem.evaluate(a, new_a)
+                        if cost_a is None:
+                            continue
+                        cost_b = problem.evaluate(b, new_b)
+                        if cost_b is None or cost_a + cost_b >= costs[a] + costs[b] - EPSILON:
+                            continue
+                        routes[a], routes[b], costs[a], costs[b] = new_a, new_b, cost_a, cost_b
+                        improved = True
+
+        # Intra-route 2-opt
+        for v in vehicles:
+            route = routes[v]
+            for i in range(len(route) - 1):
+                for j in range(i + 1, len(route)):
+                    candidate = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
+                    cost = problem.evaluate(v, candidate)
+                    if cost is not None and cost < costs[v] - EPSILON:
+                        route, routes[v], costs[v] = candidate, candidate, cost
+                        improved = True
+
+    return routes, unassigned
+
+
+def _solve_restart(problem: VRPProblem, seed: int, restart: int, time_budget: float) -> VRPSolution:
+    """One construction plus local search; restart 0 uses the plain savings order"""
+    deadline = time.perf_counter() + time_budget
+    rng = np.random.default_rng([seed, restart])
+    routes, unassigned = savings_routes(problem, rng, noise=0.0 if restart == 0 else 0.2)
+    routes, unassigned = local_search(problem, routes, unassigned, rng, deadline)
+    total = sum(problem.evaluate(v, route) for v, route in enumerate(routes))
+    return VRPSolution(routes, sorted(unassigned), total, restart)
+
+
+def _map_restarts(pool: Executor, problem: VRPProblem, seed: int, restarts: int, budget: float) -> List[VRPSolution]:
+    return list(pool.map(
+        _solve_restart,
+        [problem] * restarts,
+        [seed] * restarts,
+        range(restarts),
+        [budget] * restarts
+    ))
+
+
+def solve_vrp(
+    problem: VRPProblem,
+    seed: int = 0,
+    time_budget: float = 2.0,
+    restarts: int = 4,
+    workers: Optional[int] = None,
+    pool: Optional[Executor] = None
+) -> VRPSolution:
+    """
+    Savings construction plus local search from several seeded restarts.
+
+    Restarts run in parallel on `pool`, or on a process pool created for
+    this call when none is given, and inline when `workers` is 1. The best
+    solution wins, ties going to the lowest restart, so a given seed gives
+    the same answer unless the time budget cuts a search short.
+
+    Args:
+        problem: Vehicles, deliveries and distances
+        seed: Seed for the perturbed restarts
+        time_budget: Wall-clock seconds for the whole solve
+        restarts: Number of constructions to improve
+        workers: Worker processes (None = one per CPU)
+        pool: Long-lived executor with `workers` workers to run the restarts on
+
+    Returns:
+        The best VRPSolution found
+    """
+    restarts = max(1, restarts)
+    workers = max(1, min(workers or os.cpu_count() or 1, restarts))
+    # Restarts run in waves of `workers`; each wave gets an equal share of the budget
+    budget = time_budget / math.ceil(restarts / workers)
+
+    if workers == 1:
+        solutions = [_solve_restart(problem, seed, restart, budget) for restart in range(restarts)]
+    elif pool is not None:
+        solutions = _map_restarts(pool, problem, seed, restarts, budget)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as own_pool:
+            solutions = _map_restarts(own_pool, problem, seed, restarts, budget)
+
+    return min(solutions, key=lambda solution: (solution.key(), solution.restart))
@@ -1,18 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
+from datetime import date, datetime
+import io
+import json
+import numpy as np
 from .schemas import (
     RouteRequest,
+    BatchRouteRequest,
     RouteResponse,
     CompareRequest,
     CompareResponse,
+    MatrixRequest,
+    MatrixResponse,
+    TourRequest,
+    TourResponse,
+    VRPRequest,
+    VRPResponse,
+    EdgeUpdateRequest,
+    EdgeUpdateResponse,
+    TrafficLoadResponse,
     CityInfo,
     GraphStats,
     SearchHistoryItem,
+    AlgorithmHistoryStats,
+    DailyHistoryItem,
+    HistoryCompactResponse,
+    CacheStats,
+    ExecutorStats,
+    HistoryWriterStats,
     HealthResponse
 )
-from ..core.database import get_db
-from ..services import graph_service, route_service
+from ..core.config import settings
+from ..core.database import get_async_db, get_db, SessionLocal
+from ..services import (
+    graph_service,
+    history_retention,
+    history_service,
+    history_writer,
+    route_service,
+    route_cache,
+    search_executor,
+    tour_service,
+    vrp_service,
+    SearchRejectedError,
+    SearchTimeoutError
+)
 
 router = APIRouter()
 
@@ -20,12 +56,12 @@ router = APIRouter()
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    graph = graph_service.get_graph()
+    snapshot = graph_service.get_snapshot()
     return {
         "status": "healthy",
         "version": "1.0.0",
-        "graph_loaded": graph is not None,
-        "total_cities": graph.number_of_nodes() if graph else 0
+        "graph_loaded": snapshot is not None,
+        "total_cities": snapshot.num_nodes if snapshot is not None else 0
     }
 
 
@@ -56,17 +92,53 @@ async def get_graph_stats():
     return stats
 
 
+@router.post("/graph/edges", response_model=EdgeUpdateResponse)
+async def update_edges(request: EdgeUpdateRequest):
+    """
+    Add, remove or reweight connections without reloading the graph.
+    Searches already running finish on the previous graph version.
+    """
+    try:
+        return await run_in_threadpool(
+            graph_service.update_edges,
+            [update.model_dump() for update in request.updates]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/graph/traffic", response_model=TrafficLoadResponse)
+async def load_traffic(file: UploadFile = File(..., description="CSV or Parquet with columns city1, city2, bucket, speed")):
+    """Load time-of-day speed profiles used by routes with a departure_time"""
+    content = await file.read()
+    file_format = "parquet" if (file.filename or "").lower().endswith(".parquet") else "csv"
+    try:
+        return await run_in_threadpool(graph_service.load_traffic, io.BytesIO(content), file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/route/find", response_model=RouteResponse)
 async def find_route(request: RouteRequest, db: Session = Depends(get_db)):
     """Find route between two cities using specified algorithm"""
     try:
-        result = route_service.find_route(
+        result = await route_service.find_route_async(
             start=request.start,
             goal=request.goal,
             algorithm=request.algorithm,
-            db=db
+            db=db,
+            k=request.k,
+            departure_time=request.departure_time
         )
         return result
+    except SearchRejectedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -77,13 +149,125 @@ async def find_route(request: RouteRequest, db: Session = Depends(get_db)):
 async def compare_algorithms(request: CompareRequest, db: Session = Depends(get_db)):
     """Compare multiple algorithms for the same route"""
     try:
-        result = route_service.compare_algorithms(
+        result = await route_service.compare_algorithms_async(
             start=request.start,
             goal=request.goal,
             algorithms=request.algorithms,
             db=db
         )
         return result
+    except SearchRejectedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/route/batch")
+async def find_routes_batch(request: BatchRouteRequest):
+    """
+    Find many routes in one request. Results stream back as newline-delimited
+    JSON in completion order, each tagged with the index of its route.
+    """
+    if len(request.routes) > settings.ROUTE_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch exceeds ROUTE_BATCH_MAX_SIZE ({settings.ROUTE_BATCH_MAX_SIZE} routes)"
+        )
+
+    # The stream outlives request dependencies, so it owns its session
+    db = SessionLocal()
+    try:
+        results = route_service.find_routes_batch(
+            [(route.start, route.goal, route.algorithm) for route in request.routes],
+            db=db
+        )
+    except ValueError as e:
+        db.close()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def stream():
+        try:
+            async for result in results:
+                yield json.dumps(result) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/matrix", response_model=MatrixResponse)
+async def get_distance_matrix(request: MatrixRequest):
+    """
+    Origin-destination distance matrix. JSON uses null for unreachable pairs;
+    format "npy" returns the float64 array in NumPy .npy format with inf instead.
+    """
+    destinations = request.destinations if request.destinations is not None else request.origins
+    try:
+        distances = await route_service.distance_matrix(request.origins, destinations)
+    except SearchRejectedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if request.format == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, distances)
+        return Response(content=buffer.getvalue(), media_type="application/x-npy")
+
+    cells = distances.astype(object)
+    cells[~np.isfinite(distances)] = None
+    return {
+        "origins": request.origins,
+        "destinations": destinations,
+        "distances": cells.tolist()
+    }
+
+
+@router.post("/tour", response_model=TourResponse)
+async def optimize_tour(request: TourRequest):
+    """Order multiple stops into a short tour and return its road path"""
+    try:
+        return await tour_service.optimize_tour(
+            stops=request.stops,
+            start=request.start,
+            return_to_start=request.return_to_start,
+            algorithm=request.algorithm,
+            time_budget=request.time_budget
+        )
+    except SearchRejectedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/vrp", response_model=VRPResponse)
+async def solve_vrp(request: VRPRequest):
+    """Assign deliveries to vehicles with capacity limits and delivery time windows"""
+    try:
+        return await vrp_service.solve(
+            vehicles=[vehicle.model_dump() for vehicle in request.vehicles],
+            deliveries=[delivery.model_dump() for delivery in request.deliveries],
+            speed=request.speed,
+            seed=request.seed,
+            time_budget=request.time_budget,
+            algorithm=request.algorithm
+        )
+    except SearchRejectedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SearchTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -92,22 +276,96 @@ async def compare_algorithms(request: CompareRequest, db: Session = Depends(get_
 
 @router.get("/history", response_model=List[SearchHistoryItem])
 async def get_search_history(
+    response: Response,
     db: Session = Depends(get_db),
-    limit: int = Query(default=100, le=1000),
-    algorithm: Optional[str] = None
+    async_db: Optional[AsyncSession] = Depends(get_async_db),
+    limit: int = Query(default=100, ge=1, le=1000),
+    algorithm: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_path: bool = True
 ):
-    """Get search history"""
+    """
+    Get search history, newest first (through the async engine when DATABASE_ASYNC is on).
+    When more rows follow, the X-Next-Cursor header holds the cursor of the next page.
+    """
     try:
-        history = route_service.get_search_history(
-            db=db,
-            limit=limit,
-            algorithm=algorithm
-        )
-        return history
+        if async_db is not None:
+            page = await history_service.get_page_async(async_db, limit, algorithm, cursor, include_path)
+        else:
+            page = await run_in_threadpool(history_service.get_page, db, limit, algorithm, cursor, include_path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if page['next_cursor']:
+        response.headers["X-Next-Cursor"] = page['next_cursor']
+    return page['items']
+
+
+@router.get("/history/stats", response_model=List[AlgorithmHistoryStats])
+async def get_search_history_stats(
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db),
+    since: Optional[datetime] = None
+):
+    """Get per-algorithm search counts, averages and optimality rate"""
+    try:
+        if async_db is not None:
+            return await history_service.get_stats_async(async_db, since)
+        return await run_in_threadpool(history_service.get_stats, db, since)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/history/daily", response_model=List[DailyHistoryItem])
+async def get_daily_search_history(
+    db: Session = Depends(get_db),
+    async_db: Optional[AsyncSession] = Depends(get_async_db),
+    limit: int = Query(default=1000, ge=1, le=10000),
+    start: Optional[str] = None,
+    goal: Optional[str] = None,
+    algorithm: Optional[str] = None,
+    since: Optional[date] = None,
+    until: Optional[date] = None
+):
+    """Get daily per-route aggregates of searches compacted out of the raw history"""
+    try:
+        if async_db is not None:
+            return await history_service.get_daily_async(async_db, limit, start, goal, algorithm, since, until)
+        return await run_in_threadpool(history_service.get_daily, db, limit, start, goal, algorithm, since, until)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/history/compact", response_model=HistoryCompactResponse)
+async def compact_search_history(db: Session = Depends(get_db)):
+    """Roll raw history older than HISTORY_RETENTION_DAYS into daily aggregates now"""
+    try:
+        return await run_in_threadpool(history_retention.compact, db.get_bind())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cache/stats", response_model=CacheStats)
+async def get_cache_stats():
+    """Get route cache size and hit/miss statistics"""
+    return route_cache.get_stats()
+
+
+@router.get("/executor/stats", response_model=ExecutorStats)
+async def get_executor_stats():
+    """Get search worker pool load and rejection statistics"""
+    return search_executor.get_stats()
+
+
+@router.get("/history/writer/stats", response_model=HistoryWriterStats)
+async def get_history_writer_stats():
+    """Get search history write backlog, dropped rows and write failures"""
+    return history_writer.get_stats()
+
+
 @router.get("/algorithms", response_model=List[str])
 async def get_available_algorithms():
     """Get list of available algorithms"""
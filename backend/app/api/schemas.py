@@ -1,12 +1,14 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
 
 
 class RouteRequest(BaseModel):
     start: str = Field(..., description="Starting city name")
     goal: str = Field(..., description="Destination city name")
-    algorithm: str = Field(default="astar", description="Algorithm to use (bfs, dfs, ucs, astar, dijkstra, bidirectional)")
+    algorithm: str = Field(default="astar", description="Algorithm to use (bfs, dfs, ucs, astar, dijkstra, bidirectional, bidirectional_dijkstra, ch, matrix)")
+    k: int = Field(default=1, ge=1, description="Number of alternative routes (k shortest loopless paths) to include")
+    departure_time: Optional[float] = Field(default=None, ge=0, description="Departure in hours after midnight; routes by travel time under the traffic profiles (astar, dijkstra)")
 
 
 class CompareRequest(BaseModel):
@@ -15,6 +17,24 @@ class CompareRequest(BaseModel):
     algorithms: Optional[List[str]] = Field(default=None, description="List of algorithms to compare")
 
 
+class BatchRouteItem(BaseModel):
+    # Batches run plain searches only; k or departure_time is rejected rather than ignored
+    model_config = ConfigDict(extra="forbid")
+
+    start: str = Field(..., description="Starting city name")
+    goal: str = Field(..., description="Destination city name")
+    algorithm: str = Field(default="astar", description="Algorithm to use (bfs, dfs, ucs, astar, dijkstra, bidirectional, bidirectional_dijkstra, ch, matrix)")
+
+
+class BatchRouteRequest(BaseModel):
+    routes: List[BatchRouteItem] = Field(..., min_length=1, description="Routes to find; results stream back as NDJSON lines tagged with their index")
+
+
+class AlternativeRoute(BaseModel):
+    path: List[str]
+    total_distance: float
+
+
 class RouteResponse(BaseModel):
     algorithm: str
     path: List[str]
@@ -26,6 +46,10 @@ class RouteResponse(BaseModel):
     is_optimal_distance: Optional[bool] = None
     is_fastest: Optional[bool] = None
     is_most_efficient: Optional[bool] = None
+    alternatives: Optional[List[AlternativeRoute]] = None
+    departure_time: Optional[float] = None
+    arrival_time: Optional[float] = None
+    travel_time: Optional[float] = None
 
 
 class CompareResponse(BaseModel):
@@ -35,6 +59,116 @@ class CompareResponse(BaseModel):
     summary: Dict[str, int]
 
 
+class MatrixRequest(BaseModel):
+    origins: List[str] = Field(..., min_length=1, description="Origin city names (matrix rows)")
+    destinations: Optional[List[str]] = Field(default=None, description="Destination city names (matrix columns, default: origins)")
+    format: Literal["json", "npy"] = Field(default="json", description="json, or npy for a binary NumPy array")
+
+
+class MatrixResponse(BaseModel):
+    origins: List[str]
+    destinations: List[str]
+    distances: List[List[Optional[float]]]
+
+
+class TourRequest(BaseModel):
+    stops: List[str] = Field(..., min_length=2, description="City names to visit")
+    start: Optional[str] = Field(default=None, description="Depot city the tour starts from (default: first stop)")
+    return_to_start: bool = Field(default=True, description="End the tour back at the start")
+    algorithm: str = Field(default="astar", description="Algorithm used to route each leg")
+    time_budget: Optional[float] = Field(default=None, gt=0, le=30, description="Seconds for local search")
+
+
+class TourLeg(BaseModel):
+    start: str
+    goal: str
+    distance: float
+
+
+class TourResponse(BaseModel):
+    stops: List[str]
+    return_to_start: bool
+    total_distance: float
+    path: List[str]
+    legs: List[TourLeg]
+    initial_distance: float
+    two_opt_moves: int
+    or_opt_moves: int
+    timed_out: bool
+    optimization_time: float
+
+
+class VRPVehicle(BaseModel):
+    id: str = Field(..., description="Vehicle identifier")
+    depot: str = Field(..., description="City the vehicle starts from and returns to")
+    capacity: float = Field(..., gt=0, description="Total demand the vehicle can carry")
+
+
+class VRPDelivery(BaseModel):
+    city: str = Field(..., description="Delivery city")
+    demand: float = Field(default=1.0, ge=0)
+    ready: float = Field(default=0.0, ge=0, description="Earliest service start (hours from dispatch)")
+    due: Optional[float] = Field(default=None, ge=0, description="Latest service start (hours from dispatch)")
+    service_time: float = Field(default=0.0, ge=0, description="Hours spent at the stop")
+
+
+class VRPRequest(BaseModel):
+    vehicles: List[VRPVehicle] = Field(..., min_length=1)
+    deliveries: List[VRPDelivery] = Field(..., min_length=1)
+    speed: float = Field(default=60.0, gt=0, description="Travel speed in distance units per hour")
+    seed: int = Field(default=0, description="Seed for the randomized restarts")
+    time_budget: Optional[float] = Field(default=None, gt=0, le=60, description="Seconds for the solver")
+    algorithm: str = Field(default="astar", description="Algorithm used to route each leg")
+
+
+class VRPStop(BaseModel):
+    delivery: int
+    city: str
+    arrival: float
+    service_start: float
+
+
+class VRPRoute(BaseModel):
+    vehicle: str
+    depot: str
+    stops: List[VRPStop]
+    load: float
+    distance: float
+    path: List[str]
+
+
+class VRPResponse(BaseModel):
+    routes: List[VRPRoute]
+    unassigned: List[int]
+    total_distance: float
+    vehicles_used: int
+    seed: int
+    solve_time: float
+
+
+class EdgeUpdate(BaseModel):
+    action: Literal["add", "remove", "update"] = Field(..., description="Add a connection, remove it, or change its distance")
+    city1: str
+    city2: str
+    distance: Optional[float] = Field(default=None, gt=0, description="New distance (not needed for remove)")
+
+
+class EdgeUpdateRequest(BaseModel):
+    updates: List[EdgeUpdate] = Field(..., min_length=1, description="Applied in order, all or none")
+
+
+class EdgeUpdateResponse(BaseModel):
+    version: int
+    changed_connections: int
+    cache_entries_kept: int
+
+
+class TrafficLoadResponse(BaseModel):
+    version: int
+    profiles: int
+    profiled_edges: int
+
+
 class CityInfo(BaseModel):
     name: str
     latitude: Optional[float]
@@ -56,13 +190,72 @@ class SearchHistoryItem(BaseModel):
     start_city: str
     goal_city: str
     algorithm: str
-    path: List[str]
+    path: Optional[List[str]] = None
     total_distance: float
     execution_time: float
     nodes_explored: int
     created_at: str
 
 
+class AlgorithmHistoryStats(BaseModel):
+    algorithm: str
+    searches: int
+    avg_execution_time: float
+    avg_nodes_explored: float
+    avg_distance: float
+    optimality_rate: float
+
+
+class DailyHistoryItem(BaseModel):
+    day: str
+    start_city: str
+    goal_city: str
+    algorithm: str
+    searches: int
+    avg_execution_time: float
+    avg_nodes_explored: float
+    avg_distance: float
+    min_distance: float
+
+
+class HistoryCompactResponse(BaseModel):
+    cutoff: str
+    compacted: int
+    daily_rows: int
+    archive_files: int
+
+
+class CacheStats(BaseModel):
+    entries: int
+    max_entries: int
+    memory_bytes: int
+    max_memory_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+    graph_version: Optional[int] = None
+
+
+class ExecutorStats(BaseModel):
+    mode: str
+    max_workers: int
+    queue_size: int
+    pending: int
+    rejected: int
+    timed_out: int
+
+
+class HistoryWriterStats(BaseModel):
+    queue_size: int
+    batch_size: int
+    backlog: int
+    written: int
+    dropped: int
+    failed: int
+    batches: int
+
+
 class HealthResponse(BaseModel):
     status: str
     version: str
@@ -9,6 +9,79 @@ class Settings(BaseSettings):
     ENVIRONMENT: str = "development"
     LOG_LEVEL: str = "INFO"
 
+    # Serve history reads through an async engine (needs aiosqlite or asyncpg)
+    DATABASE_ASYNC: bool = False
+    # Connection pool of each engine (not used for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    # SQLite connection pragmas: WAL journal, fsync level in WAL mode, lock wait (seconds), page cache
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT: float = 5.0
+    SQLITE_CACHE_SIZE_KB: int = 16384
+
+    # Number of ALT landmarks precomputed for the A* heuristic on graph load
+    ASTAR_LANDMARKS: int = 8
+    # Contract the graph for the "ch" algorithm on load; otherwise on first use
+    CH_PREPROCESS: bool = True
+    # Precompute the all-pairs matrix for the "matrix" algorithm up to this many nodes (0 disables)
+    MATRIX_MAX_NODES: int = 1000
+    # Worker processes for building large matrices (None = one per CPU)
+    MATRIX_WORKERS: Optional[int] = None
+
+    # Binary graph snapshot: memory-mapped at startup when present, else written after the CSV load
+    GRAPH_SNAPSHOT_FILE: Optional[str] = None
+
+    # Time-of-day speed profiles (CSV or Parquet of city1, city2, bucket, speed) loaded at startup
+    TRAFFIC_PROFILES_FILE: Optional[str] = None
+    # Length of one profile bucket, and the speed of edges without a profile
+    TRAFFIC_BUCKET_MINUTES: int = 15
+    TRAFFIC_DEFAULT_SPEED: float = 60.0
+
+    # LRU route result cache (0 entries disables it)
+    ROUTE_CACHE_SIZE: int = 10000
+    ROUTE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Alternative routes (k) per request, and shortest-path trees kept for them per graph version
+    MAX_ALTERNATIVE_ROUTES: int = 10
+    KSP_TREE_CACHE_SIZE: int = 64
+
+    # Search history is written by a background thread: rows buffered before new ones are
+    # dropped, rows per insert, and seconds a row waits for its batch to fill
+    HISTORY_QUEUE_SIZE: int = 10000
+    HISTORY_BATCH_SIZE: int = 500
+    HISTORY_FLUSH_INTERVAL: float = 1.0
+    # Raw history rows older than this many days are rolled into daily aggregates (0 keeps them)
+    HISTORY_RETENTION_DAYS: int = 30
+    # Seconds between background compaction passes, and rows moved per transaction
+    HISTORY_COMPACT_INTERVAL: float = 3600.0
+    HISTORY_COMPACT_BATCH_SIZE: int = 10000
+    # Compacted raw rows are archived here as Parquet partitioned by day (empty string: not archived)
+    HISTORY_ARCHIVE_DIR: str = "./history_archive"
+
+    # Searches run off the event loop on a "thread" or "process" pool
+    SEARCH_EXECUTOR: str = "thread"
+    SEARCH_WORKERS: int = 4
+    # Searches allowed to wait for a worker before requests are rejected with 503
+    SEARCH_QUEUE_SIZE: int = 64
+    # Per-request search timeout in seconds (0 waits forever)
+    SEARCH_TIMEOUT: float = 30.0
+    # Most routes accepted by one /route/batch request
+    ROUTE_BATCH_MAX_SIZE: int = 1000
+    # Most origin x destination cells returned by one /matrix request
+    DISTANCE_MATRIX_MAX_CELLS: int = 1_000_000
+
+    # Local search budget (seconds) and size limit for /tour
+    TOUR_TIME_BUDGET: float = 1.0
+    TOUR_MAX_STOPS: int = 500
+
+    # Vehicle routing: solver budget (seconds), restarts run on a shared pool of VRP_WORKERS processes (1 = inline)
+    VRP_TIME_BUDGET: float = 2.0
+    VRP_RESTARTS: int = 4
+    VRP_WORKERS: int = 2
+    VRP_MAX_DELIVERIES: int = 500
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,22 +1,112 @@
-from sqlalchemy import create_engine
+from typing import Any, AsyncIterator, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
 # Use SQLite for simplicity (can switch to PostgreSQL later)
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
-)
+# Async drivers used when DATABASE_ASYNC is on and the URL names no driver
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def _engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """Connection arguments and pool settings for a database URL"""
+    if make_url(url).get_backend_name() != "sqlite":
+        options = {"pool_pre_ping": True}
+    else:
+        options = {"connect_args": {"check_same_thread": False}}
+        # An in-memory database lives in its one connection, so it keeps SQLAlchemy's default pool
+        if _is_sqlite_memory(url):
+            return options
+        if is_async:
+            # aiosqlite defaults to opening a connection per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection. WAL lets readers run alongside the
+    history writer, and synchronous=NORMAL only fsyncs at checkpoints in WAL mode.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_WAL:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT * 1000)}")
+        cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL) -> Engine:
+    """Create a pooled engine; SQLite connections get the tuned pragmas"""
+    engine = create_engine(url, **_engine_options(url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver form of a database URL, e.g. sqlite:// -> sqlite+aiosqlite://"""
+    parsed = make_url(url)
+    if "+" in parsed.drivername:
+        return url
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend} databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+_async_engine = None
+_async_sessionmaker = None
+
+
+def get_async_sessionmaker():
+    """
+    Session factory of the async engine, created on first use so the async
+    driver (aiosqlite or asyncpg) is only needed when DATABASE_ASYNC is on.
+    """
+    global _async_engine, _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        url = async_database_url(SQLALCHEMY_DATABASE_URL)
+        try:
+            _async_engine = create_async_engine(url, **_engine_options(url, is_async=True))
+        except ImportError as e:
+            raise RuntimeError(f"DATABASE_ASYNC needs the async driver for {url}: {e}")
+        if _async_engine.dialect.name == "sqlite":
+            event.listen(_async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        _async_sessionmaker = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_sessionmaker
+
 
 def get_db():
+    # Sessions check out a connection on first use, so requests that never query stay off the pool
     db = SessionLocal()
     try:
         yield db
@@ -24,6 +114,26 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[Optional[Any]]:
+    """Yield an AsyncSession when DATABASE_ASYNC is on, otherwise None"""
+    if not settings.DATABASE_ASYNC:
+        yield None
+        return
+    async with get_async_sessionmaker()() as session:
+        yield session
+
+
+async def dispose_async_engine():
+    """Close the async engine's pooled connections (called on application shutdown)"""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = _async_sessionmaker = None
+
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables, and indexes added to tables that already existed"""
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
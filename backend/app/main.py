@@ -3,9 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 from .core.config import settings
-from .core.database import init_db
+from .core.database import dispose_async_engine, engine, init_db
 from .api import router
-from .services import graph_service
+from .services import graph_service, history_retention, history_writer, search_executor, vrp_service
 
 
 @asynccontextmanager
@@ -23,17 +23,48 @@ async def lifespan(app: FastAPI):
     connections_file = os.path.join(base_path, "CitiesPk.csv")
     cities_file = os.path.join(base_path, "data", "cities_with_coordinates.csv")
 
+    snapshot_file = settings.GRAPH_SNAPSHOT_FILE
+    source = None
     try:
-        graph_service.load_from_csv(connections_file, cities_file)
+        if snapshot_file and os.path.exists(snapshot_file):
+            graph_service.load_snapshot(snapshot_file)
+            source = "snapshot"
+        else:
+            graph_service.load_from_csv(connections_file, cities_file)
+            source = "CSV"
         stats = graph_service.get_graph_stats()
-        print(f">> Graph loaded: {stats['total_cities']} cities, {stats['total_connections']} connections")
+        print(f">> Graph loaded from {source}: {stats['total_cities']} cities, {stats['total_connections']} connections")
     except Exception as e:
-        print(f">> Warning: Could not load graph from CSV: {e}")
+        print(f">> Warning: Could not load graph: {e}")
+
+    if snapshot_file and source == "CSV":
+        try:
+            graph_service.save_snapshot(snapshot_file)
+            print(f">> Graph snapshot written to {snapshot_file}")
+        except Exception as e:
+            print(f">> Warning: Could not write graph snapshot: {e}")
+
+    if settings.TRAFFIC_PROFILES_FILE:
+        try:
+            traffic = graph_service.load_traffic(settings.TRAFFIC_PROFILES_FILE)
+            print(f">> Traffic profiles loaded: {traffic['profiled_edges']} edges, {traffic['profiles']} profiles")
+        except Exception as e:
+            print(f">> Warning: Could not load traffic profiles: {e}")
+
+    if settings.HISTORY_RETENTION_DAYS > 0:
+        history_retention.start(engine)
+        print(f">> Search history older than {settings.HISTORY_RETENTION_DAYS} days is compacted every {settings.HISTORY_COMPACT_INTERVAL:g}s")
 
     yield
 
     # Shutdown
     print(">> Shutting down...")
+    await history_retention.stop()
+    search_executor.shutdown()
+    vrp_service.shutdown()
+    history_writer.shutdown()
+    print(f">> Search history flushed: {history_writer.get_stats()['written']} rows written")
+    await dispose_async_engine()
 
 
 # Create FastAPI app
@@ -51,6 +82,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include API routes
@@ -1,4 +1,4 @@
 from .city import City, Connection
-from .search_history import SearchHistory
+from .search_history import SearchHistory, SearchHistoryDaily
 
-__all__ = ["City", "Connection", "SearchHistory"]
+__all__ = ["City", "Connection", "SearchHistory", "SearchHistoryDaily"]
@@ -1,10 +1,16 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, Index, UniqueConstraint
 from datetime import datetime
 from ..core.database import Base
 
 
 class SearchHistory(Base):
     __tablename__ = "search_history"
+    __table_args__ = (
+        # Newest-first pages, overall and per algorithm, and lookups by route
+        Index("ix_search_history_created_at_id", "created_at", "id"),
+        Index("ix_search_history_algorithm_created_at_id", "algorithm", "created_at", "id"),
+        Index("ix_search_history_start_goal", "start_city", "goal_city"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     start_city = Column(String, nullable=False)
@@ -15,3 +21,24 @@ class SearchHistory(Base):
     execution_time = Column(Float, nullable=False)
     nodes_explored = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class SearchHistoryDaily(Base):
+    """Searches older than the retention window, rolled up per day, route and algorithm"""
+    __tablename__ = "search_history_daily"
+    __table_args__ = (
+        UniqueConstraint("day", "start_city", "goal_city", "algorithm", name="uq_search_history_daily_key"),
+        Index("ix_search_history_daily_algorithm_day", "algorithm", "day"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False)
+    start_city = Column(String, nullable=False)
+    goal_city = Column(String, nullable=False)
+    algorithm = Column(String, nullable=False)
+    # Sums rather than averages, so later compactions of the same day add up
+    searches = Column(Integer, nullable=False)
+    total_execution_time = Column(Float, nullable=False)
+    total_nodes_explored = Column(Integer, nullable=False)
+    total_distance = Column(Float, nullable=False)
+    min_distance = Column(Float, nullable=False)
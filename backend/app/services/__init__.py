@@ -1,4 +1,16 @@
 from .graph_service import graph_service, GraphService
+from .history_retention import history_retention, HistoryRetention
+from .history_service import history_service, HistoryService
+from .history_writer import history_writer, HistoryWriter
 from .route_service import route_service, RouteService
+from .route_cache import route_cache, RouteCache
+from .search_context import SearchContext
+from .search_executor import search_executor, SearchExecutor, SearchRejectedError, SearchTimeoutError
+from .tour_service import tour_service, TourService
+from .vrp_service import vrp_service, VRPService
 
-__all__ = ["graph_service", "GraphService", "route_service", "RouteService"]
+__all__ = [
+    "graph_service", "GraphService", "history_retention", "HistoryRetention", "history_service", "HistoryService", "history_writer", "HistoryWriter", "route_service", "RouteService", "route_cache", "RouteCache",
+    "SearchContext", "search_executor", "SearchExecutor", "SearchRejectedError", "SearchTimeoutError",
+    "tour_service", "TourService", "vrp_service", "VRPService"
+]
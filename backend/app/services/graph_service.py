@@ -1,15 +1,42 @@
 import pandas as pd
 import networkx as nx
-from typing import Dict, List, Any
+import numpy as np
+from typing import IO, Dict, List, Any, Optional, Tuple, Union
+import os
+import threading
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from ..algorithms.ch import ContractionHierarchy
+from ..algorithms.csr import CSRGraph
+from ..algorithms.heuristics import Heuristic, LandmarkHeuristic, build_heuristic, find_landmarks
+from ..algorithms.matrix import DistanceMatrix
+from ..algorithms.snapshot import read_snapshot, write_snapshot
+from ..algorithms.traffic import TrafficProfiles
+from ..core.config import settings
 from ..models import City, Connection
+from .route_cache import route_cache
+from .search_context import SearchContext
+
+EDGE_ACTIONS = ("add", "remove", "update")
+# Algorithms that always return a shortest path; only their cached routes survive edge updates
+EXACT_ALGORITHMS = ("ucs", "astar", "dijkstra", "bidirectional_dijkstra", "ch", "matrix")
+TRAFFIC_COLUMNS = ("city1", "city2", "bucket", "speed")
+# Rows fetched per round trip when streaming the graph from the database
+DB_BATCH_SIZE = 50000
 
 
 class GraphService:
     """Service for managing the graph and performing route searches"""
 
     def __init__(self):
+        # networkx view of the graph; built on first use after loading a snapshot file
         self.graph: nx.Graph = None
+        # Search snapshot and derived structures, replaced as a whole on load
+        self.context: SearchContext = None
+        # Bumped on every load so caches keyed by it never serve stale routes
+        self.version = 0
+        # Serializes incremental updates so each builds on the latest version
+        self._update_lock = threading.Lock()
 
     def load_from_csv(self, connections_file: str, cities_file: str = None) -> nx.Graph:
         """Load graph from CSV files"""
@@ -25,84 +52,352 @@ class GraphService:
         # Load city coordinates if provided
         if cities_file:
             df_cities = pd.read_csv(cities_file)
-            city_data = {}
-            for _, row in df_cities.iterrows():
-                city_data[row['city']] = {
-                    'latitude': row['latitude'],
-                    'longitude': row['longitude'],
-                    'population': row.get('population', 0)
-                }
+            if 'population' not in df_cities.columns:
+                df_cities['population'] = 0
+            df_cities = df_cities[df_cities['city'].isin(self.graph)].drop_duplicates('city', keep='last')
+            city_data = df_cities.set_index('city')[['latitude', 'longitude', 'population']].to_dict('index')
 
             # Add city data as node attributes
-            for city, data in city_data.items():
-                if city in self.graph:
-                    self.graph.nodes[city].update(data)
+            nx.set_node_attributes(self.graph, city_data)
 
+        self._build_search_structures()
         return self.graph
 
-    def load_from_database(self, db: Session) -> nx.Graph:
-        """Load graph from database"""
-        self.graph = nx.Graph()
+    def load_from_database(self, db: Session, batch_size: int = DB_BATCH_SIZE) -> CSRGraph:
+        """
+        Load graph from database.
+
+        Connections and cities are streamed as plain columns in batches and
+        collected into arrays, so no ORM objects or relationship loads are
+        involved and memory stays proportional to the arrays. The CSR snapshot
+        is built from them directly; like the CSV loader, a connection stored
+        in both directions becomes one edge with the distance of its last row.
+        """
+        edges = db.execute(
+            select(Connection.from_city_id, Connection.to_city_id, Connection.distance)
+            .order_by(Connection.id)
+            .execution_options(yield_per=batch_size)
+        )
+        batches = [np.array(list(zip(*rows)), dtype=np.float64) for rows in edges.partitions()]
+        table = np.concatenate(batches, axis=1) if batches else np.empty((3, 0))
+        ends, distances = table[:2].T.astype(np.int64), table[2]
+
+        # Nodes in order of first appearance, as networkx would add them
+        city_ids, first, inverse = np.unique(ends.reshape(-1), return_index=True, return_inverse=True)
+        rank = np.empty(len(city_ids), dtype=np.int64)
+        rank[np.argsort(first, kind="stable")] = np.arange(len(city_ids))
+        nodes = rank[inverse].reshape(-1, 2)
 
-        # Load all connections
-        connections = db.query(Connection).all()
+        # One edge per city pair, placed at its first row and weighted by its last
+        pairs = np.sort(nodes, axis=1)
+        keys = pairs[:, 0] * len(city_ids) + pairs[:, 1]
+        _, first_row, pair_of = np.unique(keys, return_index=True, return_inverse=True)
+        last_row = np.zeros(len(first_row), dtype=np.int64)
+        np.maximum.at(last_row, pair_of.reshape(-1), np.arange(len(keys)))
+        edge_order = np.argsort(first_row, kind="stable")
+        sources, targets = nodes[first_row[edge_order]].T
+        weights = distances[last_row[edge_order]]
 
-        for conn in connections:
-            self.graph.add_edge(
-                conn.from_city.name,
-                conn.to_city.name,
-                distance=conn.distance
+        n = len(city_ids)
+        names: List[str] = [None] * n
+        attributes = np.full((3, n), np.nan)
+        # Without connections there are no nodes, and cities alone do not make any
+        if n:
+            cities = db.execute(
+                select(City.id, City.name, City.latitude, City.longitude, City.population)
+                .execution_options(yield_per=batch_size)
             )
+            for rows in cities.partitions():
+                ids = np.array([row[0] for row in rows], dtype=np.int64)
+                position = np.minimum(np.searchsorted(city_ids, ids), n - 1)
+                for row, node, known in zip(rows, rank[position].tolist(), (city_ids[position] == ids).tolist()):
+                    if known:
+                        names[node] = row[1]
+                        attributes[:, node] = [np.nan if value is None else value for value in row[2:]]
 
-        # Add city attributes
-        cities = db.query(City).all()
-        for city in cities:
-            if city.name in self.graph:
-                self.graph.nodes[city.name].update({
-                    'latitude': city.latitude,
-                    'longitude': city.longitude,
-                    'population': city.population
-                })
+        snapshot = CSRGraph.from_edges(names, sources, targets, weights, *attributes)
+        self.graph = None
+        self._build_search_structures(snapshot)
+        return snapshot
 
-        return self.graph
+    def load_snapshot(self, path: str) -> CSRGraph:
+        """
+        Load the graph from a binary snapshot written by save_snapshot.
+        The file is memory-mapped rather than parsed, and the stored landmark
+        rows are reused when they match ASTAR_LANDMARKS.
+        """
+        snapshot, landmarks = read_snapshot(path)
+        if landmarks is not None and len(landmarks.landmarks) != min(settings.ASTAR_LANDMARKS, snapshot.num_nodes):
+            landmarks = None
+
+        self.graph = None
+        self._build_search_structures(snapshot, landmarks)
+        return snapshot
+
+    def save_snapshot(self, path: str):
+        """Write the current graph and its landmark rows as a binary snapshot for fast startup"""
+        if self.context is None:
+            raise ValueError("Graph not initialized")
+        context = self.context
+        write_snapshot(path, context.graph, find_landmarks(context.heuristic))
+
+    def _build_search_structures(
+        self,
+        snapshot: Optional[CSRGraph] = None,
+        landmarks: Optional[LandmarkHeuristic] = None
+    ):
+        """Build the immutable CSR search snapshot (unless given) and its derived data after a load"""
+        if snapshot is None:
+            snapshot = CSRGraph.from_networkx(self.graph)
+        matrix = None
+        if snapshot.num_nodes <= settings.MATRIX_MAX_NODES:
+            matrix = DistanceMatrix.build(snapshot, workers=settings.MATRIX_WORKERS)
+
+        self.context = SearchContext(
+            version=self.version + 1,
+            graph=snapshot,
+            heuristic=build_heuristic(snapshot, num_landmarks=settings.ASTAR_LANDMARKS, landmarks=landmarks),
+            hierarchy=ContractionHierarchy.build(snapshot) if settings.CH_PREPROCESS else None,
+            matrix=matrix,
+            tree_cache_size=settings.KSP_TREE_CACHE_SIZE,
+            # Until profiles are loaded every road runs at the default speed all day
+            traffic=TrafficProfiles.constant(snapshot, settings.TRAFFIC_DEFAULT_SPEED, self._traffic_buckets()),
+            num_landmarks=settings.ASTAR_LANDMARKS,
+        )
+        self.version = self.context.version
+
+    @staticmethod
+    def _traffic_buckets() -> int:
+        return (24 * 60) // settings.TRAFFIC_BUCKET_MINUTES
+
+    def load_traffic(
+        self,
+        profiles_file: Union[str, IO],
+        file_format: Optional[str] = None,
+        bidirectional: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Load time-of-day speed profiles for time-dependent routing.
+
+        Args:
+            profiles_file: Path or file object of a table with columns city1, city2, bucket, speed
+            file_format: "csv" or "parquet" (default: from the file extension, else csv)
+            bidirectional: Apply each row to both directions of the connection
+
+        Returns:
+            Dictionary with the new graph version, distinct profiles and profiled edges
+        """
+        if file_format is None:
+            name = profiles_file if isinstance(profiles_file, str) else getattr(profiles_file, 'name', '')
+            file_format = 'parquet' if os.path.splitext(str(name))[1].lower() == '.parquet' else 'csv'
+
+        if file_format == 'parquet':
+            try:
+                frame = pd.read_parquet(profiles_file)
+            except ImportError:
+                raise ValueError("Reading Parquet profiles requires pyarrow or fastparquet")
+        elif file_format == 'csv':
+            frame = pd.read_csv(profiles_file)
+        else:
+            raise ValueError(f"Unknown traffic file format '{file_format}'. Use csv or parquet")
+
+        missing = [column for column in TRAFFIC_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"Traffic profiles are missing columns: {missing}")
+
+        with self._update_lock:
+            if self.context is None:
+                raise ValueError("Graph not initialized")
+
+            snapshot = self.context.graph
+            traffic = TrafficProfiles.from_frame(
+                snapshot,
+                frame,
+                buckets=self._traffic_buckets(),
+                default_speed=settings.TRAFFIC_DEFAULT_SPEED,
+                bidirectional=bidirectional
+            )
+            heuristic = build_heuristic(traffic.lower_bound_graph(snapshot), num_landmarks=settings.ASTAR_LANDMARKS)
+            context = self.context.with_traffic(traffic, heuristic)
+
+            # Static routes do not depend on traffic, so every cached route stays valid
+            route_cache.migrate(self.version, context.version, lambda algorithm, result: True)
+            self.context = context
+            self.version = context.version
+            return {
+                'version': self.version,
+                'profiles': len(traffic.speeds) - 1,
+                'profiled_edges': traffic.num_profiled_edges
+            }
+
+    def update_edges(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Add, remove or reweight connections of the live graph.
+
+        Updates are validated and applied in order against the CSR snapshot,
+        and the derived search structures are repaired for the net change of
+        each connection, so the cost follows the touched connections rather
+        than the graph size. The new snapshot and context replace the current
+        ones in one step, so searches already running finish on the previous
+        version. The networkx view is rebuilt from the snapshot on next use.
+
+        Args:
+            updates: Dicts with action (add, remove or update), city1, city2 and distance (not needed for remove)
+
+        Returns:
+            Dictionary with the new graph version, changed connections and route cache entries kept
+        """
+        with self._update_lock:
+            if self.context is None:
+                raise ValueError("Graph not initialized")
+
+            snapshot = self.context.graph
+            # Net weight of every touched connection (inf: absent), keyed as first named
+            weights: Dict[Tuple[int, int], float] = {}
+            for update in updates:
+                self._apply_update(snapshot, weights, update)
+
+            changes = []
+            for (u, v), new in weights.items():
+                old = self._edge_weight(snapshot, {}, u, v)
+                if new != old:
+                    changes.append((u, v, old, new))
+
+            if not changes:
+                return {'version': self.version, 'changed_connections': 0, 'cache_entries_kept': 0}
+
+            context = self.context.with_edge_changes(changes)
+            # Recontract off the request path if the hierarchy was in use; ch queries stay exact meanwhile
+            if settings.CH_PREPROCESS or self.context.hierarchy is not None or self.context.hierarchy_pending:
+                context.build_hierarchy_in_background()
+
+            # Cached shortest routes stay optimal if no connection got shorter and they avoid every
+            # changed one. Other algorithms (bfs, dfs, ...) may take a different path after any change.
+            kept = 0
+            if all(new > old for _, _, old, new in changes):
+                names = snapshot.names
+                changed = {(names[u], names[v]) for u, v in weights} | {(names[v], names[u]) for u, v in weights}
+                kept = route_cache.migrate(
+                    self.version,
+                    context.version,
+                    lambda algorithm, result: algorithm in EXACT_ALGORITHMS
+                    and not any(edge in changed for edge in zip(result['path'], result['path'][1:]))
+                )
+
+            self.graph = None
+            self.context = context
+            self.version = context.version
+            return {'version': self.version, 'changed_connections': len(changes), 'cache_entries_kept': kept}
+
+    @staticmethod
+    def _edge_weight(snapshot: CSRGraph, weights: Dict[Tuple[int, int], float], u: int, v: int) -> float:
+        """Weight of connection u-v with the pending updates applied (inf if absent)"""
+        for key in ((u, v), (v, u)):
+            if key in weights:
+                return weights[key]
+        try:
+            return snapshot.edge_weight(u, v)
+        except KeyError:
+            return float('inf')
+
+    @classmethod
+    def _apply_update(cls, snapshot: CSRGraph, weights: Dict[Tuple[int, int], float], update: Dict[str, Any]):
+        """Validate one connection update against the snapshot and pending updates, and record it"""
+        action, city1, city2 = update['action'], update['city1'], update['city2']
+        distance = update.get('distance')
+
+        if action not in EDGE_ACTIONS:
+            raise ValueError(f"Unknown action '{action}'. Use one of: {', '.join(EDGE_ACTIONS)}")
+        missing = [city for city in (city1, city2) if city not in snapshot]
+        if missing:
+            raise ValueError(f"Cities not found in graph: {missing}")
+        if city1 == city2:
+            raise ValueError("A connection needs two different cities")
+
+        u, v = snapshot.node_id(city1), snapshot.node_id(city2)
+        exists = cls._edge_weight(snapshot, weights, u, v) < float('inf')
+        if action == "add" and exists:
+            raise ValueError(f"Connection {city1} - {city2} already exists")
+        if action != "add" and not exists:
+            raise ValueError(f"Connection {city1} - {city2} does not exist")
+
+        key = (v, u) if (v, u) in weights else (u, v)
+        if action == "remove":
+            weights[key] = float('inf')
+            return
+        if distance is None or not distance > 0:
+            raise ValueError(f"Connection {city1} - {city2} needs a positive distance")
+        weights[key] = float(distance)
 
     def get_graph(self) -> nx.Graph:
-        """Get the current graph"""
+        """Get the current graph as networkx, building it from the snapshot if needed"""
+        if self.graph is None and self.context is not None:
+            self.graph = self.context.graph.to_networkx()
         return self.graph
 
+    def get_version(self) -> int:
+        """Get the version number of the current graph"""
+        return self.version
+
+    def get_context(self) -> SearchContext:
+        """Get the search context (snapshot plus precomputed data) of the current graph"""
+        return self.context
+
+    def get_snapshot(self) -> CSRGraph:
+        """Get the CSR snapshot that search algorithms run on"""
+        return self.context.graph if self.context else None
+
+    def get_heuristic(self) -> Heuristic:
+        """Get the precomputed A* heuristic for the current graph"""
+        return self.context.heuristic if self.context else None
+
+    def get_hierarchy(self) -> ContractionHierarchy:
+        """Get the contraction hierarchy of the current graph, building it on first use"""
+        return self.context.get_hierarchy() if self.context else None
+
+    def get_matrix(self) -> DistanceMatrix:
+        """Get the all-pairs matrix, or None if the graph exceeds MATRIX_MAX_NODES"""
+        return self.context.matrix if self.context else None
+
     def get_cities(self) -> List[str]:
         """Get list of all cities"""
-        if self.graph is None:
+        snapshot = self.get_snapshot()
+        if snapshot is None:
             return []
-        return sorted(list(self.graph.nodes()))
+        return sorted(snapshot.names)
 
     def get_city_info(self, city: str) -> Dict[str, Any]:
         """Get information about a specific city"""
-        if self.graph is None or city not in self.graph:
+        snapshot = self.get_snapshot()
+        if snapshot is None or city not in snapshot:
             return None
 
-        node_data = self.graph.nodes[city]
-        neighbors = list(self.graph[city].keys())
+        node = snapshot.node_id(city)
+        neighbors = snapshot.to_names(snapshot.indices[snapshot.indptr[node]:snapshot.indptr[node + 1]].tolist())
+        latitude, longitude, population = (
+            float(values[node]) for values in (snapshot.latitudes, snapshot.longitudes, snapshot.populations)
+        )
 
         return {
             'name': city,
-            'latitude': node_data.get('latitude'),
-            'longitude': node_data.get('longitude'),
-            'population': node_data.get('population'),
+            'latitude': None if np.isnan(latitude) else latitude,
+            'longitude': None if np.isnan(longitude) else longitude,
+            'population': None if np.isnan(population) else int(population),
             'connections': neighbors,
             'connection_count': len(neighbors)
         }
 
     def get_graph_stats(self) -> Dict[str, Any]:
         """Get statistics about the graph"""
-        if self.graph is None:
+        snapshot = self.get_snapshot()
+        if snapshot is None:
             return {}
 
         return {
-            'total_cities': self.graph.number_of_nodes(),
-            'total_connections': self.graph.number_of_edges(),
-            'average_connections': sum(dict(self.graph.degree()).values()) / self.graph.number_of_nodes(),
-            'is_connected': nx.is_connected(self.graph)
+            'total_cities': snapshot.num_nodes,
+            'total_connections': snapshot.num_edges,
+            'average_connections': 2 * snapshot.num_edges / snapshot.num_nodes if snapshot.num_nodes else 0,
+            'is_connected': snapshot.is_connected()
         }
 
 
@@ -0,0 +1,194 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime, time, timedelta
+import asyncio
+import os
+import tempfile
+import threading
+import pandas as pd
+from sqlalchemy import case, delete, select, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models import SearchHistory, SearchHistoryDaily
+
+_DAILY_KEY = ['day', 'start_city', 'goal_city', 'algorithm']
+
+
+class HistoryRetention:
+    """
+    Keeps search_history to a fixed window.
+
+    A compaction pass moves raw rows older than `retention_days` (counted in
+    whole days, so a day is always compacted at once) out of search_history
+    in batches. Each batch is archived as Parquet under
+    `archive_dir/day=YYYY-MM-DD/`, added to the per-day, per-route,
+    per-algorithm sums in search_history_daily, and deleted, all before
+    the batch's transaction commits. Passes run in a background task every
+    `interval` seconds.
+    """
+
+    def __init__(
+        self,
+        retention_days: int = 30,
+        batch_size: int = 10000,
+        archive_dir: Optional[str] = None,
+        interval: float = 3600.0
+    ):
+        if batch_size < 1:
+            raise ValueError("History compaction batch size must be positive")
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.archive_dir = archive_dir or None
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Start of the oldest day that keeps its raw rows"""
+        now = now or datetime.utcnow()
+        return datetime.combine(now.date() - timedelta(days=self.retention_days), time())
+
+    def compact(self, bind: Engine, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Run one compaction pass over the database behind `bind`.
+
+        Args:
+            bind: Engine of the history database
+            now: Current time (default: utcnow)
+
+        Returns:
+            Dictionary with the cutoff, raw rows compacted, daily rows written and archive files written
+        """
+        cutoff = self.cutoff(now)
+        result = {'cutoff': cutoff.isoformat(), 'compacted': 0, 'daily_rows': 0, 'archive_files': 0}
+        if self.retention_days <= 0:
+            return result
+
+        with self._lock:
+            while not self._stopping.is_set():
+                with Session(bind=bind) as session:
+                    rows = session.execute(
+                        select(*SearchHistory.__table__.columns)
+                        .where(SearchHistory.created_at < cutoff)
+                        .order_by(SearchHistory.created_at, SearchHistory.id)
+                        .limit(self.batch_size)
+                    ).all()
+                    if not rows:
+                        break
+
+                    frame = pd.DataFrame(rows, columns=list(rows[0]._fields))
+                    frame['day'] = pd.to_datetime(frame['created_at']).dt.date
+                    if self.archive_dir:
+                        result['archive_files'] += self._archive(frame)
+                    result['daily_rows'] += self._add_daily(session, frame)
+
+                    # The batch is every row up to its last (created_at, id) in that order
+                    last = rows[-1]
+                    session.execute(
+                        delete(SearchHistory)
+                        .where(SearchHistory.created_at < cutoff)
+                        .where(tuple_(SearchHistory.created_at, SearchHistory.id) <= (last.created_at, last.id))
+                    )
+                    session.commit()
+                    result['compacted'] += len(rows)
+
+                if len(rows) < self.batch_size:
+                    break
+        return result
+
+    def _archive(self, frame: pd.DataFrame) -> int:
+        """Write one Parquet file per day in the batch; returns files written"""
+        written = 0
+        for day, rows in frame.groupby('day', sort=True):
+            directory = os.path.join(self.archive_dir, f"day={day.isoformat()}")
+            os.makedirs(directory, exist_ok=True)
+            # Named by id range, so a batch retried after a failed commit replaces its own file
+            path = os.path.join(directory, f"part-{rows['id'].min()}-{rows['id'].max()}.parquet")
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                rows.drop(columns='day').to_parquet(tmp_path, index=False, compression='zstd')
+                os.replace(tmp_path, path)
+            except ImportError:
+                raise RuntimeError("Archiving search history requires pyarrow or fastparquet; set HISTORY_ARCHIVE_DIR='' to compact without an archive")
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            written += 1
+        return written
+
+    @staticmethod
+    def _add_daily(session: Session, frame: pd.DataFrame) -> int:
+        """Add a batch's sums to search_history_daily; returns rows inserted or updated"""
+        daily = frame.groupby(_DAILY_KEY, sort=False).agg(
+            searches=('id', 'size'),
+            total_execution_time=('execution_time', 'sum'),
+            total_nodes_explored=('nodes_explored', 'sum'),
+            total_distance=('total_distance', 'sum'),
+            min_distance=('total_distance', 'min'),
+        ).reset_index()
+        rows: List[Dict[str, Any]] = daily.to_dict('records')
+
+        dialect = session.get_bind().dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise ValueError(f"History compaction is not supported on {dialect} databases")
+
+        statement = insert(SearchHistoryDaily)
+        new = statement.excluded
+        statement = statement.on_conflict_do_update(
+            index_elements=_DAILY_KEY,
+            set_={
+                'searches': SearchHistoryDaily.searches + new.searches,
+                'total_execution_time': SearchHistoryDaily.total_execution_time + new.total_execution_time,
+                'total_nodes_explored': SearchHistoryDaily.total_nodes_explored + new.total_nodes_explored,
+                'total_distance': SearchHistoryDaily.total_distance + new.total_distance,
+                'min_distance': case(
+                    (new.min_distance < SearchHistoryDaily.min_distance, new.min_distance),
+                    else_=SearchHistoryDaily.min_distance
+                ),
+            }
+        )
+        session.execute(statement, rows)
+        return len(rows)
+
+    def start(self, bind: Engine):
+        """Start compacting in the background on the running event loop"""
+        if self._task is None and self.retention_days > 0:
+            self._stopping.clear()
+            self._task = asyncio.get_running_loop().create_task(self._run(bind))
+
+    async def stop(self):
+        """Stop the background task after the batch in progress (called on application shutdown)"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        self._stopping.set()
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self, bind: Engine):
+        while True:
+            try:
+                result = await asyncio.to_thread(self.compact, bind)
+                if result['compacted']:
+                    print(f">> Search history compacted: {result['compacted']} rows before {result['cutoff']}")
+            except Exception as e:
+                print(f">> Warning: Could not compact search history: {e}")
+            await asyncio.sleep(self.interval)
+
+
+# Singleton instance
+history_retention = HistoryRetention(
+    retention_days=settings.HISTORY_RETENTION_DAYS,
+    batch_size=settings.HISTORY_COMPACT_BATCH_SIZE,
+    archive_dir=settings.HISTORY_ARCHIVE_DIR,
+    interval=settings.HISTORY_COMPACT_INTERVAL
+)
@@ -0,0 +1,255 @@
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import date, datetime
+import base64
+from sqlalchemy import and_, case, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..models import SearchHistory, SearchHistoryDaily
+
+# Relative slack when deciding whether a search found the best known distance
+OPTIMAL_TOLERANCE = 1e-9
+
+_SUMMARY_COLUMNS = (
+    SearchHistory.id,
+    SearchHistory.start_city,
+    SearchHistory.goal_city,
+    SearchHistory.algorithm,
+    SearchHistory.total_distance,
+    SearchHistory.execution_time,
+    SearchHistory.nodes_explored,
+    SearchHistory.created_at,
+)
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past a history row"""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{row_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid history cursor")
+
+
+class HistoryService:
+    """
+    Read side of the search history.
+
+    Pages are newest first and use keyset pagination: the cursor holds the
+    (created_at, id) of the last row returned and the next page starts below
+    it, so every page is an index range scan however deep the client pages.
+    Statistics are aggregated in SQL, and searches compacted out of the
+    retention window stay readable as daily aggregates. The sync and async
+    variants share their statements and differ only in how they run them.
+    """
+
+    @staticmethod
+    def _page_query(limit: int, algorithm: Optional[str], cursor: Optional[str], include_path: bool):
+        columns = _SUMMARY_COLUMNS + ((SearchHistory.path,) if include_path else ())
+        query = select(*columns)
+        if algorithm:
+            query = query.where(SearchHistory.algorithm == algorithm)
+        if cursor:
+            query = query.where(tuple_(SearchHistory.created_at, SearchHistory.id) < decode_cursor(cursor))
+        # One extra row tells whether another page follows
+        return query.order_by(SearchHistory.created_at.desc(), SearchHistory.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    def _page_result(rows: List[Any], limit: int) -> Dict[str, Any]:
+        items = [
+            {**row._mapping, 'created_at': row.created_at.isoformat()}
+            for row in rows[:limit]
+        ]
+        last = rows[limit - 1] if len(rows) > limit else None
+        return {
+            'items': items,
+            'next_cursor': encode_cursor(last.created_at, last.id) if last is not None else None
+        }
+
+    def get_page(
+        self,
+        db: Session,
+        limit: int = 100,
+        algorithm: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_path: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get one page of search history, newest first.
+
+        Args:
+            db: Database session
+            limit: Rows per page
+            algorithm: Only searches made with this algorithm
+            cursor: next_cursor of the previous page (default: first page)
+            include_path: Include each search's path (the bulk of every row)
+
+        Returns:
+            Dictionary with the page's items and the cursor of the next page (None on the last page)
+        """
+        rows = db.execute(self._page_query(limit, algorithm, cursor, include_path)).all()
+        return self._page_result(rows, limit)
+
+    async def get_page_async(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        algorithm: Optional[str] = None,
+        cursor: Optional[str] = None,
+        include_path: bool = True
+    ) -> Dict[str, Any]:
+        """Get one page of search history like get_page, through an async session"""
+        rows = (await db.execute(self._page_query(limit, algorithm, cursor, include_path))).all()
+        return self._page_result(rows, limit)
+
+    @staticmethod
+    def _stats_query(since: Optional[datetime]):
+        history = select(SearchHistory)
+        if since is not None:
+            history = history.where(SearchHistory.created_at >= since)
+        history = history.subquery()
+
+        # Shortest distance any algorithm found for each route
+        best = (
+            select(history.c.start_city, history.c.goal_city, func.min(history.c.total_distance).label('best'))
+            .group_by(history.c.start_city, history.c.goal_city)
+            .subquery()
+        )
+        optimal = case(
+            (history.c.total_distance <= best.c.best * (1 + OPTIMAL_TOLERANCE), 1.0),
+            else_=0.0
+        )
+        return (
+            select(
+                history.c.algorithm,
+                func.count().label('searches'),
+                func.avg(history.c.execution_time).label('avg_execution_time'),
+                func.avg(history.c.nodes_explored).label('avg_nodes_explored'),
+                func.avg(history.c.total_distance).label('avg_distance'),
+                func.avg(optimal).label('optimality_rate'),
+            )
+            .join(best, and_(
+                history.c.start_city == best.c.start_city,
+                history.c.goal_city == best.c.goal_city
+            ))
+            .group_by(history.c.algorithm)
+            .order_by(history.c.algorithm)
+        )
+
+    @staticmethod
+    def _stats_result(rows: List[Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                'algorithm': row.algorithm,
+                'searches': row.searches,
+                'avg_execution_time': float(row.avg_execution_time),
+                'avg_nodes_explored': float(row.avg_nodes_explored),
+                'avg_distance': float(row.avg_distance),
+                'optimality_rate': float(row.optimality_rate),
+            }
+            for row in rows
+        ]
+
+    def get_stats(self, db: Session, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Per-algorithm search statistics, computed in the database.
+
+        The optimality rate is the share of an algorithm's searches whose
+        distance matches the shortest distance any algorithm found for the
+        same route in the same window.
+
+        Args:
+            db: Database session
+            since: Only searches made at or after this time
+
+        Returns:
+            One dict per algorithm with search count, average execution time, nodes explored and distance, and optimality rate
+        """
+        return self._stats_result(db.execute(self._stats_query(since)).all())
+
+    async def get_stats_async(self, db: AsyncSession, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Per-algorithm statistics like get_stats, through an async session"""
+        return self._stats_result((await db.execute(self._stats_query(since))).all())
+
+    @staticmethod
+    def _daily_query(
+        limit: int,
+        start: Optional[str],
+        goal: Optional[str],
+        algorithm: Optional[str],
+        since: Optional[date],
+        until: Optional[date]
+    ):
+        daily = SearchHistoryDaily
+        query = select(
+            daily.day,
+            daily.start_city,
+            daily.goal_city,
+            daily.algorithm,
+            daily.searches,
+            (daily.total_execution_time / daily.searches).label('avg_execution_time'),
+            (daily.total_nodes_explored * 1.0 / daily.searches).label('avg_nodes_explored'),
+            (daily.total_distance / daily.searches).label('avg_distance'),
+            daily.min_distance,
+        )
+        for column, value in ((daily.start_city, start), (daily.goal_city, goal), (daily.algorithm, algorithm)):
+            if value:
+                query = query.where(column == value)
+        if since is not None:
+            query = query.where(daily.day >= since)
+        if until is not None:
+            query = query.where(daily.day <= until)
+        return query.order_by(daily.day.desc(), daily.start_city, daily.goal_city, daily.algorithm).limit(limit)
+
+    @staticmethod
+    def _daily_result(rows: List[Any]) -> List[Dict[str, Any]]:
+        return [{**row._mapping, 'day': row.day.isoformat()} for row in rows]
+
+    def get_daily(
+        self,
+        db: Session,
+        limit: int = 1000,
+        start: Optional[str] = None,
+        goal: Optional[str] = None,
+        algorithm: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the daily aggregates of compacted search history, newest day first.
+
+        Args:
+            db: Database session
+            limit: Most rows returned
+            start: Only routes from this city
+            goal: Only routes to this city
+            algorithm: Only searches made with this algorithm
+            since: First day included
+            until: Last day included
+
+        Returns:
+            One dict per day, route and algorithm with search count, averages and shortest distance
+        """
+        query = self._daily_query(limit, start, goal, algorithm, since, until)
+        return self._daily_result(db.execute(query).all())
+
+    async def get_daily_async(
+        self,
+        db: AsyncSession,
+        limit: int = 1000,
+        start: Optional[str] = None,
+        goal: Optional[str] = None,
+        algorithm: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
+        """Get daily aggregates like get_daily, through an async session"""
+        query = self._daily_query(limit, start, goal, algorithm, since, until)
+        return self._daily_result((await db.execute(query)).all())
+
+
+# Singleton instance
+history_service = HistoryService()
@@ -0,0 +1,150 @@
+from typing import Any, Dict, List, Optional
+import queue
+import threading
+import time
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..models import SearchHistory
+
+# Queue markers: write what is buffered now / write it and stop
+_FLUSH = object()
+_STOP = object()
+
+
+class HistoryWriter:
+    """
+    Persists search history off the request path.
+
+    Requests only enqueue rows; a background thread collects them into
+    batches of up to `batch_size` rows, or whatever arrived within
+    `flush_interval` seconds of the first one, and writes each batch with
+    one executemany insert and one commit. The queue is bounded: when the
+    database cannot keep up, new rows are dropped and counted instead of
+    slowing requests down.
+    """
+
+    def __init__(self, queue_size: int = 10000, batch_size: int = 500, flush_interval: float = 1.0):
+        if queue_size < 1 or batch_size < 1:
+            raise ValueError("History queue and batch sizes must be positive")
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, bind: Engine, rows: List[Dict[str, Any]]) -> int:
+        """
+        Queue SearchHistory rows for the database behind `bind` without blocking.
+        Returns: number of rows accepted; the rest were dropped because the queue is full
+        """
+        if not rows:
+            return 0
+        self._start()
+
+        accepted = 0
+        for row in rows:
+            try:
+                self._queue.put_nowait((bind, row))
+            except queue.Full:
+                break
+            accepted += 1
+
+        if accepted < len(rows):
+            with self._lock:
+                self.dropped += len(rows) - accepted
+        return accepted
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until every row queued so far has been written (or failed)"""
+        if self._thread is None:
+            return
+        self._queue.put(_FLUSH, timeout=timeout)
+        self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = 10.0):
+        """Write the remaining rows and stop the writer thread (called on application shutdown)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(_STOP, timeout=timeout)
+        thread.join(timeout)
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif item is not _FLUSH:
+                    batch.append(item)
+                if stop or item is _FLUSH or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write(batch)
+            # One task_done per item taken, markers included, so flush() can join
+            for _ in range(len(batch) + (1 if stop or item is _FLUSH else 0)):
+                self._queue.task_done()
+
+    def _write(self, batch: List[Any]):
+        by_bind: Dict[Engine, List[Dict[str, Any]]] = {}
+        for bind, row in batch:
+            by_bind.setdefault(bind, []).append(row)
+
+        for bind, rows in by_bind.items():
+            try:
+                with Session(bind=bind) as session:
+                    session.execute(insert(SearchHistory), rows)
+                    session.commit()
+            except Exception as e:
+                print(f">> Warning: Could not write {len(rows)} search history rows: {e}")
+                with self._lock:
+                    self.failed += len(rows)
+            else:
+                with self._lock:
+                    self.written += len(rows)
+                    self.batches += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue configuration, backlog and write counters"""
+        with self._lock:
+            return {
+                "queue_size": self.queue_size,
+                "batch_size": self.batch_size,
+                "backlog": self._queue.qsize(),
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+
+# Singleton instance
+history_writer = HistoryWriter(
+    queue_size=settings.HISTORY_QUEUE_SIZE,
+    batch_size=settings.HISTORY_BATCH_SIZE,
+    flush_interval=settings.HISTORY_FLUSH_INTERVAL
+)
@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import sys
+import threading
+from ..core.config import settings
+
+
+class RouteCache:
+    """
+    Bounded LRU cache of route results keyed by (graph version, start, goal, algorithm).
+
+    Entries from an older graph version can never be hit; the first access
+    with a newer version drops them all, so reloading the graph invalidates
+    the cache without any explicit hook. Lookups and stores from searches that
+    still run on an older version are ignored.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.version: Optional[int] = None
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _estimate_size(result: Dict[str, Any]) -> int:
+        """Rough memory footprint of a result dict, including its path"""
+        size = sys.getsizeof(result)
+        for key, value in result.items():
+            size += sys.getsizeof(key) + sys.getsizeof(value)
+        path = result.get("path") or []
+        size += sum(sys.getsizeof(node) for node in path)
+        return size
+
+    @staticmethod
+    def _copy(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Callers annotate results (e.g. compare flags), so never hand out the cached dict"""
+        copied = dict(result)
+        copied["path"] = list(result["path"])
+        return copied
+
+    def _sync_version(self, version: int) -> bool:
+        """Move to a newer version, dropping all entries; False for an older one"""
+        if self.version is not None and version < self.version:
+            return False
+        if version != self.version:
+            self._entries.clear()
+            self.memory_bytes = 0
+            self.version = version
+        return True
+
+    def get(self, version: int, start: Hashable, goal: Hashable, algorithm: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None on a miss"""
+        if self.max_entries <= 0:
+            return None
+
+        key = (version, start, goal, algorithm)
+        with self._lock:
+            entry = self._entries.get(key) if self._sync_version(version) else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._copy(entry[0])
+
+    def put(self, version: int, start: Hashable, goal: Hashable, algorithm: str, result: Dict[str, Any]):
+        """Store a result, evicting least recently used entries over the limits"""
+        if self.max_entries <= 0:
+            return
+
+        key = (version, start, goal, algorithm)
+        size = self._estimate_size(result)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if not self._sync_version(version):
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous[1]
+
+            self._entries[key] = (self._copy(result), size)
+            self.memory_bytes += size
+
+            while len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.evictions += 1
+
+    def migrate(self, version: int, new_version: int, keep: Callable[[str, Dict[str, Any]], bool]) -> int:
+        """
+        Carry entries of `version` that are still valid over to `new_version`
+        after an incremental graph update; the rest are dropped.
+        `keep` is called with each entry's algorithm and result.
+        Returns: number of entries kept
+        """
+        with self._lock:
+            if self.version != version:
+                return 0
+            entries: "OrderedDict[Tuple, Tuple[Dict[str, Any], int]]" = OrderedDict()
+            for (_, start, goal, algorithm), entry in self._entries.items():
+                if keep(algorithm, entry[0]):
+                    entries[(new_version, start, goal, algorithm)] = entry
+            self._entries = entries
+            self.memory_bytes = sum(size for _, size in entries.values())
+            self.version = new_version
+            return len(entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+            self.version = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "memory_bytes": self.memory_bytes,
+                "max_memory_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "graph_version": self.version,
+            }
+
+
+# Singleton instance
+route_cache = RouteCache(
+    max_entries=settings.ROUTE_CACHE_SIZE,
+    max_bytes=settings.ROUTE_CACHE_MAX_BYTES
+)
@@ -1,8 +1,15 @@
-from typing import List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
+import asyncio
+import numpy as np
 from sqlalchemy.orm import Session
 from ..algorithms import ALGORITHMS
-from ..models import SearchHistory
+from ..algorithms.many_to_many import split_sources
+from ..core.config import settings
 from .graph_service import graph_service
+from .history_writer import history_writer
+from .route_cache import route_cache
+from .search_context import SearchContext, TIME_DEPENDENT_ALGORITHMS
+from .search_executor import search_executor, SearchRejectedError, SearchTimeoutError
 
 
 class RouteService:
@@ -13,7 +20,9 @@ class RouteService:
         start: str,
         goal: str,
         algorithm: str = "astar",
-        db: Session = None
+        db: Session = None,
+        k: int = 1,
+        departure_time: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Find route using specified algorithm.
@@ -21,48 +30,132 @@ class RouteService:
         Args:
             start: Starting city name
             goal: Destination city name
-            algorithm: Algorithm to use (bfs, dfs, ucs, astar, dijkstra, bidirectional)
+            algorithm: Algorithm to use (bfs, dfs, ucs, astar, dijkstra, bidirectional, bidirectional_dijkstra, ch, matrix)
             db: Database session (optional, for storing history)
+            k: Number of alternative routes; above 1 the result also lists the k shortest loopless routes
+            departure_time: Hours after midnight; finds the fastest route under the traffic profiles instead
 
         Returns:
             Dictionary with path, distance, and performance metrics
         """
-        # Validate inputs
-        graph = graph_service.get_graph()
-        if graph is None:
+        context = self._validate_endpoints(start, goal)
+        algorithm_lower = self._resolve_algorithm(algorithm)
+        self._validate_k(k, departure_time)
+
+        if departure_time is not None:
+            # Depends on the time of day, so never cached
+            result = context.execute_at(algorithm_lower, start, goal, departure_time)
+            self._store_history(db, [(start, goal, algorithm_lower, result)])
+            return result
+
+        # Execute search, or reuse the result for this graph version
+        result = route_cache.get(context.version, start, goal, algorithm_lower)
+        if result is None:
+            result = context.execute(algorithm_lower, start, goal)
+            if result['success']:
+                route_cache.put(context.version, start, goal, algorithm_lower, result)
+
+        if k > 1 and result['success']:
+            result['alternatives'] = context.k_shortest_paths(start, goal, k)
+
+        self._store_history(db, [(start, goal, algorithm_lower, result)])
+        return result
+
+    async def find_route_async(
+        self,
+        start: str,
+        goal: str,
+        algorithm: str = "astar",
+        db: Session = None,
+        k: int = 1,
+        departure_time: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Find route like find_route, but run the search on the search executor
+        so the event loop never blocks.
+        Raises SearchRejectedError when the executor is saturated and
+        SearchTimeoutError when the search exceeds SEARCH_TIMEOUT.
+        """
+        context = self._validate_endpoints(start, goal)
+        algorithm_lower = self._resolve_algorithm(algorithm)
+        self._validate_k(k, departure_time)
+
+        if departure_time is not None:
+            if algorithm_lower not in TIME_DEPENDENT_ALGORITHMS:
+                raise ValueError(f"Departure times are supported by: {list(TIME_DEPENDENT_ALGORITHMS)}")
+            result = await search_executor.call(context, "execute_at", algorithm_lower, start, goal, departure_time)
+        else:
+            result = await self._search_async(context, algorithm_lower, start, goal)
+
+        if k > 1 and result['success']:
+            result['alternatives'] = await search_executor.call(context, "k_shortest_paths", start, goal, k)
+
+        self._store_history(db, [(start, goal, algorithm_lower, result)])
+        return result
+
+    async def _search_async(
+        self,
+        context: SearchContext,
+        algorithm: str,
+        start: str,
+        goal: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """Run one validated search on the search executor, going through the route cache unless use_cache is off"""
+        result = route_cache.get(context.version, start, goal, algorithm) if use_cache else None
+        if result is None:
+            result = await search_executor.run(context, algorithm, start, goal)
+            if result['success']:
+                route_cache.put(context.version, start, goal, algorithm, result)
+        return result
+
+    def _validate_endpoints(self, start: str, goal: str) -> SearchContext:
+        """Check both cities against the current graph and return its search context"""
+        # The context is read once, so the search, its version and the cache key all match
+        context = graph_service.get_context()
+        if context is None:
             raise ValueError("Graph not initialized")
 
-        if start not in graph:
+        if start not in context.graph:
             raise ValueError(f"Start city '{start}' not found in graph")
 
-        if goal not in graph:
+        if goal not in context.graph:
             raise ValueError(f"Goal city '{goal}' not found in graph")
 
-        # Get algorithm class
+        return context
+
+    def _resolve_algorithm(self, algorithm: str) -> str:
+        """Normalize an algorithm name to its ALGORITHMS key"""
         algorithm_lower = algorithm.lower()
         if algorithm_lower not in ALGORITHMS:
             raise ValueError(f"Unknown algorithm: {algorithm}. Available: {list(ALGORITHMS.keys())}")
+        return algorithm_lower
 
-        # Execute search
-        algo_class = ALGORITHMS[algorithm_lower]
-        algo_instance = algo_class(graph)
-        result = algo_instance.execute(start, goal)
-
-        # Store in database if session provided
-        if db and result['success']:
-            history = SearchHistory(
-                start_city=start,
-                goal_city=goal,
-                algorithm=algorithm_lower,
-                path=result['path'],
-                total_distance=result['total_distance'],
-                execution_time=result['execution_time'],
-                nodes_explored=result['nodes_explored']
-            )
-            db.add(history)
-            db.commit()
+    def _validate_k(self, k: int, departure_time: Optional[float] = None):
+        if not 1 <= k <= settings.MAX_ALTERNATIVE_ROUTES:
+            raise ValueError(f"k must be between 1 and {settings.MAX_ALTERNATIVE_ROUTES}")
+        if k > 1 and departure_time is not None:
+            raise ValueError("Alternative routes are not available with a departure time")
 
-        return result
+    def _store_history(self, db: Session, searches: List[Tuple[str, str, str, Dict[str, Any]]]):
+        """Queue the successful (start, goal, algorithm, result) searches for the history writer"""
+        if not db:
+            return
+
+        rows = [
+            {
+                'start_city': start,
+                'goal_city': goal,
+                'algorithm': algorithm,
+                'path': result['path'],
+                'total_distance': result['total_distance'],
+                'execution_time': result['execution_time'],
+                'nodes_explored': result['nodes_explored']
+            }
+            for start, goal, algorithm, result in searches
+            if result['success']
+        ]
+        history_writer.submit(db.get_bind(), rows)
 
     def compare_algorithms(
         self,
@@ -83,20 +176,220 @@ class RouteService:
         Returns:
             Dictionary with results from all algorithms
         """
+        # Every algorithm is run fresh: cached results carry the execution time and
+        # nodes explored of an earlier search, which would skew the ranking
         if algorithms is None:
             algorithms = list(ALGORITHMS.keys())
 
+        context = self._validate_endpoints(start, goal)
         results = {}
+        searches = []
         for algo in algorithms:
             try:
-                result = self.find_route(start, goal, algo, db)
+                algorithm_lower = self._resolve_algorithm(algo)
+                result = context.execute(algorithm_lower, start, goal)
+                if result['success']:
+                    route_cache.put(context.version, start, goal, algorithm_lower, result)
                 results[algo] = result
+                searches.append((start, goal, algorithm_lower, result))
             except Exception as e:
                 results[algo] = {
                     "success": False,
                     "error": str(e)
                 }
 
+        self._store_history(db, searches)
+        return self._summarize(start, goal, algorithms, results)
+
+    async def compare_algorithms_async(
+        self,
+        start: str,
+        goal: str,
+        algorithms: List[str] = None,
+        db: Session = None
+    ) -> Dict[str, Any]:
+        """
+        Compare algorithms like compare_algorithms (bypassing the route cache),
+        but run all searches concurrently on the search executor, so the comparison takes about as
+        long as its slowest algorithm when the pool has a worker per algorithm.
+        """
+        if algorithms is None:
+            algorithms = list(ALGORITHMS.keys())
+
+        context = self._validate_endpoints(start, goal)
+
+        async def run_one(algo: str) -> Dict[str, Any]:
+            try:
+                return await self._search_async(context, self._resolve_algorithm(algo), start, goal, use_cache=False)
+            except (SearchRejectedError, SearchTimeoutError):
+                raise
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
+
+        outcomes = await asyncio.gather(*(run_one(algo) for algo in algorithms))
+        results = dict(zip(algorithms, outcomes))
+
+        searches = [
+            (start, goal, algo.lower(), result)
+            for algo, result in results.items()
+            if result['success']
+        ]
+        self._store_history(db, searches)
+        return self._summarize(start, goal, algorithms, results)
+
+    def find_routes_batch(
+        self,
+        routes: List[Tuple[str, str, str]],
+        db: Session = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer many (start, goal, algorithm) requests, yielding results as they finish.
+
+        Requests with the same start and algorithm are answered by one
+        single-source search (see SearchAlgorithm._search_many), and all
+        successful searches are stored in one bulk insert once the batch ends.
+
+        Args:
+            routes: List of (start, goal, algorithm) tuples
+            db: Database session (optional, for storing history)
+
+        Returns:
+            Async iterator of result dicts, each with the `index` of its request
+        """
+        context = graph_service.get_context()
+        if context is None:
+            raise ValueError("Graph not initialized")
+        return self._run_batch(context, routes, db)
+
+    async def _run_batch(
+        self,
+        context: SearchContext,
+        routes: List[Tuple[str, str, str]],
+        db: Session
+    ) -> AsyncIterator[Dict[str, Any]]:
+        searches = []
+        # (start, algorithm) -> indices of the requests that search needs to answer
+        groups: Dict[Tuple[str, str], List[int]] = {}
+
+        def tagged(index: int, result: Dict[str, Any]) -> Dict[str, Any]:
+            start, goal, algorithm = routes[index]
+            return {"index": index, "start": start, "goal": goal, **result}
+
+        for index, (start, goal, algorithm) in enumerate(routes):
+            try:
+                if start not in context.graph:
+                    raise ValueError(f"Start city '{start}' not found in graph")
+                if goal not in context.graph:
+                    raise ValueError(f"Goal city '{goal}' not found in graph")
+                algorithm_lower = self._resolve_algorithm(algorithm)
+            except ValueError as e:
+                yield tagged(index, {"success": False, "error": str(e)})
+                continue
+
+            result = route_cache.get(context.version, start, goal, algorithm_lower)
+            if result is not None:
+                searches.append((start, goal, algorithm_lower, result))
+                yield tagged(index, result)
+                continue
+            groups.setdefault((start, algorithm_lower), []).append(index)
+
+        async def run_group(key: Tuple[str, str]):
+            start, algorithm = key
+            goals = [routes[index][1] for index in groups[key]]
+            try:
+                return key, await search_executor.run_many(context, algorithm, start, goals)
+            except Exception as e:
+                return key, [{"success": False, "error": str(e)}] * len(goals)
+
+        for finished in asyncio.as_completed([run_group(key) for key in groups]):
+            (start, algorithm), results = await finished
+            for index, result in zip(groups[(start, algorithm)], results):
+                goal = routes[index][1]
+                if result['success']:
+                    route_cache.put(context.version, start, goal, algorithm, result)
+                    searches.append((start, goal, algorithm, result))
+                yield tagged(index, result)
+
+        self._store_history(db, searches)
+
+    async def distance_matrix(
+        self,
+        origins: List[str],
+        destinations: List[str] = None
+    ) -> np.ndarray:
+        """
+        Compute the origin-destination distance matrix.
+
+        Rows are sliced from the all-pairs matrix when the graph has one;
+        otherwise the origins are split across SEARCH_WORKERS worker processes
+        in either executor mode, so they are searched on separate cores.
+
+        Args:
+            origins: Origin city names (one row each)
+            destinations: Destination city names (one column each, default: origins)
+
+        Returns:
+            float64 array of shape (len(origins), len(destinations)), inf where unreachable
+        """
+        if destinations is None:
+            destinations = origins
+
+        context = graph_service.get_context()
+        if context is None:
+            raise ValueError("Graph not initialized")
+
+        missing = [city for city in dict.fromkeys(origins + destinations) if city not in context.graph]
+        if missing:
+            raise ValueError(f"Cities not found in graph: {missing}")
+
+        if len(origins) * len(destinations) > settings.DISTANCE_MATRIX_MAX_CELLS:
+            raise ValueError(f"Matrix exceeds DISTANCE_MATRIX_MAX_CELLS ({settings.DISTANCE_MATRIX_MAX_CELLS} cells)")
+
+        sources = [context.graph.node_id(city) for city in origins]
+        targets = [context.graph.node_id(city) for city in destinations]
+
+        # Slicing a precomputed all-pairs matrix is cheaper than dispatching work
+        if context.matrix is not None:
+            return context.distances(sources, targets)
+
+        # One early-stopping Dijkstra per distinct origin, origins split across worker
+        # processes even in thread mode: the searches are pure Python and hold the GIL
+        unique_sources = list(dict.fromkeys(sources))
+        chunks = split_sources(unique_sources, search_executor.max_workers)
+        blocks = await asyncio.gather(*(
+            search_executor.call_in_processes(context, "distances", chunk, targets) for chunk in chunks
+        ))
+        rows = np.vstack(blocks)
+        position = {source: i for i, source in enumerate(unique_sources)}
+        return rows[[position[source] for source in sources]]
+
+    async def route_legs(self, legs: List[Tuple[str, str]], algorithm: str = "astar") -> List[Dict[str, Any]]:
+        """
+        Route consecutive legs of a multi-stop plan, at most one search per
+        worker in flight. Raises ValueError if any leg has no path.
+        """
+        slots = asyncio.Semaphore(search_executor.max_workers)
+
+        async def route(start: str, goal: str) -> Dict[str, Any]:
+            async with slots:
+                result = await self.find_route_async(start, goal, algorithm)
+            if not result['success']:
+                raise ValueError(f"No path found from {start} to {goal}")
+            return result
+
+        return await asyncio.gather(*(route(start, goal) for start, goal in legs))
+
+    def _summarize(
+        self,
+        start: str,
+        goal: str,
+        algorithms: List[str],
+        results: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Flag the best results and count successes of a comparison"""
         # Add comparison metrics
         successful = {k: v for k, v in results.items() if v.get('success')}
 
@@ -121,35 +414,6 @@ class RouteService:
             }
         }
 
-    def get_search_history(
-        self,
-        db: Session,
-        limit: int = 100,
-        algorithm: str = None
-    ) -> List[Dict[str, Any]]:
-        """Get search history from database"""
-        query = db.query(SearchHistory)
-
-        if algorithm:
-            query = query.filter(SearchHistory.algorithm == algorithm)
-
-        history = query.order_by(SearchHistory.created_at.desc()).limit(limit).all()
-
-        return [
-            {
-                'id': h.id,
-                'start_city': h.start_city,
-                'goal_city': h.goal_city,
-                'algorithm': h.algorithm,
-                'path': h.path,
-                'total_distance': h.total_distance,
-                'execution_time': h.execution_time,
-                'nodes_explored': h.nodes_explored,
-                'created_at': h.created_at.isoformat()
-            }
-            for h in history
-        ]
-
 
 # Singleton instance
 route_service = RouteService()
@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import numpy as np
+from ..algorithms import (
+    ALGORITHMS,
+    AStarAlgorithm,
+    BidirectionalDijkstraAlgorithm,
+    CHAlgorithm,
+    MatrixAlgorithm,
+    SearchAlgorithm,
+)
+from ..algorithms.ch import ContractionHierarchy
+from ..algorithms.csr import CSRGraph, shortest_path_tree
+from ..algorithms.dynamic import EdgeChange
+from ..algorithms.heuristics import Heuristic, build_heuristic
+from ..algorithms.ksp import KShortestPaths
+from ..algorithms.many_to_many import many_to_many_distances
+from ..algorithms.matrix import DistanceMatrix
+from ..algorithms.time_dependent import TimeDependentAStar
+from ..algorithms.traffic import TrafficProfiles
+
+# Algorithms with a time-dependent variant for routes with a departure time
+TIME_DEPENDENT_ALGORITHMS = ("astar", "dijkstra")
+
+
+class SearchContext:
+    """
+    Everything a search needs for one graph version: the CSR snapshot and the
+    structures precomputed from it. GraphService swaps whole contexts on load,
+    so a search holding a context always sees one consistent graph, and the
+    context can be handed to worker processes once instead of per request.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        graph: CSRGraph,
+        heuristic: Optional[Heuristic] = None,
+        hierarchy: Optional[ContractionHierarchy] = None,
+        matrix: Optional[DistanceMatrix] = None,
+        tree_cache_size: int = 64,
+        traffic: Optional[TrafficProfiles] = None,
+        traffic_heuristic: Optional[Heuristic] = None,
+        num_landmarks: int = 8,
+    ):
+        self.version = version
+        self.graph = graph
+        self.heuristic = heuristic
+        self.hierarchy = hierarchy
+        self.matrix = matrix
+        # Time-of-day speeds and a travel-time heuristic for time-dependent routes
+        self.traffic = traffic
+        self.traffic_heuristic = traffic_heuristic
+        self.num_landmarks = num_landmarks
+        # Shortest-path trees rooted at recently requested goals, for k-shortest-path queries
+        self.tree_cache_size = tree_cache_size
+        self._trees: "OrderedDict[int, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+        self._trees_lock = threading.Lock()
+        # Set while the hierarchy is contracted in the background; ch queries fall back meanwhile
+        self.hierarchy_pending = False
+        self._hierarchy_lock = threading.Lock()
+        self._hierarchy_thread: Optional[threading.Thread] = None
+
+    def __getstate__(self):
+        # Worker processes start with an empty tree cache and their own locks
+        state = self.__dict__.copy()
+        state['_trees'] = OrderedDict()
+        state['_hierarchy_thread'] = None
+        del state['_trees_lock'], state['_hierarchy_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._trees_lock = threading.Lock()
+        self._hierarchy_lock = threading.Lock()
+
+    def with_edge_changes(self, changes: List[EdgeChange]) -> "SearchContext":
+        """
+        Context for the next graph version after edge changes. The heuristics,
+        matrix and traffic profiles are repaired rather than rebuilt; the
+        contraction hierarchy is not carried over (see build_hierarchy_in_background).
+        This context is left untouched for searches still running on it.
+        """
+        graph = self.graph.with_edge_changes((u, v, new) for u, v, _, new in changes)
+        traffic = self.traffic.remap(self.graph, graph) if self.traffic else None
+
+        traffic_heuristic = None
+        if self.traffic_heuristic is not None:
+            # The travel-time heuristic sees the same changes in hours
+            bounds, new_bounds = self.traffic.lower_bound_graph(self.graph), traffic.lower_bound_graph(graph)
+            inf = float('inf')
+            time_changes = [
+                (u, v, bounds.edge_weight(u, v) if old < inf else inf, new_bounds.edge_weight(u, v) if new < inf else inf)
+                for u, v, old, new in changes
+            ]
+            traffic_heuristic = self.traffic_heuristic.updated(new_bounds, time_changes)
+
+        return SearchContext(
+            version=self.version + 1,
+            graph=graph,
+            heuristic=self.heuristic.updated(graph, changes) if self.heuristic else None,
+            matrix=self.matrix.updated(graph, changes) if self.matrix else None,
+            tree_cache_size=self.tree_cache_size,
+            traffic=traffic,
+            traffic_heuristic=traffic_heuristic,
+            num_landmarks=self.num_landmarks,
+        )
+
+    def with_traffic(self, traffic: TrafficProfiles, traffic_heuristic: Optional[Heuristic] = None) -> "SearchContext":
+        """Context for the next graph version with new traffic profiles and the same graph"""
+        return SearchContext(
+            version=self.version + 1,
+            graph=self.graph,
+            heuristic=self.heuristic,
+            hierarchy=self.hierarchy,
+            matrix=self.matrix,
+            tree_cache_size=self.tree_cache_size,
+            traffic=traffic,
+            traffic_heuristic=traffic_heuristic,
+            num_landmarks=self.num_landmarks,
+        )
+
+    def get_hierarchy(self) -> ContractionHierarchy:
+        """Contraction hierarchy, built once on first use if it was not precomputed"""
+        if self.hierarchy is None:
+            with self._hierarchy_lock:
+                if self.hierarchy is None:
+                    self.hierarchy = ContractionHierarchy.build(self.graph)
+        return self.hierarchy
+
+    def build_hierarchy_in_background(self) -> Optional[threading.Thread]:
+        """
+        Contract the graph on a daemon thread. Until it finishes, ch queries
+        run bidirectional Dijkstra, which returns the same shortest routes,
+        instead of each waiting for (or repeating) the contraction.
+        """
+        if self.hierarchy is not None or self.hierarchy_pending:
+            return self._hierarchy_thread
+        self.hierarchy_pending = True
+        self._hierarchy_thread = threading.Thread(
+            target=self._finish_hierarchy, name=f"ch-build-v{self.version}", daemon=True
+        )
+        self._hierarchy_thread.start()
+        return self._hierarchy_thread
+
+    def _finish_hierarchy(self):
+        try:
+            self.get_hierarchy()
+        except Exception as e:
+            print(f">> Warning: Could not contract graph version {self.version}: {e}")
+        finally:
+            self.hierarchy_pending = False
+
+    def get_traffic_heuristic(self) -> Heuristic:
+        """Travel-time heuristic over the fastest speed of each edge, built on first use"""
+        if self.traffic_heuristic is None:
+            bounds = self.traffic.lower_bound_graph(self.graph)
+            self.traffic_heuristic = build_heuristic(bounds, num_landmarks=self.num_landmarks)
+        return self.traffic_heuristic
+
+    def create_algorithm(self, algorithm: str) -> SearchAlgorithm:
+        """Instantiate an algorithm with the precomputed data it can use"""
+        algo_class = ALGORITHMS[algorithm]
+        if algo_class is AStarAlgorithm:
+            return algo_class(self.graph, heuristic=self.heuristic)
+        if algo_class is CHAlgorithm:
+            if self.hierarchy is None and self.hierarchy_pending:
+                return BidirectionalDijkstraAlgorithm(self.graph)
+            return algo_class(self.graph, hierarchy=self.get_hierarchy())
+        if algo_class is MatrixAlgorithm:
+            if self.matrix is None:
+                raise ValueError("Distance matrix is not available for graphs larger than MATRIX_MAX_NODES")
+            return algo_class(self.graph, matrix=self.matrix)
+        return algo_class(self.graph)
+
+    def execute(self, algorithm: str, start: str, goal: str) -> Dict[str, Any]:
+        """Run one search and return its result dict with metrics"""
+        return self.create_algorithm(algorithm).execute(start, goal)
+
+    def execute_at(self, algorithm: str, start: str, goal: str, departure: float) -> Dict[str, Any]:
+        """Run one time-dependent search leaving at `departure` (hours) and return its result dict"""
+        if self.traffic is None:
+            raise ValueError("Traffic profiles are not available")
+        if algorithm not in TIME_DEPENDENT_ALGORITHMS:
+            raise ValueError(f"Departure times are supported by: {list(TIME_DEPENDENT_ALGORITHMS)}")
+        heuristic = self.get_traffic_heuristic() if algorithm == "astar" else None
+        return TimeDependentAStar(self.graph, self.traffic, departure, heuristic).execute(start, goal)
+
+    def execute_many(self, algorithm: str, start: str, goals: List[str]) -> List[Dict[str, Any]]:
+        """Run one search from start to several goals and return a result dict per goal"""
+        return self.create_algorithm(algorithm).execute_many(start, goals)
+
+    def distances(self, sources: List[int], targets: List[int]) -> np.ndarray:
+        """Shortest distances from each source id to each target id"""
+        return many_to_many_distances(self.graph, sources, targets, self.matrix)
+
+    def goal_tree(self, goal: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Shortest-path tree rooted at goal (distances, next hops), kept in a small LRU"""
+        with self._trees_lock:
+            tree = self._trees.get(goal)
+            if tree is not None:
+                self._trees.move_to_end(goal)
+                return tree
+
+        tree = shortest_path_tree(self.graph, goal)
+        with self._trees_lock:
+            self._trees[goal] = tree
+            while len(self._trees) > self.tree_cache_size:
+                self._trees.popitem(last=False)
+        return tree
+
+    def k_shortest_paths(self, start: str, goal: str, k: int) -> List[Dict[str, Any]]:
+        """Up to k loopless routes from start to goal, shortest first"""
+        goal_id = self.graph.node_id(goal)
+        engine = KShortestPaths(self.graph, goal_id, self.goal_tree(goal_id))
+        return [
+            {"path": self.graph.to_names(path), "total_distance": distance}
+            for path, distance in engine.search(self.graph.node_id(start), k)
+        ]
@@ -0,0 +1,252 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import threading
+from ..core.config import settings
+from .search_context import SearchContext
+
+
+class SearchRejectedError(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class SearchTimeoutError(Exception):
+    """Raised when a search does not finish within the request timeout"""
+
+
+# Search context of a worker process, installed once by the pool initializer
+_worker_context: Optional[SearchContext] = None
+
+
+def _init_worker(context: SearchContext):
+    global _worker_context
+    _worker_context = context
+
+
+def _execute_in_worker(version: int, method: str, *args):
+    if _worker_context is None or _worker_context.version != version:
+        raise RuntimeError(f"Search worker does not hold graph version {version}")
+    return getattr(_worker_context, method)(*args)
+
+
+class SearchExecutor:
+    """
+    Runs CPU-bound searches off the asyncio event loop.
+
+    In "thread" mode searches run on a thread pool and share the in-memory
+    SearchContext directly. In "process" mode each worker receives the context
+    once through the pool initializer, so requests only send (version,
+    algorithm, start, goal). Process pools are keyed by graph version and by
+    whether the contraction hierarchy is built yet, so it is contracted once
+    in this process and shipped to the workers instead of rebuilt in each.
+    Searches still holding an older context keep using its pool, which is
+    shut down once it is no longer the newest and its searches have drained.
+    `call_in_processes` uses process pools in either mode, for pure-Python
+    batch work that would otherwise hold the GIL on the thread pool.
+
+    At most `max_workers + queue_size` searches are admitted at a time; beyond
+    that `run` raises SearchRejectedError instead of queueing without bound.
+    A search that times out keeps its slot until the worker actually finishes.
+    """
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 4,
+        queue_size: int = 64,
+        timeout: float = 30.0
+    ):
+        if mode not in ("thread", "process"):
+            raise ValueError(f"Unknown search executor mode: {mode}. Available: ['thread', 'process']")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        # The thread pool is kept under key None, process pools under their _pool_key
+        self._pools: Dict[Optional[Tuple[int, int]], Executor] = {}
+        self._pool_tasks: Dict[Optional[Tuple[int, int]], int] = {}
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.queue_size
+
+    @staticmethod
+    def _pool_key(context: SearchContext) -> Tuple[int, int]:
+        """Graph version and hierarchy state (0 absent, 1 being built, 2 built) a process pool was started with"""
+        if context.hierarchy is not None:
+            return context.version, 2
+        return context.version, int(context.hierarchy_pending)
+
+    def _get_pool(self, context: SearchContext, processes: bool) -> Tuple[Optional[Tuple[int, int]], Executor]:
+        with self._lock:
+            key = self._pool_key(context) if processes else None
+            pool = self._pools.get(key)
+            if pool is None:
+                if key is None:
+                    pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="search")
+                else:
+                    pool = ProcessPoolExecutor(
+                        self.max_workers,
+                        initializer=_init_worker,
+                        initargs=(context,)
+                    )
+                self._pools[key] = pool
+                self._pool_tasks[key] = 1
+                self._retire_idle_pools()
+            else:
+                self._pool_tasks[key] += 1
+            return key, pool
+
+    def _retire_idle_pools(self):
+        """Shut down process pools that are idle and no longer the newest (call holding the lock)"""
+        process_keys = [key for key in self._pools if key is not None]
+        if not process_keys:
+            return
+        newest = max(process_keys)
+        for key in [key for key in process_keys if key != newest and self._pool_tasks[key] == 0]:
+            self._pool_tasks.pop(key)
+            self._pools.pop(key).shutdown(wait=False)
+
+    def _acquire(self):
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise SearchRejectedError("Search capacity exceeded, retry later")
+            self.pending += 1
+
+    def _release(self):
+        with self._lock:
+            self.pending -= 1
+
+    def _finish(self, key: Optional[Tuple[int, int]], future: Optional[Future] = None):
+        """Release a finished search's slot and retire its pool if that was the last search on it"""
+        with self._lock:
+            self.pending -= 1
+            tasks = self._pool_tasks.get(key)
+            if tasks is None:
+                return
+            self._pool_tasks[key] = tasks - 1
+            if future is not None and not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+                # A worker died; start a fresh pool on the next request
+                self._pool_tasks.pop(key)
+                self._pools.pop(key)
+            else:
+                self._retire_idle_pools()
+
+    def submit(self, context: SearchContext, algorithm: str, start: str, goal: str) -> Future:
+        """Admit a search and submit it to the pool (SearchRejectedError when full)"""
+        return self._submit(context, "execute", algorithm, start, goal)
+
+    def submit_many(self, context: SearchContext, algorithm: str, start: str, goals: List[str]) -> Future:
+        """Admit a one-to-many search from start to goals and submit it to the pool"""
+        return self._submit(context, "execute_many", algorithm, start, list(goals))
+
+    def _submit(self, context: SearchContext, method: str, *args, processes: bool = False) -> Future:
+        processes = processes or self.mode == "process"
+        self._acquire()
+        try:
+            if processes and method in ("execute", "execute_many") and args[0] == "ch":
+                # Contract once here for every worker; until then they answer with bidirectional Dijkstra
+                context.build_hierarchy_in_background()
+            key, pool = self._get_pool(context, processes)
+        except BaseException:
+            self._release()
+            raise
+        try:
+            if processes:
+                task = partial(_execute_in_worker, context.version, method, *args)
+            else:
+                task = partial(getattr(context, method), *args)
+            future = pool.submit(task)
+        except BaseException:
+            self._finish(key)
+            raise
+        future.add_done_callback(partial(self._finish, key))
+        return future
+
+    async def run(
+        self,
+        context: SearchContext,
+        algorithm: str,
+        start: str,
+        goal: str,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Run one search on the pool and await its result.
+
+        Args:
+            context: Search context of the graph version to search
+            algorithm: Algorithm name (key of ALGORITHMS)
+            start: Starting city name
+            goal: Destination city name
+            timeout: Seconds to wait (default: the executor timeout, 0 waits forever)
+
+        Returns:
+            The algorithm's result dict
+        """
+        return await self._await(self.submit(context, algorithm, start, goal), timeout)
+
+    async def run_many(
+        self,
+        context: SearchContext,
+        algorithm: str,
+        start: str,
+        goals: List[str],
+        timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Run one search from start to every goal on the pool; returns a result dict per goal"""
+        return await self._await(self.submit_many(context, algorithm, start, goals), timeout)
+
+    async def call(self, context: SearchContext, method: str, *args, timeout: Optional[float] = None):
+        """Run any SearchContext method on the pool and await its result"""
+        return await self._await(self._submit(context, method, *args), timeout)
+
+    async def call_in_processes(self, context: SearchContext, method: str, *args, timeout: Optional[float] = None):
+        """Run a SearchContext method on a process pool whatever the mode, so CPU-bound calls run on separate cores"""
+        return await self._await(self._submit(context, method, *args, processes=True), timeout)
+
+    async def _await(self, future: Future, timeout: Optional[float]):
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timed_out += 1
+            raise SearchTimeoutError(f"Search did not finish within {timeout} seconds")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return pool configuration and load counters"""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "queue_size": self.queue_size,
+                "pending": self.pending,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker pool (called on application shutdown)"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._pool_tasks.clear()
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+search_executor = SearchExecutor(
+    mode=settings.SEARCH_EXECUTOR,
+    max_workers=settings.SEARCH_WORKERS,
+    queue_size=settings.SEARCH_QUEUE_SIZE,
+    timeout=settings.SEARCH_TIMEOUT
+)
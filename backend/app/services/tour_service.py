@@ -0,0 +1,83 @@
+from typing import Any, Dict, List
+import time
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+from ..algorithms.tour import optimize_tour
+from ..core.config import settings
+from .route_service import route_service
+
+
+class TourService:
+    """Service for ordering multi-stop delivery tours"""
+
+    async def optimize_tour(
+        self,
+        stops: List[str],
+        start: str = None,
+        return_to_start: bool = True,
+        algorithm: str = "astar",
+        time_budget: float = None
+    ) -> Dict[str, Any]:
+        """
+        Find a short order to visit all stops and the road path that follows it.
+
+        Args:
+            stops: City names to visit (duplicates are visited once)
+            start: Depot city the tour starts from (default: first stop)
+            return_to_start: Whether the tour ends back at the start
+            algorithm: Algorithm used to route each leg of the final tour
+            time_budget: Seconds for local search (default: TOUR_TIME_BUDGET)
+
+        Returns:
+            Dictionary with ordered stops, concatenated path, legs and optimization metrics
+        """
+        stops = list(dict.fromkeys(stops))
+        if start is not None:
+            stops = [start] + [stop for stop in stops if stop != start]
+
+        if len(stops) < 2:
+            raise ValueError("A tour needs at least two distinct stops")
+
+        if len(stops) > settings.TOUR_MAX_STOPS:
+            raise ValueError(f"Tour exceeds TOUR_MAX_STOPS ({settings.TOUR_MAX_STOPS} stops)")
+
+        # Pairwise submatrix, computed once for the whole optimization
+        distances = await route_service.distance_matrix(stops)
+        unreachable = ~np.isfinite(distances).all(axis=1)
+        if unreachable.any():
+            raise ValueError(f"Stops not reachable from every other stop: {[s for s, u in zip(stops, unreachable) if u]}")
+
+        budget = settings.TOUR_TIME_BUDGET if time_budget is None else time_budget
+        started = time.perf_counter()
+        order, total_distance, stats = await run_in_threadpool(
+            optimize_tour, distances, 0, return_to_start, budget
+        )
+        optimization_time = time.perf_counter() - started
+
+        ordered = [stops[i] for i in order]
+        visits = ordered + [ordered[0]] if return_to_start else ordered
+        legs = await route_service.route_legs(list(zip(visits[:-1], visits[1:])), algorithm)
+
+        path = [visits[0]]
+        for leg in legs:
+            path.extend(leg['path'][1:])
+
+        return {
+            'stops': ordered,
+            'return_to_start': return_to_start,
+            'total_distance': total_distance,
+            'path': path,
+            'legs': [
+                {'start': a, 'goal': b, 'distance': leg['total_distance']}
+                for (a, b), leg in zip(zip(visits[:-1], visits[1:]), legs)
+            ],
+            'initial_distance': stats['initial_distance'],
+            'two_opt_moves': stats['two_opt_moves'],
+            'or_opt_moves': stats['or_opt_moves'],
+            'timed_out': stats['timed_out'],
+            'optimization_time': optimization_time
+        }
+
+
+# Singleton instance
+tour_service = TourService()
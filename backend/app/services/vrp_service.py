@@ -0,0 +1,127 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+from ..algorithms.vrp import VRPProblem, solve_vrp
+from ..core.config import settings
+from .route_service import route_service
+
+
+class VRPService:
+    """
+    Service for assigning deliveries to a fleet of capacitated vehicles.
+
+    Solver restarts run on one process pool of `workers` processes, created
+    on the first solve and kept until shutdown, so requests do not pay for
+    starting worker processes.
+    """
+
+    def __init__(self, workers: int = 2):
+        self.workers = max(1, workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers == 1:
+            return None
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers)
+            return self._pool
+
+    async def solve(
+        self,
+        vehicles: List[Dict[str, Any]],
+        deliveries: List[Dict[str, Any]],
+        speed: float = 60.0,
+        seed: int = 0,
+        time_budget: float = None,
+        algorithm: str = "astar"
+    ) -> Dict[str, Any]:
+        """
+        Plan vehicle routes that serve the deliveries within capacity and time windows.
+
+        Args:
+            vehicles: Dicts with id, depot (city name) and capacity
+            deliveries: Dicts with city, demand, ready, due and service_time (hours from dispatch)
+            speed: Travel speed in distance units per hour
+            seed: Seed for the randomized restarts
+            time_budget: Seconds for the solver (default: VRP_TIME_BUDGET)
+            algorithm: Algorithm used to route each leg of the final plan
+
+        Returns:
+            Dictionary with one route per used vehicle, unassigned deliveries and totals
+        """
+        if not vehicles:
+            raise ValueError("At least one vehicle is required")
+
+        if len(deliveries) > settings.VRP_MAX_DELIVERIES:
+            raise ValueError(f"Request exceeds VRP_MAX_DELIVERIES ({settings.VRP_MAX_DELIVERIES} deliveries)")
+
+        # Shortest distances between every depot and delivery city, computed once
+        cities = list(dict.fromkeys([v['depot'] for v in vehicles] + [d['city'] for d in deliveries]))
+        index = {city: i for i, city in enumerate(cities)}
+        distances = await route_service.distance_matrix(cities)
+
+        problem = VRPProblem(
+            distances,
+            vehicle_depots=[index[v['depot']] for v in vehicles],
+            capacities=[v['capacity'] for v in vehicles],
+            locations=[index[d['city']] for d in deliveries],
+            demands=[d['demand'] for d in deliveries],
+            ready=[d['ready'] for d in deliveries],
+            due=[float('inf') if d['due'] is None else d['due'] for d in deliveries],
+            service_times=[d['service_time'] for d in deliveries],
+            speed=speed
+        )
+
+        budget = settings.VRP_TIME_BUDGET if time_budget is None else time_budget
+        started = time.perf_counter()
+        solution = await run_in_threadpool(
+            solve_vrp, problem, seed, budget, settings.VRP_RESTARTS, self.workers, self._get_pool()
+        )
+        solve_time = time.perf_counter() - started
+
+        routes = []
+        for vehicle, route in enumerate(solution.routes):
+            if not route:
+                continue
+            depot = vehicles[vehicle]['depot']
+            visits = [depot] + [deliveries[d]['city'] for d in route] + [depot]
+            legs = await route_service.route_legs(list(zip(visits[:-1], visits[1:])), algorithm)
+            path = [depot]
+            for leg in legs:
+                path.extend(leg['path'][1:])
+
+            routes.append({
+                'vehicle': vehicles[vehicle]['id'],
+                'depot': depot,
+                'stops': [
+                    {'delivery': d, 'city': deliveries[d]['city'], 'arrival': arrival, 'service_start': start}
+                    for d, (arrival, start) in zip(route, problem.schedule(vehicle, route))
+                ],
+                'load': problem.load(route),
+                'distance': problem.evaluate(vehicle, route),
+                'path': path
+            })
+
+        return {
+            'routes': routes,
+            'unassigned': solution.unassigned,
+            'total_distance': solution.total_distance,
+            'vehicles_used': len(routes),
+            'seed': seed,
+            'solve_time': solve_time
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the solver pool (called on application shutdown)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+vrp_service = VRPService(workers=settings.VRP_WORKERS)
@@ -1,80 +1,174 @@
 import pandas as pd
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
+from typing import Any, Dict, List
 from ..models import City, Connection
 from ..core.database import SessionLocal, init_db
+import argparse
+import csv
+import io
 import os
+import time
 
+# Rows written per executemany (or COPY) and per transaction
+CHUNK_SIZE = 10000
 
-def load_cities_from_csv(db: Session, csv_file: str):
-    """Load cities from CSV into database"""
-    df = pd.read_csv(csv_file)
 
-    cities_added = 0
-    for _, row in df.iterrows():
-        # Check if city already exists
-        existing = db.query(City).filter(City.name == row['city']).first()
-        if not existing:
-            city = City(
-                name=row['city'],
-                latitude=row['latitude'],
-                longitude=row['longitude'],
-                population=row.get('population', 0)
-            )
-            db.add(city)
-            cities_added += 1
-
-    db.commit()
-    print(f"✓ Added {cities_added} cities to database")
+def _chunks(records: List[Dict[str, Any]], chunk_size: int):
+    for i in range(0, len(records), chunk_size):
+        yield records[i:i + chunk_size]
+
+
+def _copy_rows(db: Session, table, records: List[Dict[str, Any]]):
+    """Stream rows into a PostgreSQL table with COPY on the session's connection"""
+    columns = list(records[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([record[column] for column in columns] for record in records)
+    buffer.seek(0)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def _bulk_insert(db: Session, model, records: List[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> int:
+    """Insert rows in chunks, committing each chunk; COPY on PostgreSQL, executemany elsewhere"""
+    use_copy = db.get_bind().dialect.name == "postgresql"
+    for chunk in _chunks(records, chunk_size):
+        if use_copy:
+            _copy_rows(db, model.__table__, chunk)
+        else:
+            db.execute(insert(model), chunk)
+        db.commit()
+    return len(records)
+
+
+def _bulk_update(db: Session, model, records: List[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> int:
+    """Update rows by primary key in chunks, committing each chunk"""
+    for chunk in _chunks(records, chunk_size):
+        db.execute(update(model), chunk)
+        db.commit()
+    return len(records)
+
+
+def _report(label: str, rows: int, started: float):
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else float('inf')
+    print(f"✓ {label} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+
+
+def load_cities_from_csv(db: Session, csv_file: str, upsert: bool = False, chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    Load cities from CSV into database.
+
+    Args:
+        db: Database session
+        csv_file: CSV with columns city, latitude, longitude and optionally population
+        upsert: Also overwrite the coordinates and population of cities already stored
+        chunk_size: Rows per insert batch and transaction
+
+    Returns:
+        Number of cities added
+    """
+    started = time.perf_counter()
+    df = pd.read_csv(csv_file)
+    if 'population' not in df.columns:
+        df['population'] = 0
+    # The last row of a repeated city wins, as in GraphService.load_from_csv
+    df = df.drop_duplicates('city', keep='last')[['city', 'latitude', 'longitude', 'population']]
+    df = df.rename(columns={'city': 'name'}).astype({'latitude': float, 'longitude': float})
+    df['population'] = df['population'].astype('Int64').astype(object).where(df['population'].notna(), None)
+
+    existing = dict(db.execute(select(City.name, City.id)).all())
+    stored = df['name'].isin(existing)
+
+    cities_added = _bulk_insert(db, City, df[~stored].to_dict('records'), chunk_size)
+    cities_updated = 0
+    if upsert and stored.any():
+        updates = df[stored].assign(id=df.loc[stored, 'name'].map(existing)).to_dict('records')
+        cities_updated = _bulk_update(db, City, updates, chunk_size)
+
+    _report(f"Added {cities_added} and updated {cities_updated} cities", len(df), started)
     return cities_added
 
 
-def load_connections_from_csv(db: Session, csv_file: str):
-    """Load connections from CSV into database"""
+def load_connections_from_csv(
+    db: Session,
+    csv_file: str,
+    upsert: bool = False,
+    chunk_size: int = CHUNK_SIZE
+) -> int:
+    """
+    Load connections from CSV into database, stored once per direction.
+
+    Args:
+        db: Database session
+        csv_file: CSV with columns city1, city2, distance
+        upsert: Also overwrite the distance of connections already stored
+        chunk_size: Rows per insert batch and transaction
+
+    Returns:
+        Number of directed connections added
+    """
+    started = time.perf_counter()
     df = pd.read_csv(csv_file)
 
     # Get all cities from database
-    cities = {city.name: city.id for city in db.query(City).all()}
-
-    connections_added = 0
-    for _, row in df.iterrows():
-        city1 = row['city1']
-        city2 = row['city2']
-        distance = row['distance']
-
-        # Ensure both cities exist
-        if city1 not in cities or city2 not in cities:
-            print(f"⚠ Warning: Skipping connection {city1}-{city2}, city not found")
-            continue
-
-        # Check if connection already exists
-        existing = db.query(Connection).filter(
-            ((Connection.from_city_id == cities[city1]) & (Connection.to_city_id == cities[city2])) |
-            ((Connection.from_city_id == cities[city2]) & (Connection.to_city_id == cities[city1]))
-        ).first()
-
-        if not existing:
-            # Add bidirectional connections
-            conn1 = Connection(
-                from_city_id=cities[city1],
-                to_city_id=cities[city2],
-                distance=distance
-            )
-            conn2 = Connection(
-                from_city_id=cities[city2],
-                to_city_id=cities[city1],
-                distance=distance
-            )
-            db.add(conn1)
-            db.add(conn2)
-            connections_added += 2
-
-    db.commit()
-    print(f"✓ Added {connections_added} connections to database")
+    cities = dict(db.execute(select(City.name, City.id)).all())
+    df['from_city_id'] = df['city1'].map(cities)
+    df['to_city_id'] = df['city2'].map(cities)
+
+    # Ensure both cities exist
+    unknown = df['from_city_id'].isna() | df['to_city_id'].isna()
+    if unknown.any():
+        skipped = [f"{a}-{b}" for a, b in df.loc[unknown, ['city1', 'city2']].head(5).itertuples(index=False)]
+        print(f"⚠ Warning: Skipping {int(unknown.sum())} connections with unknown cities, e.g. {', '.join(skipped)}")
+    df = df[~unknown].astype({'from_city_id': 'int64', 'to_city_id': 'int64', 'distance': float})
+
+    # One row per undirected pair, the last one in the file wins, as in GraphService.load_from_csv
+    df['low'] = df[['from_city_id', 'to_city_id']].min(axis=1)
+    df['high'] = df[['from_city_id', 'to_city_id']].max(axis=1)
+    df = df.drop_duplicates(['low', 'high'], keep='last')
+
+    stored = pd.DataFrame(
+        db.execute(select(Connection.id, Connection.from_city_id, Connection.to_city_id)).all(),
+        columns=['id', 'from_city_id', 'to_city_id']
+    )
+    stored_pairs = pd.MultiIndex.from_arrays([
+        stored[['from_city_id', 'to_city_id']].min(axis=1),
+        stored[['from_city_id', 'to_city_id']].max(axis=1)
+    ])
+    exists = pd.MultiIndex.from_frame(df[['low', 'high']]).isin(stored_pairs)
+
+    # Add bidirectional connections
+    new = df[~exists]
+    records = pd.concat([
+        new[['from_city_id', 'to_city_id', 'distance']],
+        new[['to_city_id', 'from_city_id', 'distance']].set_axis(['from_city_id', 'to_city_id', 'distance'], axis=1)
+    ]).to_dict('records')
+    connections_added = _bulk_insert(db, Connection, records, chunk_size)
+
+    connections_updated = 0
+    if upsert and exists.any():
+        # Every stored direction of a pair takes the pair's new distance
+        stored['low'] = stored_pairs.get_level_values(0)
+        stored['high'] = stored_pairs.get_level_values(1)
+        changed = stored.merge(df[exists][['low', 'high', 'distance']], on=['low', 'high'])
+        connections_updated = _bulk_update(db, Connection, changed[['id', 'distance']].to_dict('records'), chunk_size)
+
+    _report(
+        f"Added {connections_added} and updated {connections_updated} connections",
+        connections_added + connections_updated,
+        started
+    )
     return connections_added
 
 
-def initialize_database(cities_file: str = None, connections_file: str = None):
-    """Initialize database with data from CSV files"""
+def initialize_database(cities_file: str = None, connections_file: str = None, upsert: bool = False):
+    """Initialize database with data from CSV files (upsert overwrites rows already stored)"""
     print("🔄 Initializing database...")
 
     # Initialize tables
@@ -96,12 +190,12 @@ def initialize_database(cities_file: str = None, connections_file: str = None):
 
         # Load data
         if os.path.exists(cities_file):
-            load_cities_from_csv(db, cities_file)
+            load_cities_from_csv(db, cities_file, upsert=upsert)
         else:
             print(f"⚠ Warning: Cities file not found: {cities_file}")
 
         if os.path.exists(connections_file):
-            load_connections_from_csv(db, connections_file)
+            load_connections_from_csv(db, connections_file, upsert=upsert)
         else:
             print(f"⚠ Warning: Connections file not found: {connections_file}")
 
@@ -116,4 +210,9 @@ def initialize_database(cities_file: str = None, connections_file: str = None):
 
 
 if __name__ == "__main__":
-    initialize_database()
+    parser = argparse.ArgumentParser(description="Load cities and connections from CSV into the database")
+    parser.add_argument("--cities", help="Cities CSV (default: data/cities_with_coordinates.csv)")
+    parser.add_argument("--connections", help="Connections CSV (default: CitiesPk.csv)")
+    parser.add_argument("--upsert", action="store_true", help="Overwrite cities and connections already stored")
+    args = parser.parse_args()
+    initialize_database(args.cities, args.connections, upsert=args.upsert)
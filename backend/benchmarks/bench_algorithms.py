@@ -0,0 +1,214 @@
+"""
+Search algorithm benchmark.
+
+Builds synthetic graphs of each kind and size with the same precomputed
+structures the API uses (landmarks, contraction hierarchy, distance matrix),
+then runs every entry of ALGORITHMS on the same random queries. Reports
+latency percentiles from SearchAlgorithm.execute's perf_counter_ns timing
+(the fastest of `repeats` runs of each query, with the garbage collector
+paused, to keep run-to-run noise below regression thresholds), nodes
+explored, and the peak memory a search allocates (measured with tracemalloc
+on separate runs, so it does not slow the timed ones).
+
+Usage (from backend/):
+    python -m benchmarks.bench_algorithms --graphs grid geometric --sizes 1000 10000 --output results.json
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.algorithms import ALGORITHMS
+from app.algorithms.ch import ContractionHierarchy
+from app.algorithms.csr import CSRGraph
+from app.algorithms.heuristics import build_heuristic
+from app.algorithms.matrix import DistanceMatrix
+from app.services.search_context import SearchContext
+from .graphs import GENERATORS
+from .results import environment, latency_summary, write_results
+
+
+def _timed_ms(build):
+    start = time.perf_counter_ns()
+    value = build()
+    return value, round((time.perf_counter_ns() - start) / 1e6, 3)
+
+
+def preprocess(
+    graph: CSRGraph,
+    num_landmarks: int = 8,
+    ch_max_nodes: int = 2000,
+    matrix_max_nodes: int = 1000
+) -> Tuple[SearchContext, Dict[str, Optional[float]]]:
+    """
+    Search context for a graph, built like GraphService builds it.
+    The contraction hierarchy and distance matrix are skipped above their size limits.
+
+    Returns: (context, build time in ms of each structure, None when skipped)
+    """
+    heuristic, landmarks_ms = _timed_ms(lambda: build_heuristic(graph, num_landmarks=num_landmarks))
+    hierarchy = matrix = ch_ms = matrix_ms = None
+    if graph.num_nodes <= ch_max_nodes:
+        hierarchy, ch_ms = _timed_ms(lambda: ContractionHierarchy.build(graph))
+    if graph.num_nodes <= matrix_max_nodes:
+        matrix, matrix_ms = _timed_ms(lambda: DistanceMatrix.build(graph))
+
+    context = SearchContext(version=1, graph=graph, heuristic=heuristic, hierarchy=hierarchy, matrix=matrix)
+    return context, {"landmarks_ms": landmarks_ms, "ch_ms": ch_ms, "matrix_ms": matrix_ms}
+
+
+def sample_queries(graph: CSRGraph, count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """Random (start, goal) name pairs with distinct endpoints"""
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, graph.num_nodes, count)
+    # Offsetting by 1..n-1 never lands on the start
+    goals = (starts + rng.integers(1, graph.num_nodes, count)) % graph.num_nodes
+    return [(graph.names[s], graph.names[g]) for s, g in zip(starts, goals)]
+
+
+def available(context: SearchContext, algorithm: str) -> bool:
+    """Whether the context has what the algorithm needs (CH and matrix are size-limited)"""
+    if algorithm == "ch":
+        return context.hierarchy is not None
+    if algorithm == "matrix":
+        return context.matrix is not None
+    return True
+
+
+def measure(
+    context: SearchContext,
+    algorithm: str,
+    queries: List[Tuple[str, str]],
+    memory_queries: int = 5,
+    repeats: int = 3
+) -> Dict[str, Any]:
+    """Run the queries with one algorithm and summarize latency, nodes explored and peak memory"""
+    algo = context.create_algorithm(algorithm)
+    # One untimed search, so lazily built per-algorithm state is not charged to the first query
+    algo.execute(*queries[0])
+
+    latencies, explored, successes = [], [], 0
+    gc.collect()
+    gc.disable()
+    try:
+        for start, goal in queries:
+            timings = []
+            for _ in range(max(repeats, 1)):
+                result = algo.execute(start, goal)
+                timings.append(algo.execution_time_ns)
+            latencies.append(min(timings))
+            explored.append(result["nodes_explored"])
+            successes += result["success"]
+    finally:
+        gc.enable()
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for start, goal in queries[:memory_queries]:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            algo.execute(start, goal)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    explored = np.asarray(explored)
+    return {
+        "algorithm": algorithm,
+        "queries": len(queries),
+        "successes": int(successes),
+        "latency_us": latency_summary(latencies),
+        "nodes_explored": {
+            "mean": round(float(explored.mean()), 1),
+            "p50": float(np.percentile(explored, 50)),
+            "max": int(explored.max()),
+        },
+        "peak_memory_bytes": int(peak),
+    }
+
+
+def run(
+    graphs: List[str],
+    sizes: List[int],
+    algorithms: Optional[List[str]] = None,
+    queries: int = 50,
+    memory_queries: int = 5,
+    repeats: int = 3,
+    ch_max_nodes: int = 2000,
+    matrix_max_nodes: int = 1000,
+    seed: int = 0,
+    verbose: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Benchmark algorithms on every graph kind and size.
+
+    Returns: {"preprocessing": one row per graph, "algorithms": one row per graph and algorithm}
+    """
+    algorithms = algorithms or list(ALGORITHMS)
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithms: {unknown}")
+
+    preprocessing, rows = [], []
+    for kind in graphs:
+        for size in sizes:
+            graph = GENERATORS[kind](size, seed=seed)
+            context, build_times = preprocess(graph, ch_max_nodes=ch_max_nodes, matrix_max_nodes=matrix_max_nodes)
+            graph_info = {"graph": kind, "nodes": graph.num_nodes, "edges": len(graph.indices) // 2}
+            preprocessing.append({**graph_info, **build_times})
+            if verbose:
+                built = "  ".join(f"{k}={v:.0f}" for k, v in build_times.items() if v is not None)
+                print(f">> {kind} graph, {graph.num_nodes} nodes, {graph_info['edges']} edges ({built})")
+
+            pairs = sample_queries(graph, queries, seed=seed)
+            for algorithm in algorithms:
+                if not available(context, algorithm):
+                    if verbose:
+                        print(f"   {algorithm:>22}  skipped (graph above its size limit)")
+                    continue
+                row = {**graph_info, **measure(context, algorithm, pairs, memory_queries, repeats)}
+                rows.append(row)
+                if verbose:
+                    _print_row(row)
+    return {"preprocessing": preprocessing, "algorithms": rows}
+
+
+def _print_row(row: Dict[str, Any]):
+    latency = row["latency_us"]
+    print(
+        f"   {row['algorithm']:>22}  p50={latency['p50']:>10.1f}us  p90={latency['p90']:>10.1f}us  "
+        f"p99={latency['p99']:>10.1f}us  explored={row['nodes_explored']['mean']:>10.1f}  "
+        f"peak={row['peak_memory_bytes'] / 1024:>8.1f}KiB  ok={row['successes']}/{row['queries']}"
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--graphs", choices=sorted(GENERATORS), nargs="+", default=sorted(GENERATORS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--algorithms", choices=sorted(ALGORITHMS), nargs="+", default=None)
+    parser.add_argument("--queries", type=int, default=50, help="Timed queries per algorithm and graph")
+    parser.add_argument("--memory-queries", type=int, default=5, help="Queries re-run under tracemalloc")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per query; the fastest is kept")
+    parser.add_argument("--ch-max-nodes", type=int, default=2_000, help="Skip ch on larger graphs (slow to contract)")
+    parser.add_argument("--matrix-max-nodes", type=int, default=1_000, help="Skip matrix on larger graphs")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(
+        args.graphs, args.sizes, args.algorithms, args.queries, args.memory_queries, args.repeats,
+        args.ch_max_nodes, args.matrix_max_nodes, args.seed
+    )
+    if args.output:
+        write_results(args.output, {"environment": environment(), **results})
+
+
+if __name__ == "__main__":
+    main()
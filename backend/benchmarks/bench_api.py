@@ -0,0 +1,194 @@
+"""
+In-process API load test.
+
+Loads a synthetic graph into the graph service, points the API at a scratch
+SQLite database, and drives the FastAPI router through httpx's ASGI
+transport, with no server or network in between. Each scenario sends a fixed
+number of requests from concurrent clients and reports throughput, latency
+percentiles and errors. Searches, the route cache and the history writer run
+as they do in production.
+
+Usage (from backend/):
+    python -m benchmarks.bench_api --graph grid --size 10000 --requests 500 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import sessionmaker
+from app.algorithms.snapshot import write_snapshot
+from app.api import router
+from app.core.config import settings
+from app.core.database import Base, create_db_engine, get_db
+from app.services import graph_service, history_writer, route_cache
+from .bench_algorithms import sample_queries
+from .graphs import GENERATORS
+from .results import environment, latency_summary, write_results
+
+# Algorithms of the /route/compare scenario
+COMPARE_ALGORITHMS = ["astar", "dijkstra", "bidirectional_dijkstra"]
+
+Scenario = Tuple[str, str, Callable[[int], Optional[Dict[str, Any]]]]
+
+
+def scenarios(pairs: List[Tuple[str, str]], compare_pairs: List[Tuple[str, str]]) -> Dict[str, Scenario]:
+    """Endpoint label -> (method, path, request body for the i-th request)"""
+    return {
+        "GET /health": ("GET", "/health", lambda i: None),
+        "POST /route/find": ("POST", "/route/find", lambda i: {
+            "start": pairs[i][0], "goal": pairs[i][1], "algorithm": "astar"
+        }),
+        "POST /route/compare": ("POST", "/route/compare", lambda i: {
+            "start": compare_pairs[i][0], "goal": compare_pairs[i][1], "algorithms": COMPARE_ALGORITHMS
+        }),
+        "GET /history": ("GET", "/history?limit=50&include_path=false", lambda i: None),
+    }
+
+
+def build_app() -> FastAPI:
+    """The API routes without the startup lifespan (the benchmark loads its own graph)"""
+    app = FastAPI()
+    app.include_router(router, prefix=settings.API_V1_PREFIX)
+    return app
+
+
+async def load_test(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    """Send `requests` requests from `concurrency` clients and summarize them"""
+    method, path, body = scenario
+    url = settings.API_V1_PREFIX + path
+    latencies: List[int] = []
+    errors = 0
+    next_request = iter(range(requests))
+
+    async def client_loop():
+        nonlocal errors
+        for i in next_request:
+            start = time.perf_counter_ns()
+            response = await client.request(method, url, json=body(i))
+            latencies.append(time.perf_counter_ns() - start)
+            errors += response.status_code >= 400
+
+    # One untimed request, so first-use setup is not charged to the scenario
+    await client.request(method, url, json=body(0))
+    started = time.perf_counter_ns()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = (time.perf_counter_ns() - started) / 1e9
+
+    return {
+        "endpoint": endpoint,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_us": latency_summary(latencies),
+    }
+
+
+async def _run_scenarios(app: FastAPI, selected: Dict[str, Scenario], requests: int, concurrency: int, verbose: bool):
+    rows = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint, scenario in selected.items():
+            row = await load_test(client, endpoint, scenario, requests, concurrency)
+            rows.append(row)
+            if verbose:
+                _print_row(row)
+    return rows
+
+
+def run(
+    graph_kind: str = "grid",
+    size: int = 10_000,
+    requests: int = 500,
+    concurrency: int = 16,
+    endpoints: Optional[List[str]] = None,
+    seed: int = 0,
+    verbose: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load-test the API on a synthetic graph.
+
+    Returns: {"api": one row per endpoint}
+    """
+    graph = GENERATORS[graph_kind](size, seed=seed)
+    selected = scenarios(sample_queries(graph, requests, seed=seed), sample_queries(graph, requests, seed=seed + 1))
+    if endpoints:
+        unknown = [e for e in endpoints if e not in selected]
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {unknown}")
+        selected = {e: selected[e] for e in endpoints}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        snapshot_file = os.path.join(scratch, "graph.bin")
+        write_snapshot(snapshot_file, graph)
+        # The load-tested endpoints do not use the contraction hierarchy, which is slow to build
+        ch_preprocess, settings.CH_PREPROCESS = settings.CH_PREPROCESS, False
+        try:
+            graph_service.load_snapshot(snapshot_file)
+        finally:
+            settings.CH_PREPROCESS = ch_preprocess
+        route_cache.clear()
+
+        engine = create_db_engine(f"sqlite:///{os.path.join(scratch, 'bench.db')}")
+        Base.metadata.create_all(bind=engine)
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def scratch_db():
+            db = sessions()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = build_app()
+        app.dependency_overrides[get_db] = scratch_db
+        if verbose:
+            print(f">> API on {graph_kind} graph, {graph.num_nodes} nodes: {requests} requests per endpoint, {concurrency} clients")
+        try:
+            rows = asyncio.run(_run_scenarios(app, selected, requests, concurrency, verbose))
+        finally:
+            history_writer.flush()
+            engine.dispose()
+    return {"api": rows}
+
+
+def _print_row(row: Dict[str, Any]):
+    latency = row["latency_us"]
+    print(
+        f"   {row['endpoint']:>20}  {row['throughput_rps']:>8.1f} req/s  p50={latency['p50'] / 1e3:>8.2f}ms  "
+        f"p90={latency['p90'] / 1e3:>8.2f}ms  p99={latency['p99'] / 1e3:>8.2f}ms  errors={row['errors']}"
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--api-graph", choices=sorted(GENERATORS), default="grid")
+    parser.add_argument("--api-size", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--endpoints", nargs="+", help="Only these scenarios, e.g. 'POST /route/find'")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.api_graph, args.api_size, args.requests, args.concurrency, args.endpoints, args.seed)
+    if args.output:
+        write_results(args.output, {"environment": environment(), **results})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Frontier data structure benchmark.
+
+Compares the heap/deque frontiers of BFS, UCS and Bidirectional search with
+the list-based frontiers they replaced (list.pop(0) and a full re-sort per
+expansion) on synthetic graphs of growing size.
+
+Usage (from backend/):
+    python -m benchmarks.bench_frontiers --graph random --sizes 10000 100000 1000000
+"""
+import argparse
+import time
+from typing import Callable, Dict, List, Tuple
+from app.algorithms import BFSAlgorithm, UCSAlgorithm, BidirectionalAlgorithm
+from app.algorithms.csr import CSRGraph
+from .graphs import GENERATORS
+
+
+def legacy_bfs(graph: CSRGraph, start: int, goal: int) -> int:
+    """BFS with a list frontier popped from the front"""
+    queue = [start]
+    visited = {start}
+    explored = 0
+    while queue:
+        state = queue.pop(0)
+        explored += 1
+        if state == goal:
+            return explored
+        for neighbor, _ in graph.neighbors(state):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return explored
+
+
+def legacy_ucs(graph: CSRGraph, start: int, goal: int) -> int:
+    """UCS with a list frontier re-sorted after every expansion"""
+    queue = [(start, 0)]
+    visited = set()
+    explored = 0
+    while queue:
+        state, cost = queue.pop(0)
+        if state in visited:
+            continue
+        visited.add(state)
+        explored += 1
+        if state == goal:
+            return explored
+        for neighbor, distance in graph.neighbors(state):
+            if neighbor not in visited:
+                queue.append((neighbor, cost + distance))
+        queue.sort(key=lambda x: x[1])
+    return explored
+
+
+def legacy_bidirectional(graph: CSRGraph, start: int, goal: int) -> int:
+    """Bidirectional BFS with list frontiers popped from the front"""
+    queues = [[start], [goal]]
+    visited = [{start}, {goal}]
+    explored = 0
+    while queues[0] and queues[1]:
+        for side in (0, 1):
+            state = queues[side].pop(0)
+            explored += 1
+            if state in visited[1 - side]:
+                return explored
+            for neighbor, _ in graph.neighbors(state):
+                if neighbor not in visited[side]:
+                    visited[side].add(neighbor)
+                    queues[side].append(neighbor)
+    return explored
+
+
+CASES: Dict[str, Tuple[type, Callable[[CSRGraph, int, int], int]]] = {
+    "bfs": (BFSAlgorithm, legacy_bfs),
+    "ucs": (UCSAlgorithm, legacy_ucs),
+    "bidirectional": (BidirectionalAlgorithm, legacy_bidirectional),
+}
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(graph_kind: str, sizes: List[int], legacy_max_nodes: int, seed: int) -> List[dict]:
+    rows = []
+    for size in sizes:
+        graph = GENERATORS[graph_kind](size, seed=seed)
+        # Far-apart endpoints so the search covers most of the graph
+        start, goal = 0, graph.num_nodes - 1
+
+        for name, (algo_class, legacy) in CASES.items():
+            algo = algo_class(graph)
+            new_time = _timed(lambda: algo._search(start, goal))
+            row = {
+                "graph": graph_kind,
+                "nodes": graph.num_nodes,
+                "algorithm": name,
+                "nodes_explored": algo.nodes_explored,
+                "time": new_time,
+                "legacy_time": None,
+            }
+            if graph.num_nodes <= legacy_max_nodes:
+                row["legacy_time"] = _timed(lambda: legacy(graph, start, goal))
+            rows.append(row)
+            _print_row(row)
+    return rows
+
+
+def _print_row(row: dict):
+    per_node = row["time"] / max(row["nodes_explored"], 1) * 1e6
+    legacy = "skipped" if row["legacy_time"] is None else f"{row['legacy_time']:9.3f}s"
+    speedup = "" if row["legacy_time"] is None else f"  x{row['legacy_time'] / row['time']:.1f}"
+    print(
+        f"{row['graph']:>7} {row['nodes']:>9} {row['algorithm']:>14} "
+        f"explored={row['nodes_explored']:>9}  new={row['time']:8.3f}s ({per_node:5.2f} us/node)  "
+        f"legacy={legacy}{speedup}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", choices=sorted(GENERATORS), default="random")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument(
+        "--legacy-max-nodes", type=int, default=20_000,
+        help="Skip the quadratic list-based frontiers above this graph size"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.graph, args.sizes, args.legacy_max_nodes, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Synthetic graph generators for benchmarks, built directly as CSR snapshots"""
+import networkx as nx
+import numpy as np
+from app.algorithms.csr import CSRGraph
+from app.algorithms.heuristics import HaversineHeuristic
+
+
+def _names(num_nodes: int):
+    # String names, as the API and graph snapshots expect
+    return [str(i) for i in range(num_nodes)]
+
+
+def grid_graph(num_nodes: int, seed: int = 0) -> CSRGraph:
+    """
+    Square grid with random edge weights, a rough stand-in for a road network.
+    Search frontiers on grids grow like O(sqrt(n)).
+    """
+    rng = np.random.default_rng(seed)
+    side = max(int(np.sqrt(num_nodes)), 2)
+    ids = np.arange(side * side).reshape(side, side)
+
+    sources = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    targets = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    weights = rng.uniform(1.0, 10.0, len(sources))
+
+    return CSRGraph.from_edges(_names(side * side), sources, targets, weights)
+
+
+def random_graph(num_nodes: int, degree: int = 4, seed: int = 0) -> CSRGraph:
+    """
+    Connected random graph: a random spanning path plus random extra edges.
+    Frontiers on such expander-like graphs grow like O(n).
+    """
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(num_nodes)
+    extra = num_nodes * max(degree // 2 - 1, 0)
+
+    sources = np.concatenate([order[:-1], rng.integers(0, num_nodes, extra)])
+    targets = np.concatenate([order[1:], rng.integers(0, num_nodes, extra)])
+    keep = sources != targets
+    weights = rng.uniform(1.0, 10.0, int(keep.sum()))
+
+    return CSRGraph.from_edges(_names(num_nodes), sources[keep], targets[keep], weights)
+
+
+def geometric_graph(num_nodes: int, degree: int = 6, seed: int = 0) -> CSRGraph:
+    """
+    Random geometric graph over coordinates in a 5 x 5 degree box: nodes
+    closer than a radius giving about `degree` neighbors are joined by roads
+    10-30% longer than the great-circle distance, so the haversine heuristic
+    applies. A snake through the grid cells keeps the graph connected.
+    """
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0.0, 1.0, (num_nodes, 2))
+    radius = np.sqrt(degree / (np.pi * num_nodes))
+    cells_per_side = max(int(1 / radius), 1)
+    cell_xy = np.minimum((points / (1 / cells_per_side)).astype(np.int64), cells_per_side - 1)
+    cell = cell_xy[:, 0] * cells_per_side + cell_xy[:, 1]
+
+    by_cell = np.argsort(cell, kind='stable')
+    starts = np.searchsorted(cell[by_cell], np.arange(cells_per_side * cells_per_side + 1))
+
+    # Pair each node with every node of its own and four neighboring cells (each cell pair once)
+    sources, targets = [], []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        cx, cy = cell_xy[:, 0] + dx, cell_xy[:, 1] + dy
+        valid = (cx < cells_per_side) & (cy >= 0) & (cy < cells_per_side)
+        nodes = np.flatnonzero(valid)
+        other = cx[valid] * cells_per_side + cy[valid]
+        counts = starts[other + 1] - starts[other]
+        source = np.repeat(nodes, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        target = by_cell[np.repeat(starts[other], counts) + offsets]
+        keep = source < target if (dx, dy) == (0, 0) else np.ones(len(source), dtype=bool)
+        sources.append(source[keep])
+        targets.append(target[keep])
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    close = np.hypot(*(points[sources] - points[targets]).T) < radius
+    sources, targets = sources[close], targets[close]
+
+    # Snake through the cells, column by column, alternating direction
+    column, row = cell_xy[:, 0], cell_xy[:, 1]
+    snake = np.lexsort((np.where(column % 2, -row, row), column))
+    sources = np.concatenate([sources, snake[:-1]])
+    targets = np.concatenate([targets, snake[1:]])
+
+    latitudes, longitudes = 25.0 + 5.0 * points[:, 0], 65.0 + 5.0 * points[:, 1]
+    lat, lon = np.radians(latitudes), np.radians(longitudes)
+    straight = HaversineHeuristic.distance(lat[sources], lon[sources], lat[targets], lon[targets])
+    weights = np.maximum(straight, 0.01) * rng.uniform(1.1, 1.3, len(sources))
+
+    return CSRGraph.from_edges(_names(num_nodes), sources, targets, weights, latitudes=latitudes, longitudes=longitudes)
+
+
+def scale_free_graph(num_nodes: int, degree: int = 4, seed: int = 0) -> CSRGraph:
+    """
+    Barabasi-Albert preferential attachment graph: a few hubs with very high
+    degree, like a network of highways between major cities.
+    """
+    rng = np.random.default_rng(seed)
+    G = nx.barabasi_albert_graph(num_nodes, max(degree // 2, 1), seed=seed)
+    edges = np.array(G.edges(), dtype=np.int64).reshape(-1, 2)
+    weights = rng.uniform(1.0, 10.0, len(edges))
+
+    return CSRGraph.from_edges(_names(num_nodes), edges[:, 0], edges[:, 1], weights)
+
+
+GENERATORS = {
+    "grid": grid_graph,
+    "random": random_graph,
+    "geometric": geometric_graph,
+    "scale_free": scale_free_graph,
+}
@@ -0,0 +1,113 @@
+"""Machine-readable benchmark results and regression checks against a stored baseline"""
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+# Fields that identify the same measurement across runs, per result section
+KEYS = {
+    "preprocessing": ("graph", "nodes"),
+    "algorithms": ("graph", "nodes", "algorithm"),
+    "api": ("endpoint",),
+}
+
+# (section, metric, getter, higher is better, absolute slack below which changes are noise, is a timing)
+CHECKS: List[Tuple[str, str, Callable[[dict], Optional[float]], bool, float, bool]] = [
+    ("preprocessing", "landmarks_ms", lambda r: r.get("landmarks_ms"), False, 5.0, True),
+    ("preprocessing", "ch_ms", lambda r: r.get("ch_ms"), False, 5.0, True),
+    ("preprocessing", "matrix_ms", lambda r: r.get("matrix_ms"), False, 5.0, True),
+    ("algorithms", "p50_us", lambda r: r["latency_us"]["p50"], False, 50.0, True),
+    ("algorithms", "p90_us", lambda r: r["latency_us"]["p90"], False, 50.0, True),
+    ("algorithms", "mean_nodes_explored", lambda r: r["nodes_explored"]["mean"], False, 1.0, False),
+    ("algorithms", "peak_memory_bytes", lambda r: r["peak_memory_bytes"], False, 64 * 1024, False),
+    ("api", "p50_us", lambda r: r["latency_us"]["p50"], False, 200.0, True),
+    ("api", "p90_us", lambda r: r["latency_us"]["p90"], False, 200.0, True),
+    ("api", "throughput_rps", lambda r: r["throughput_rps"], True, 5.0, True),
+]
+
+
+def latency_summary(samples_ns: List[int]) -> Dict[str, float]:
+    """Mean, percentiles and maximum of nanosecond samples, in microseconds"""
+    if not samples_ns:
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+    us = np.asarray(samples_ns, dtype=np.float64) / 1e3
+    p50, p90, p99 = np.percentile(us, [50, 90, 99])
+    return {
+        "mean": round(float(us.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p90": round(float(p90), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(us.max()), 3),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Where and when the results were measured"""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: str, results: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.5,
+    work_tolerance: float = 0.05
+) -> List[str]:
+    """
+    Regressions of `current` against `baseline`.
+
+    A metric regresses when it is worse by more than its relative tolerance
+    and by more than its absolute noise slack. Timings use `tolerance`;
+    nodes explored and peak memory do not depend on machine load, so they
+    use the much tighter `work_tolerance` and catch algorithmic regressions
+    even where timings are noisy. Only measurements in both runs are
+    compared, except that an algorithm missing from a graph the current run
+    did measure is reported.
+
+    Returns: one message per regression (empty when nothing regressed)
+    """
+    regressions = []
+    measured_graphs = {(row["graph"], row["nodes"]) for row in current.get("preprocessing", [])}
+    for section, fields in KEYS.items():
+        rows = {tuple(row[f] for f in fields): row for row in current.get(section, [])}
+        for old in baseline.get(section, []):
+            key = tuple(old[f] for f in fields)
+            label = f"{section} {'/'.join(str(k) for k in key)}"
+            new = rows.get(key)
+            if new is None:
+                if section == "algorithms" and key[:2] in measured_graphs:
+                    regressions.append(f"{label}: missing from the current run")
+                continue
+            for check_section, metric, get, higher_is_better, slack, timed in CHECKS:
+                if check_section != section:
+                    continue
+                allowed = tolerance if timed else work_tolerance
+                before, after = get(old), get(new)
+                if before is None or after is None:
+                    continue
+                change = (before - after) if higher_is_better else (after - before)
+                if change > slack and change > allowed * abs(before):
+                    ratio = f" ({after / before - 1:+.0%})" if before else ""
+                    regressions.append(f"{label}: {metric} {before:g} -> {after:g}{ratio}")
+    return regressions
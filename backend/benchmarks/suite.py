@@ -0,0 +1,69 @@
+"""
+Full benchmark suite: algorithms on every synthetic graph kind and size, then
+the API load test. Writes one JSON result file and compares it against a
+stored baseline; exits with status 1 when a metric regressed beyond the
+tolerance, so it can gate CI.
+
+Usage (from backend/):
+    python -m benchmarks.suite                      # compare against benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline      # record a new baseline on this machine
+    python -m benchmarks.suite --skip-api --sizes 1000
+"""
+import argparse
+import os
+import sys
+from . import bench_algorithms, bench_api
+from .results import compare, environment, load_results, write_results
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results", "latest.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    bench_algorithms.add_arguments(parser)
+    bench_api.add_arguments(parser)
+    parser.add_argument("--skip-api", action="store_true", help="Only benchmark the algorithms")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Result file (default: benchmarks/results/latest.json)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown of timings")
+    parser.add_argument("--work-tolerance", type=float, default=0.05, help="Allowed relative growth of nodes explored and peak memory")
+    args = parser.parse_args()
+
+    results = {
+        "environment": environment(),
+        **bench_algorithms.run(
+            args.graphs, args.sizes, args.algorithms, args.queries, args.memory_queries, args.repeats,
+            args.ch_max_nodes, args.matrix_max_nodes, args.seed
+        ),
+    }
+    if not args.skip_api:
+        results.update(bench_api.run(args.api_graph, args.api_size, args.requests, args.concurrency, seed=args.seed))
+
+    write_results(args.output, results)
+    print(f">> Results written to {args.output}")
+
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f">> Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f">> No baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+
+    baseline = load_results(args.baseline)
+    regressions = compare(results, baseline, tolerance=args.tolerance, work_tolerance=args.work_tolerance)
+    recorded = baseline.get("environment", {})
+    print(f">> Compared with baseline from {recorded.get('timestamp', 'unknown time')} on {recorded.get('platform', 'unknown platform')}")
+    if regressions:
+        print(f">> {len(regressions)} regressions:")
+        for regression in regressions:
+            print(f"   {regression}")
+        sys.exit(1)
+    print("✓ No regressions")
+
+
+if __name__ == "__main__":
+    main()
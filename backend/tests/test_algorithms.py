@@ -1,4 +1,8 @@
+import copy
+import random
 import pytest
+import numpy as np
+import pandas as pd
 import networkx as nx
 from app.algorithms import (
     BFSAlgorithm,
@@ -6,8 +10,27 @@ from app.algorithms import (
     UCSAlgorithm,
     AStarAlgorithm,
     DijkstraAlgorithm,
-    BidirectionalAlgorithm
+    BidirectionalAlgorithm,
+    BidirectionalDijkstraAlgorithm,
+    CHAlgorithm,
+    ContractionHierarchy,
+    MatrixAlgorithm,
+    DistanceMatrix,
+    LandmarkHeuristic,
+    CSRGraph,
+    ALGORITHMS,
+    one_to_many_distances,
+    many_to_many_distances,
+    KShortestPaths,
+    TrafficProfiles,
+    TimeDependentAStar,
+    build_heuristic,
+    read_snapshot,
+    write_snapshot,
 )
+from app.algorithms.base import reconstruct_path, join_paths
+from app.algorithms.csr import shortest_path_lengths
+from app.algorithms.dynamic import update_distances
 
 
 @pytest.fixture
@@ -105,6 +128,18 @@ class TestAStar:
         path, distance = algo.search('A', 'F')
         assert path is not None
 
+    def test_landmark_heuristic_is_optimal(self, complex_graph):
+        heuristic = LandmarkHeuristic.from_graph(complex_graph, num_landmarks=2)
+        for goal in complex_graph.nodes():
+            algo = AStarAlgorithm(complex_graph, heuristic=heuristic)
+            _, distance = algo.search('A', goal)
+            assert distance == DijkstraAlgorithm(complex_graph).search('A', goal)[1]
+
+    def test_no_path_raises_error(self, simple_graph):
+        algo = AStarAlgorithm(simple_graph)
+        with pytest.raises(Exception):
+            algo.search('A', 'Z')
+
 
 class TestDijkstra:
     def test_finds_optimal_path(self, simple_graph):
@@ -134,6 +169,431 @@ class TestBidirectional:
         assert distance == 0
 
 
+class TestBidirectionalDijkstra:
+    def test_finds_optimal_path(self, simple_graph):
+        algo = BidirectionalDijkstraAlgorithm(simple_graph)
+        path, distance = algo.search('A', 'D')
+        assert path == ['A', 'B', 'C', 'D']
+        assert distance == 4
+
+    def test_same_start_goal(self, simple_graph):
+        algo = BidirectionalDijkstraAlgorithm(simple_graph)
+        assert algo.search('A', 'A') == (['A'], 0)
+
+    def test_matches_dijkstra_on_all_pairs(self, complex_graph):
+        for start in complex_graph.nodes():
+            for goal in complex_graph.nodes():
+                _, expected = DijkstraAlgorithm(complex_graph).search(start, goal)
+                _, distance = BidirectionalDijkstraAlgorithm(complex_graph).search(start, goal)
+                assert distance == expected
+
+    def test_explores_fewer_nodes_than_dijkstra(self):
+        G = nx.grid_2d_graph(61, 61)
+        nx.set_edge_attributes(G, 1, 'distance')
+        one_way = DijkstraAlgorithm(G)
+        one_way.search((30, 10), (30, 50))
+        two_way = BidirectionalDijkstraAlgorithm(G)
+        _, distance = two_way.search((30, 10), (30, 50))
+        assert distance == 40
+        assert two_way.nodes_explored < 0.75 * one_way.nodes_explored
+
+    def test_no_path_raises_error(self, simple_graph):
+        G = simple_graph.copy()
+        G.add_edge('X', 'Y', distance=1)
+        with pytest.raises(Exception):
+            BidirectionalDijkstraAlgorithm(G).search('A', 'X')
+
+
+class TestContractionHierarchies:
+    def test_finds_optimal_path(self, simple_graph):
+        algo = CHAlgorithm(simple_graph)
+        path, distance = algo.search('A', 'D')
+        assert path == ['A', 'B', 'C', 'D']
+        assert distance == 4
+
+    def test_matches_dijkstra_with_real_paths(self):
+        G = nx.connected_watts_strogatz_graph(120, 4, 0.2, seed=3)
+        for i, (u, v) in enumerate(G.edges()):
+            G[u][v]['distance'] = 1 + (i * 37) % 11
+        hierarchy = ContractionHierarchy.build(G)
+        assert hierarchy.num_shortcuts > 0
+        for start in range(0, 120, 7):
+            for goal in range(0, 120, 5):
+                path, distance = CHAlgorithm(G, hierarchy=hierarchy).search(start, goal)
+                assert distance == DijkstraAlgorithm(G).search(start, goal)[1]
+                assert path[0] == start and path[-1] == goal
+                assert sum(G[u][v]['distance'] for u, v in zip(path, path[1:])) == distance
+
+    def test_dense_core_stays_exact(self):
+        G = nx.gnm_random_graph(80, 600, seed=5)
+        nx.set_edge_attributes(G, {e: 1 + sum(e) % 7 for e in G.edges()}, 'distance')
+        hierarchy = ContractionHierarchy.build(G, core_degree=4)
+        for goal in G.nodes():
+            if nx.has_path(G, 0, goal):
+                _, distance = CHAlgorithm(G, hierarchy=hierarchy).search(0, goal)
+                assert distance == nx.shortest_path_length(G, 0, goal, weight='distance')
+
+    def test_no_path_raises_error(self, simple_graph):
+        G = simple_graph.copy()
+        G.add_edge('X', 'Y', distance=1)
+        with pytest.raises(Exception):
+            CHAlgorithm(G).search('A', 'X')
+
+
+class TestDistanceMatrix:
+    def test_floyd_warshall_matches_dijkstra(self, complex_graph):
+        matrix = DistanceMatrix.floyd_warshall(complex_graph)
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        for start in complex_graph.nodes():
+            for goal in complex_graph.nodes():
+                i, j = snapshot.node_id(start), snapshot.node_id(goal)
+                expected = nx.shortest_path_length(complex_graph, start, goal, weight='distance')
+                assert matrix.distance(i, j) == expected
+                path = snapshot.to_names(matrix.path(i, j))
+                assert sum(complex_graph[u][v]['distance'] for u, v in zip(path, path[1:])) == expected
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_repeated_dijkstra_matches_floyd_warshall(self, workers):
+        G = nx.connected_watts_strogatz_graph(50, 4, 0.3, seed=1)
+        nx.set_edge_attributes(G, {e: 1 + (e[0] * 7 + e[1]) % 9 for e in G.edges()}, 'distance')
+        expected = DistanceMatrix.floyd_warshall(G)
+        matrix = DistanceMatrix.repeated_dijkstra(G, workers=workers, chunk_size=8)
+        assert (matrix.distances == expected.distances).all()
+        for goal in range(50):
+            path = matrix.path(0, goal)
+            assert path[0] == 0 and path[-1] == goal
+            assert sum(G[u][v]['distance'] for u, v in zip(path, path[1:])) == matrix.distance(0, goal)
+
+    def test_lookup_algorithm(self, simple_graph):
+        algo = MatrixAlgorithm(simple_graph)
+        path, distance = algo.search('A', 'D')
+        assert path == ['A', 'B', 'C', 'D']
+        assert distance == 4
+        assert algo.nodes_explored == len(path)
+
+    def test_unreachable(self, simple_graph):
+        G = simple_graph.copy()
+        G.add_edge('X', 'Y', distance=1)
+        with pytest.raises(Exception):
+            MatrixAlgorithm(G).search('A', 'X')
+
+
+class TestExecuteMany:
+    @pytest.mark.parametrize("algo_class", [BFSAlgorithm, UCSAlgorithm, DijkstraAlgorithm, AStarAlgorithm])
+    def test_matches_single_searches(self, complex_graph, algo_class):
+        goals = ['F', 'B', 'A', 'F', 'E']
+        results = algo_class(complex_graph).execute_many('A', goals)
+        assert len(results) == len(goals)
+        for goal, result in zip(goals, results):
+            single = algo_class(complex_graph).execute('A', goal)
+            assert result['path'] == single['path']
+            assert result['total_distance'] == single['total_distance']
+
+    def test_one_search_answers_all_goals(self, complex_graph):
+        results = DijkstraAlgorithm(complex_graph).execute_many('A', ['B', 'F'])
+        # Both goals share the search that settled F, the farther one
+        farthest = DijkstraAlgorithm(complex_graph).execute('A', 'F')
+        assert [r['nodes_explored'] for r in results] == [farthest['nodes_explored']] * 2
+
+    def test_unknown_goal_fails_alone(self, complex_graph):
+        results = DijkstraAlgorithm(complex_graph).execute_many('A', ['Z', 'D'])
+        assert not results[0]['success']
+        assert results[1]['success']
+
+
+class TestManyToMany:
+    def test_one_to_many_matches_networkx(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        targets = [snapshot.node_id(name) for name in ['F', 'A', 'D']]
+        distances = one_to_many_distances(snapshot, snapshot.node_id('A'), targets)
+        assert distances.tolist() == [
+            nx.shortest_path_length(complex_graph, 'A', name, weight='distance') for name in ['F', 'A', 'D']
+        ]
+
+    def test_unreachable_is_inf(self):
+        G = nx.Graph()
+        G.add_edge('A', 'B', distance=1)
+        G.add_node('C')
+        snapshot = CSRGraph.from_networkx(G)
+        assert one_to_many_distances(snapshot, 0, [1, 2]).tolist() == [1.0, float('inf')]
+
+    def test_matrix_slice_matches_search(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        sources, targets = [0, 3, 0], [5, 1]
+        searched = many_to_many_distances(snapshot, sources, targets)
+        sliced = many_to_many_distances(snapshot, sources, targets, DistanceMatrix.build(snapshot))
+        assert searched.shape == (3, 2)
+        assert (searched == sliced).all()
+
+
+class TestKShortestPaths:
+    def test_matches_networkx(self):
+        G = nx.grid_2d_graph(5, 5)
+        for i, (u, v) in enumerate(G.edges()):
+            G[u][v]['distance'] = 1 + (i * 7) % 5
+        snapshot = CSRGraph.from_networkx(G)
+        start, goal = (0, 0), (4, 4)
+
+        found = KShortestPaths(snapshot, snapshot.node_id(goal)).search(snapshot.node_id(start), 6)
+        expected = []
+        for path in nx.shortest_simple_paths(G, start, goal, weight='distance'):
+            expected.append(nx.path_weight(G, path, weight='distance'))
+            if len(expected) == 6:
+                break
+        assert [cost for _, cost in found] == expected
+        assert len({tuple(path) for path, _ in found}) == 6
+        for path, _ in found:
+            assert len(set(path)) == len(path)
+
+    def test_fewer_paths_than_requested(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        found = KShortestPaths(snapshot, snapshot.node_id('D')).search(snapshot.node_id('A'), 10)
+        assert [snapshot.node_name(v) for v in found[0][0]] == ['A', 'B', 'C', 'D']
+        assert [cost for _, cost in found] == [4, 5, 6, 11]
+
+    def test_unreachable_goal(self):
+        G = nx.Graph()
+        G.add_edge('A', 'B', distance=1)
+        G.add_node('C')
+        snapshot = CSRGraph.from_networkx(G)
+        assert KShortestPaths(snapshot, snapshot.node_id('C')).search(snapshot.node_id('A'), 3) == []
+
+
+class TestCSRGraph:
+    def test_round_trip(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        assert snapshot.num_nodes == complex_graph.number_of_nodes()
+        assert snapshot.num_edges == complex_graph.number_of_edges()
+        for u, v, data in complex_graph.edges(data=True):
+            assert snapshot.edge_weight(snapshot.node_id(u), snapshot.node_id(v)) == data['distance']
+            assert snapshot.edge_weight(snapshot.node_id(v), snapshot.node_id(u)) == data['distance']
+
+    def test_keeps_neighbor_order(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        for node in complex_graph.nodes():
+            neighbors = [snapshot.node_name(v) for v, _ in snapshot.neighbors(snapshot.node_id(node))]
+            assert neighbors == list(complex_graph[node])
+
+    def test_from_edges_matches_networkx(self, complex_graph):
+        expected = CSRGraph.from_networkx(complex_graph)
+        ids = expected.ids
+        edges = list(complex_graph.edges(data='distance'))
+        snapshot = CSRGraph.from_edges(
+            expected.names,
+            [ids[u] for u, _, _ in edges],
+            [ids[v] for _, v, _ in edges],
+            [w for _, _, w in edges],
+        )
+        assert snapshot.indptr.tolist() == expected.indptr.tolist()
+        assert snapshot.indices.tolist() == expected.indices.tolist()
+        assert snapshot.weights.tolist() == expected.weights.tolist()
+
+    def test_arrays_are_immutable(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        with pytest.raises(ValueError):
+            snapshot.weights[0] = 0
+
+    def test_algorithms_accept_snapshot(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        for name, algo_class in ALGORITHMS.items():
+            expected = algo_class(complex_graph).search('A', 'F')
+            assert algo_class(snapshot).search('A', 'F') == expected
+
+
+class TestEdgeChanges:
+    @pytest.fixture
+    def changed(self):
+        """A weighted grid and the same grid after one edge of each kind of change"""
+        G = nx.grid_2d_graph(8, 8)
+        for i, (u, v) in enumerate(G.edges()):
+            G[u][v]['distance'] = 1 + (i * 7) % 5
+        H = copy.deepcopy(G)
+        H.remove_edge((3, 3), (3, 4))
+        H[(5, 5)][(5, 6)]['distance'] = 20
+        H[(0, 0)][(0, 1)]['distance'] = 0.5
+        H.add_edge((0, 0), (7, 7), distance=4)
+
+        snapshot = CSRGraph.from_networkx(G)
+        ids = snapshot.node_id
+        changes = [
+            (ids((3, 3)), ids((3, 4)), G[(3, 3)][(3, 4)]['distance'], float('inf')),
+            (ids((5, 5)), ids((5, 6)), G[(5, 5)][(5, 6)]['distance'], 20.0),
+            (ids((0, 0)), ids((0, 1)), G[(0, 0)][(0, 1)]['distance'], 0.5),
+            (ids((0, 0)), ids((7, 7)), float('inf'), 4.0),
+        ]
+        return snapshot, snapshot.with_edge_changes((u, v, new) for u, v, _, new in changes), H, changes
+
+    def test_snapshot_matches_networkx(self, changed):
+        _, updated, H, _ = changed
+        expected = CSRGraph.from_networkx(H)
+        assert (updated.indptr == expected.indptr).all()
+        assert (updated.indices == expected.indices).all()
+        assert (updated.weights == expected.weights).all()
+
+    def test_distance_rows(self, changed):
+        snapshot, updated, _, changes = changed
+        for source in range(0, snapshot.num_nodes, 9):
+            repaired = update_distances(updated, source, shortest_path_lengths(snapshot, source), changes)
+            assert repaired.tolist() == shortest_path_lengths(updated, source).tolist()
+
+    def test_matrix_update(self, changed):
+        snapshot, updated, _, changes = changed
+        matrix = DistanceMatrix.build(snapshot).updated(updated, changes)
+        expected = DistanceMatrix.build(updated)
+        assert (matrix.distances == expected.distances).all()
+        for start in range(snapshot.num_nodes):
+            path = matrix.path(start, 7)
+            assert sum(updated.edge_weight(a, b) for a, b in zip(path, path[1:])) == expected.distance(start, 7)
+
+    def test_landmark_update(self, changed):
+        snapshot, updated, _, changes = changed
+        heuristic = LandmarkHeuristic.from_graph(snapshot, num_landmarks=4).updated(updated, changes)
+        for landmark, row in zip(heuristic.landmarks, heuristic.distances):
+            assert row.tolist() == shortest_path_lengths(updated, landmark).tolist()
+
+
+class TestTimeDependent:
+    def _profiles(self, snapshot, rows):
+        frame = pd.DataFrame(rows, columns=['city1', 'city2', 'bucket', 'speed'])
+        return TrafficProfiles.from_frame(snapshot, frame, buckets=24, default_speed=60.0)
+
+    def test_constant_speed_matches_static_route(self, complex_graph):
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        result = TimeDependentAStar(snapshot, TrafficProfiles.constant(snapshot, 60.0), 8.0).execute('A', 'F')
+        static = DijkstraAlgorithm(complex_graph).execute('A', 'F')
+        assert result['total_distance'] == static['total_distance']
+        assert result['travel_time'] == pytest.approx(static['total_distance'] / 60.0)
+        assert result['arrival_time'] == pytest.approx(8.0 + result['travel_time'])
+
+    def test_routes_around_rush_hour(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        # A-B-C-D is shortest, but B-C crawls between 08:00 and 10:00
+        profiles = self._profiles(snapshot, [('B', 'C', hour, 0.5) for hour in (8, 9)])
+        night = TimeDependentAStar(snapshot, profiles, 2.0).execute('A', 'D')
+        rush = TimeDependentAStar(snapshot, profiles, 8.0).execute('A', 'D')
+        assert night['path'] == ['A', 'B', 'C', 'D']
+        assert rush['path'] == ['A', 'C', 'D']
+        assert rush['total_distance'] == 5
+
+    def test_speed_changes_mid_edge(self):
+        G = nx.Graph()
+        G.add_edge('A', 'B', distance=60)
+        snapshot = CSRGraph.from_networkx(G)
+        profiles = self._profiles(snapshot, [('A', 'B', 1, 30.0)])
+        # 30 km in the first half hour at 60 km/h, then the remaining 30 km at 30 km/h
+        result = TimeDependentAStar(snapshot, profiles, 0.5).execute('A', 'B')
+        assert result['arrival_time'] == pytest.approx(2.0)
+
+    def test_astar_matches_dijkstra(self):
+        rng = random.Random(5)
+        G = nx.grid_2d_graph(12, 12)
+        for u, v in G.edges():
+            G[u][v]['distance'] = rng.uniform(1, 20)
+        snapshot = CSRGraph.from_networkx(G)
+        rows = [(u, v, bucket, rng.uniform(10, 90)) for u, v in list(G.edges())[::3] for bucket in range(24)]
+        profiles = self._profiles(snapshot, rows)
+        heuristic = build_heuristic(profiles.lower_bound_graph(snapshot))
+
+        for _ in range(10):
+            start, goal = rng.sample(list(G.nodes()), 2)
+            departure = rng.uniform(0, 24)
+            astar = TimeDependentAStar(snapshot, profiles, departure, heuristic).execute(start, goal)
+            dijkstra = TimeDependentAStar(snapshot, profiles, departure).execute(start, goal)
+            assert astar['travel_time'] == pytest.approx(dijkstra['travel_time'])
+            assert astar['nodes_explored'] <= dijkstra['nodes_explored']
+
+    def test_identical_profiles_are_stored_once(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        profiles = self._profiles(snapshot, [('A', 'B', 3, 20.0), ('C', 'D', 3, 20.0)])
+        assert len(profiles.speeds) == 2
+        assert profiles.num_profiled_edges == 4
+
+    def test_unknown_connection(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        with pytest.raises(ValueError, match="A - D does not exist"):
+            self._profiles(snapshot, [('A', 'D', 0, 20.0)])
+
+    def test_profiles_follow_edge_changes(self, simple_graph):
+        snapshot = CSRGraph.from_networkx(simple_graph)
+        profiles = self._profiles(snapshot, [('C', 'D', 0, 20.0)])
+        updated = snapshot.with_edge_changes([(snapshot.node_id('A'), snapshot.node_id('B'), np.inf)])
+        remapped = profiles.remap(snapshot, updated)
+        c, d = updated.node_id('C'), updated.node_id('D')
+        position = updated.indptr[c] + list(updated.indices[updated.indptr[c]:updated.indptr[c + 1]]).index(d)
+        assert remapped.speeds[remapped.profile_of[position], 0] == 20.0
+        assert remapped.num_profiled_edges == 2
+
+
+class TestSnapshot:
+    def test_round_trip(self, complex_graph, tmp_path):
+        complex_graph.nodes['A'].update(latitude=31.5, longitude=74.3, population=1000)
+        snapshot = CSRGraph.from_networkx(complex_graph)
+        landmarks = LandmarkHeuristic.from_graph(snapshot, num_landmarks=2)
+        write_snapshot(str(tmp_path / "graph.snap"), snapshot, landmarks)
+
+        loaded, loaded_landmarks = read_snapshot(str(tmp_path / "graph.snap"))
+        assert list(loaded.names) == snapshot.names
+        for name in ('indptr', 'indices', 'weights', 'populations'):
+            assert np.array_equal(getattr(loaded, name), getattr(snapshot, name), equal_nan=True)
+        assert loaded.is_connected()
+        assert loaded_landmarks.landmarks == landmarks.landmarks
+        assert np.array_equal(loaded_landmarks.distances, landmarks.distances)
+        assert AStarAlgorithm(loaded).execute('A', 'F')['total_distance'] == 13
+
+    def test_zero_copy_names(self, tmp_path):
+        G = nx.Graph()
+        for u, v in [('Zhob', 'Ämir'), ('Ämir', 'Bannu'), ('Bannu', 'Attock')]:
+            G.add_edge(u, v, distance=1)
+        G.add_node('Isolated')
+        write_snapshot(str(tmp_path / "graph.snap"), CSRGraph.from_networkx(G))
+
+        loaded, landmarks = read_snapshot(str(tmp_path / "graph.snap"))
+        assert landmarks is None
+        assert not loaded.is_connected()
+        assert not loaded.weights.flags.writeable
+        for node, name in enumerate(G.nodes()):
+            assert loaded.node_id(name) == node and loaded.node_name(node) == name
+        assert 'Quetta' not in loaded and 3 not in loaded
+        assert nx.utils.graphs_equal(loaded.to_networkx(), G)
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / "graph.snap"
+        path.write_bytes(b"city1,city2,distance\n" * 10)
+        with pytest.raises(ValueError, match="not a graph snapshot"):
+            read_snapshot(str(path))
+
+
+class TestPathReconstruction:
+    def test_reconstruct_path(self):
+        parents = {0: None, 1: 0, 2: 1, 3: 1}
+        assert reconstruct_path(parents, 2) == [0, 1, 2]
+        assert reconstruct_path(parents, 0) == [0]
+
+    def test_join_paths(self):
+        forward = {0: None, 1: 0, 2: 1}
+        backward = {5: None, 4: 5, 2: 4}
+        assert join_paths(forward, backward, 2) == [0, 1, 2, 4, 5]
+
+    def test_long_chain(self):
+        G = nx.path_graph(5000)
+        nx.set_edge_attributes(G, 1, 'distance')
+        for name, algo_class in ALGORITHMS.items():
+            if algo_class is MatrixAlgorithm:
+                # All-pairs tables are only built for small graphs
+                continue
+            path, distance = algo_class(G).search(0, 4999)
+            assert path == list(range(5000)), name
+            assert distance == 4999, name
+
+    def test_paths_follow_edges(self, complex_graph):
+        for name, algo_class in ALGORITHMS.items():
+            for goal in complex_graph.nodes():
+                path, distance = algo_class(complex_graph).search('A', goal)
+                assert path[0] == 'A' and path[-1] == goal
+                total = sum(complex_graph[u][v]['distance'] for u, v in zip(path, path[1:]))
+                assert total == distance, name
+
+
 class TestAlgorithmExecution:
     def test_execute_returns_metrics(self, simple_graph):
         algo = BFSAlgorithm(simple_graph)
@@ -148,6 +608,8 @@ class TestAlgorithmExecution:
 
         assert result['success'] is True
         assert result['execution_time'] >= 0
+        assert algo.execution_time_ns > 0
+        assert result['execution_time'] == algo.execution_time_ns / 1e9
 
     def test_execute_handles_errors(self, simple_graph):
         algo = BFSAlgorithm(simple_graph)
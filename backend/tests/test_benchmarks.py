@@ -0,0 +1,52 @@
+import copy
+import pytest
+from app.algorithms import ALGORITHMS
+from benchmarks import bench_algorithms
+from benchmarks.graphs import GENERATORS
+from benchmarks.results import compare, latency_summary
+
+
+@pytest.mark.parametrize("kind", sorted(GENERATORS))
+def test_generated_graphs_are_connected(kind):
+    graph = GENERATORS[kind](400, seed=1)
+    assert graph.num_nodes >= 400 * 0.95
+    assert graph.is_connected()
+    assert graph.names[0] == "0"
+    assert (graph.weights > 0).all()
+
+
+def test_latency_summary_is_in_microseconds():
+    summary = latency_summary([1_000 * i for i in range(1, 101)])
+    assert summary["p50"] == pytest.approx(50.5)
+    assert summary["max"] == 100.0
+
+
+class TestAlgorithmBenchmark:
+    @pytest.fixture(scope="class")
+    def results(self):
+        return bench_algorithms.run(["geometric"], [120], queries=4, memory_queries=1, repeats=1, verbose=False)
+
+    def test_every_algorithm_is_measured(self, results):
+        rows = results["algorithms"]
+        assert [row["algorithm"] for row in rows] == list(ALGORITHMS)
+        assert all(row["successes"] == row["queries"] == 4 for row in rows)
+        assert all(row["latency_us"]["p50"] > 0 for row in rows)
+        assert results["preprocessing"][0]["ch_ms"] is not None
+
+    def test_compare_flags_regressions(self, results):
+        assert compare(results, results) == []
+
+        slower = copy.deepcopy(results)
+        row = slower["algorithms"][0]
+        row["latency_us"]["p50"] = row["latency_us"]["p50"] * 3 + 1000
+        row["nodes_explored"]["mean"] = row["nodes_explored"]["mean"] * 2 + 10
+        regressions = compare(slower, results)
+        assert len(regressions) == 2
+        assert "p50_us" in regressions[0] and "mean_nodes_explored" in regressions[1]
+
+        # With timings ignored only the extra work is flagged
+        assert compare(slower, results, tolerance=float("inf")) == regressions[1:]
+
+        missing = copy.deepcopy(results)
+        missing["algorithms"].pop()
+        assert compare(missing, results) == [f"algorithms geometric/120/{list(ALGORITHMS)[-1]}: missing from the current run"]
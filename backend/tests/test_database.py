@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from sqlalchemy import event, insert
+from app.core import database
+from app.core.config import settings
+from app.models import SearchHistory
+from app.services.history_service import HistoryService
+
+
+class TestEngine:
+    def test_sqlite_file_runs_in_wal_mode(self, tmp_path):
+        engine = database.create_db_engine(f"sqlite:///{tmp_path / 'routes.db'}")
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert connection.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.SQLITE_BUSY_TIMEOUT * 1000
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        engine.dispose()
+
+    def test_in_memory_sqlite_keeps_default_pool(self):
+        engine = database.create_db_engine("sqlite://")
+        with engine.connect() as connection:
+            assert connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "memory"
+
+    def test_async_urls(self):
+        assert database.async_database_url("sqlite:///./routes.db") == "sqlite+aiosqlite:///./routes.db"
+        assert database.async_database_url("postgresql://u:p@db/routes") == "postgresql+asyncpg://u:p@db/routes"
+        assert database.async_database_url("postgresql+asyncpg://db/routes") == "postgresql+asyncpg://db/routes"
+        with pytest.raises(ValueError, match="No async driver"):
+            database.async_database_url("mssql://db/routes")
+
+    def test_sessions_check_out_connections_lazily(self):
+        checkouts = []
+
+        def count(*args):
+            checkouts.append(args)
+
+        event.listen(database.engine, "checkout", count)
+        try:
+            sessions = database.get_db()
+            next(sessions)
+            sessions.close()
+        finally:
+            event.remove(database.engine, "checkout", count)
+        assert checkouts == []
+
+
+class TestAsyncSessions:
+    def test_history_through_async_engine(self, tmp_path, monkeypatch):
+        pytest.importorskip("aiosqlite")
+        url = f"sqlite:///{tmp_path / 'routes.db'}"
+        engine = database.create_db_engine(url)
+        database.Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(insert(SearchHistory), [{
+                'start_city': 'A', 'goal_city': 'B', 'algorithm': 'astar', 'path': ['A', 'B'],
+                'total_distance': 1.0, 'execution_time': 0.001, 'nodes_explored': 2
+            }])
+        engine.dispose()
+
+        monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", url)
+        monkeypatch.setattr(settings, "DATABASE_ASYNC", True)
+
+        async def read():
+            sessions = database.get_async_db()
+            session = await sessions.__anext__()
+            try:
+                return await HistoryService().get_page_async(session, algorithm='astar')
+            finally:
+                await sessions.aclose()
+                await database.dispose_async_engine()
+
+        page = asyncio.run(read())
+        assert [(h['start_city'], h['path']) for h in page['items']] == [('A', ['A', 'B'])]
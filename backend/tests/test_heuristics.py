@@ -0,0 +1,94 @@
+import pickle
+import random
+import pytest
+import networkx as nx
+from app.algorithms import (
+    CSRGraph,
+    ZeroHeuristic,
+    HaversineHeuristic,
+    LandmarkHeuristic,
+    AStarAlgorithm,
+    build_heuristic,
+)
+
+
+@pytest.fixture
+def geo_graph():
+    """Random connected graph with coordinates and noisy road distances"""
+    rng = random.Random(7)
+    G = nx.connected_watts_strogatz_graph(60, 4, 0.3, seed=7)
+    G = nx.relabel_nodes(G, {n: f"C{n}" for n in G.nodes()})
+    for node in G.nodes():
+        G.nodes[node]['latitude'] = rng.uniform(24, 36)
+        G.nodes[node]['longitude'] = rng.uniform(61, 77)
+    for u, v in G.edges():
+        # Deliberately include roads shorter than the straight line
+        G[u][v]['distance'] = rng.uniform(20, 900)
+    return G
+
+
+def _assert_admissible(graph, heuristic):
+    snapshot = CSRGraph.from_networkx(graph)
+    for goal in list(graph.nodes())[:10]:
+        h = heuristic.bind(snapshot.node_id(goal))
+        exact = nx.single_source_dijkstra_path_length(graph, goal, weight='distance')
+        for node, dist in exact.items():
+            assert h(snapshot.node_id(node)) <= dist + 1e-6
+
+
+class TestHeuristics:
+    def test_zero_heuristic(self, geo_graph):
+        assert ZeroHeuristic().bind(0)(1) == 0.0
+
+    def test_haversine_is_admissible(self, geo_graph):
+        heuristic = HaversineHeuristic.from_graph(geo_graph)
+        assert 0 < heuristic.scale <= 1.0
+        _assert_admissible(geo_graph, heuristic)
+
+    def test_haversine_requires_all_coordinates(self, geo_graph):
+        del geo_graph.nodes['C3']['latitude']
+        assert HaversineHeuristic.from_graph(geo_graph) is None
+
+    def test_landmarks_are_admissible(self, geo_graph):
+        heuristic = LandmarkHeuristic.from_graph(geo_graph, num_landmarks=4)
+        assert len(heuristic.landmarks) == 4
+        _assert_admissible(geo_graph, heuristic)
+
+    def test_landmark_is_exact_at_landmark(self, geo_graph):
+        heuristic = LandmarkHeuristic.from_graph(geo_graph, num_landmarks=3)
+        snapshot = CSRGraph.from_networkx(geo_graph)
+        landmark = heuristic.landmarks[0]
+        exact = nx.single_source_dijkstra_path_length(geo_graph, snapshot.node_name(landmark), weight='distance')
+        h = heuristic.bind(landmark)
+        for node, dist in exact.items():
+            assert h(snapshot.node_id(node)) == pytest.approx(dist)
+
+    def test_astar_matches_dijkstra_and_explores_less(self, geo_graph):
+        snapshot = CSRGraph.from_networkx(geo_graph)
+        heuristic = build_heuristic(snapshot, num_landmarks=4)
+        informed, blind = 0, 0
+        for goal in list(geo_graph.nodes())[1:20]:
+            expected = nx.shortest_path_length(geo_graph, 'C0', goal, weight='distance')
+
+            algo = AStarAlgorithm(snapshot, heuristic=heuristic)
+            _, distance = algo.search('C0', goal)
+            assert distance == pytest.approx(expected)
+            informed += algo.nodes_explored
+
+            baseline = AStarAlgorithm(snapshot)
+            baseline.search('C0', goal)
+            blind += baseline.nodes_explored
+
+        assert informed < blind
+
+    def test_bound_estimates_match_vectors(self, geo_graph):
+        snapshot = CSRGraph.from_networkx(geo_graph)
+        heuristic = build_heuristic(snapshot, num_landmarks=4)
+        for goal in (0, 17, 42):
+            h = heuristic.bind(goal)
+            expected = heuristic.estimates(goal)
+            assert [h(node) for node in range(snapshot.num_nodes)] == pytest.approx(expected.tolist())
+        # Per-node lists are converted on first use and not shipped to worker processes
+        haversine, landmarks = heuristic.heuristics
+        assert haversine.__getstate__()['_lists'] is None and landmarks.__getstate__()['_node_rows'] is None
+        assert pickle.loads(pickle.dumps(heuristic)).bind(17)(3) == pytest.approx(heuristic.estimates(17)[3])
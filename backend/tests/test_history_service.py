@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import SearchHistory
+from app.services.history_retention import HistoryRetention
+from app.services.history_service import HistoryService
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _add(db, rows):
+    db.execute(insert(SearchHistory), [
+        {
+            'start_city': 'A',
+            'goal_city': 'B',
+            'path': ['A', 'B'],
+            'execution_time': 0.001,
+            'nodes_explored': 10,
+            **row
+        }
+        for row in rows
+    ])
+    db.commit()
+
+
+class TestHistoryPages:
+    def test_cursor_walks_every_row_once(self, db):
+        # Pairs of rows share a timestamp, so pages must break ties by id
+        _add(db, [
+            {'algorithm': 'astar', 'total_distance': 1.0, 'created_at': START + timedelta(seconds=i // 2)}
+            for i in range(7)
+        ])
+        service = HistoryService()
+
+        seen, cursor = [], None
+        while True:
+            page = service.get_page(db, limit=3, cursor=cursor)
+            seen += [item['id'] for item in page['items']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [7, 6, 5, 4, 3, 2, 1]
+
+    def test_filter_and_omitted_path(self, db):
+        _add(db, [
+            {'algorithm': 'astar', 'total_distance': 1.0, 'created_at': START},
+            {'algorithm': 'dijkstra', 'total_distance': 1.0, 'created_at': START},
+        ])
+        page = HistoryService().get_page(db, algorithm='dijkstra', include_path=False)
+        assert [item['algorithm'] for item in page['items']] == ['dijkstra']
+        assert 'path' not in page['items'][0]
+        assert page['next_cursor'] is None
+
+    def test_invalid_cursor(self, db):
+        with pytest.raises(ValueError, match="Invalid history cursor"):
+            HistoryService().get_page(db, cursor="not-a-cursor")
+
+
+class TestHistoryStats:
+    def test_stats_per_algorithm(self, db):
+        _add(db, [
+            {'algorithm': 'astar', 'total_distance': 5.0, 'created_at': START},
+            {'algorithm': 'greedy', 'total_distance': 7.0, 'created_at': START, 'nodes_explored': 4},
+            {'algorithm': 'greedy', 'total_distance': 5.0, 'created_at': START + timedelta(days=1), 'nodes_explored': 6},
+        ])
+        service = HistoryService()
+
+        stats = {s['algorithm']: s for s in service.get_stats(db)}
+        assert stats['astar']['searches'] == 1
+        assert stats['astar']['optimality_rate'] == 1.0
+        assert stats['greedy']['searches'] == 2
+        assert stats['greedy']['avg_distance'] == 6.0
+        assert stats['greedy']['avg_nodes_explored'] == 5.0
+        assert stats['greedy']['optimality_rate'] == 0.5
+
+        recent = service.get_stats(db, since=START + timedelta(hours=1))
+        assert [(s['algorithm'], s['searches']) for s in recent] == [('greedy', 1)]
+
+
+class TestHistoryRetention:
+    def _history(self, db):
+        # Two days past the 1-day window, one day inside it
+        _add(db, [
+            {'algorithm': 'astar', 'total_distance': 5.0, 'created_at': START},
+            {'algorithm': 'astar', 'total_distance': 7.0, 'created_at': START + timedelta(hours=5), 'nodes_explored': 20},
+            {'algorithm': 'astar', 'total_distance': 6.0, 'created_at': START + timedelta(days=1)},
+            {'algorithm': 'astar', 'total_distance': 5.0, 'created_at': START + timedelta(days=2, hours=1)},
+        ])
+
+    def test_old_rows_roll_into_daily_aggregates(self, db):
+        self._history(db)
+        retention = HistoryRetention(retention_days=1, batch_size=2)
+        now = START + timedelta(days=3, hours=12)
+
+        result = retention.compact(db.get_bind(), now=now)
+        assert result['compacted'] == 3
+        assert [h.created_at for h in db.query(SearchHistory)] == [START + timedelta(days=2, hours=1)]
+
+        daily = HistoryService().get_daily(db)
+        assert [(d['day'], d['searches'], d['avg_distance'], d['min_distance']) for d in daily] == [
+            ('2024-01-02', 1, 6.0, 6.0),
+            ('2024-01-01', 2, 6.0, 5.0),
+        ]
+        assert daily[1]['avg_nodes_explored'] == 15.0
+
+        # Late rows for a compacted day add to its aggregate
+        _add(db, [{'algorithm': 'astar', 'total_distance': 3.0, 'created_at': START + timedelta(hours=9)}])
+        retention.compact(db.get_bind(), now=now)
+        day = HistoryService().get_daily(db, until=START.date())[0]
+        assert (day['searches'], day['min_distance']) == (3, 3.0)
+
+    def test_compacted_rows_are_archived(self, db, tmp_path):
+        pytest.importorskip("pyarrow")
+        self._history(db)
+        retention = HistoryRetention(retention_days=1, archive_dir=str(tmp_path))
+
+        result = retention.compact(db.get_bind(), now=START + timedelta(days=3))
+        assert result['archive_files'] == 2
+        archived = pd.read_parquet(tmp_path / "day=2024-01-01")
+        assert sorted(archived['total_distance']) == [5.0, 7.0]
+        assert list(archived['path'][0]) == ['A', 'B']
+
+    def test_zero_retention_keeps_everything(self, db):
+        self._history(db)
+        result = HistoryRetention(retention_days=0).compact(db.get_bind(), now=START + timedelta(days=30))
+        assert result['compacted'] == 0
+        assert db.query(SearchHistory).count() == 4
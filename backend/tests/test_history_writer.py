@@ -0,0 +1,92 @@
+import threading
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import SearchHistory
+from app.services.history_writer import HistoryWriter
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _rows(count: int):
+    return [
+        {
+            'start_city': 'A',
+            'goal_city': f'B{i}',
+            'algorithm': 'astar',
+            'path': ['A', f'B{i}'],
+            'total_distance': 1.0,
+            'execution_time': 0.001,
+            'nodes_explored': 2
+        }
+        for i in range(count)
+    ]
+
+
+def _count(engine) -> int:
+    with sessionmaker(bind=engine)() as session:
+        return session.query(SearchHistory).count()
+
+
+class TestHistoryWriter:
+    def test_rows_are_written_in_batches(self, engine):
+        writer = HistoryWriter(queue_size=100, batch_size=4, flush_interval=5.0)
+        assert writer.submit(engine, _rows(10)) == 10
+        writer.flush()
+
+        assert _count(engine) == 10
+        stats = writer.get_stats()
+        assert (stats['written'], stats['backlog'], stats['dropped']) == (10, 0, 0)
+        assert stats['batches'] == 3
+        writer.shutdown()
+
+    def test_full_queue_drops_rows(self, engine):
+        writer = HistoryWriter(queue_size=2, batch_size=1, flush_interval=5.0)
+        writing, release = threading.Event(), threading.Event()
+
+        def block(*args):
+            writing.set()
+            release.wait(5)
+        event.listen(engine, "before_cursor_execute", block)
+
+        # The first row holds the writer thread inside its insert
+        writer.submit(engine, _rows(1))
+        assert writing.wait(5)
+        assert writer.submit(engine, _rows(3)) == 2
+        assert writer.get_stats()['backlog'] == 2
+        assert writer.get_stats()['dropped'] == 1
+
+        release.set()
+        writer.flush()
+        assert _count(engine) == 3
+        writer.shutdown()
+
+    def test_shutdown_writes_remaining_rows(self, engine):
+        writer = HistoryWriter(queue_size=100, batch_size=50, flush_interval=60.0)
+        writer.submit(engine, _rows(5))
+        writer.shutdown()
+        assert _count(engine) == 5
+
+        # A later submit starts a new writer thread
+        writer.submit(engine, _rows(1))
+        writer.shutdown()
+        assert _count(engine) == 6
+
+    def test_failed_writes_are_counted(self, engine):
+        writer = HistoryWriter(queue_size=100, batch_size=50, flush_interval=5.0)
+        writer.submit(engine, [{'start_city': 'A'}])
+        writer.flush()
+        assert writer.get_stats()['failed'] == 1
+        assert writer.get_stats()['written'] == 0
+        writer.shutdown()
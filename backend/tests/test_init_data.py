@@ -0,0 +1,93 @@
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.core.database import Base
+from app.models import City, Connection
+from app.utils.init_data import load_cities_from_csv, load_connections_from_csv
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def _count(db, model) -> int:
+    return db.scalar(select(func.count()).select_from(model))
+
+
+def _write_network(tmp_path, num_cities: int, num_edges: int, seed: int = 0):
+    """Random network CSVs; the edge list includes duplicates and reversed duplicates"""
+    rng = np.random.default_rng(seed)
+    cities = pd.DataFrame({
+        'city': [f"C{i}" for i in range(num_cities)],
+        'latitude': rng.uniform(24, 36, num_cities),
+        'longitude': rng.uniform(61, 75, num_cities),
+        'population': rng.integers(1000, 10 ** 6, num_cities),
+    })
+    ends = rng.integers(0, num_cities, (num_edges, 2))
+    ends = ends[ends[:, 0] != ends[:, 1]]
+    edges = pd.DataFrame({
+        'city1': [f"C{i}" for i in ends[:, 0]],
+        'city2': [f"C{i}" for i in ends[:, 1]],
+        'distance': rng.uniform(1, 100, len(ends)),
+    })
+    cities.to_csv(tmp_path / "cities.csv", index=False)
+    edges.to_csv(tmp_path / "connections.csv", index=False)
+    return cities, edges
+
+
+class TestBulkLoad:
+    def test_seeds_large_network_quickly(self, db, tmp_path):
+        _, edges = _write_network(tmp_path, 20000, 100000)
+        pairs = {frozenset(pair) for pair in zip(edges['city1'], edges['city2'])}
+
+        started = time.perf_counter()
+        assert load_cities_from_csv(db, str(tmp_path / "cities.csv")) == 20000
+        assert load_connections_from_csv(db, str(tmp_path / "connections.csv")) == 2 * len(pairs)
+        assert time.perf_counter() - started < 30
+
+        assert _count(db, Connection) == 2 * len(pairs)
+        # A second load finds everything already stored
+        assert load_connections_from_csv(db, str(tmp_path / "connections.csv")) == 0
+        assert _count(db, Connection) == 2 * len(pairs)
+
+    def test_last_row_per_pair_wins(self, db, tmp_path):
+        pd.DataFrame({'city': ['A', 'B', 'A'], 'latitude': [1.0, 2.0, 9.0], 'longitude': [1.0, 2.0, 9.0]}).to_csv(
+            tmp_path / "cities.csv", index=False
+        )
+        pd.DataFrame({'city1': ['A', 'B', 'A'], 'city2': ['B', 'A', 'X'], 'distance': [5.0, 7.0, 1.0]}).to_csv(
+            tmp_path / "connections.csv", index=False
+        )
+        assert load_cities_from_csv(db, str(tmp_path / "cities.csv")) == 2
+        assert load_connections_from_csv(db, str(tmp_path / "connections.csv")) == 2
+
+        a = db.scalars(select(City).where(City.name == 'A')).one()
+        assert (a.latitude, a.population) == (9.0, 0)
+        assert sorted(db.scalars(select(Connection.distance)).all()) == [7.0, 7.0]
+
+    def test_upsert_overwrites_stored_rows(self, db, tmp_path):
+        cities, edges = _write_network(tmp_path, 50, 200)
+        load_cities_from_csv(db, str(tmp_path / "cities.csv"))
+        load_connections_from_csv(db, str(tmp_path / "connections.csv"))
+        before = _count(db, Connection)
+
+        cities.assign(population=1).to_csv(tmp_path / "cities.csv", index=False)
+        edges.assign(distance=42.0).to_csv(tmp_path / "connections.csv", index=False)
+        assert load_cities_from_csv(db, str(tmp_path / "cities.csv"), upsert=True) == 0
+        assert load_connections_from_csv(db, str(tmp_path / "connections.csv"), upsert=True) == 0
+
+        assert _count(db, Connection) == before
+        assert set(db.scalars(select(City.population)).all()) == {1}
+        assert set(db.scalars(select(Connection.distance)).all()) == {42.0}
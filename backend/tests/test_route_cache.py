@@ -0,0 +1,92 @@
+import pytest
+from app.services.route_cache import RouteCache
+
+
+def _result(path):
+    return {
+        "algorithm": "DijkstraAlgorithm",
+        "path": path,
+        "total_distance": float(len(path)),
+        "nodes_explored": len(path),
+        "execution_time": 0.001,
+        "success": True,
+        "error": None,
+    }
+
+
+class TestRouteCache:
+    def test_hit_and_miss_counters(self):
+        cache = RouteCache(max_entries=10)
+        assert cache.get(1, 'A', 'B', 'dijkstra') is None
+        cache.put(1, 'A', 'B', 'dijkstra', _result(['A', 'B']))
+        assert cache.get(1, 'A', 'B', 'dijkstra')['path'] == ['A', 'B']
+        assert cache.get(1, 'A', 'B', 'bfs') is None
+
+        stats = cache.get_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 2
+        assert stats['entries'] == 1
+        assert stats['hit_rate'] == pytest.approx(1 / 3)
+
+    def test_lru_eviction(self):
+        cache = RouteCache(max_entries=2)
+        cache.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        cache.put(1, 'A', 'C', 'bfs', _result(['A', 'C']))
+        cache.get(1, 'A', 'B', 'bfs')
+        cache.put(1, 'A', 'D', 'bfs', _result(['A', 'D']))
+
+        assert cache.get(1, 'A', 'C', 'bfs') is None
+        assert cache.get(1, 'A', 'B', 'bfs') is not None
+        assert cache.get_stats()['evictions'] == 1
+
+    def test_memory_limit(self):
+        probe = RouteCache()
+        probe.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        entry_size = probe.get_stats()['memory_bytes']
+
+        cache = RouteCache(max_entries=100, max_bytes=int(entry_size * 2.5))
+        for goal in 'BCDE':
+            cache.put(1, 'A', goal, 'bfs', _result(['A', goal]))
+        stats = cache.get_stats()
+        assert stats['entries'] == 2
+        assert stats['memory_bytes'] <= stats['max_memory_bytes']
+
+    def test_new_graph_version_invalidates(self):
+        cache = RouteCache()
+        cache.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        assert cache.get(2, 'A', 'B', 'bfs') is None
+        assert cache.get_stats()['entries'] == 0
+        assert cache.get_stats()['graph_version'] == 2
+
+    def test_older_version_is_ignored(self):
+        cache = RouteCache()
+        cache.put(2, 'A', 'B', 'bfs', _result(['A', 'B']))
+        cache.put(1, 'A', 'C', 'bfs', _result(['A', 'C']))
+        assert cache.get(1, 'A', 'B', 'bfs') is None
+        assert cache.get(2, 'A', 'B', 'bfs') is not None
+        assert cache.get_stats()['entries'] == 1
+
+    def test_migrate_keeps_selected_entries(self):
+        cache = RouteCache()
+        cache.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        cache.put(1, 'A', 'C', 'bfs', _result(['A', 'X', 'C']))
+        kept = cache.migrate(1, 2, lambda algorithm, result: 'X' not in result['path'])
+        assert kept == 1
+        assert cache.get(2, 'A', 'B', 'bfs')['path'] == ['A', 'B']
+        assert cache.get(2, 'A', 'C', 'bfs') is None
+        assert cache.get_stats()['graph_version'] == 2
+
+    def test_returns_copies(self):
+        cache = RouteCache()
+        cache.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        hit = cache.get(1, 'A', 'B', 'bfs')
+        hit['is_fastest'] = True
+        hit['path'].append('C')
+        again = cache.get(1, 'A', 'B', 'bfs')
+        assert 'is_fastest' not in again
+        assert again['path'] == ['A', 'B']
+
+    def test_disabled(self):
+        cache = RouteCache(max_entries=0)
+        cache.put(1, 'A', 'B', 'bfs', _result(['A', 'B']))
+        assert cache.get(1, 'A', 'B', 'bfs') is None
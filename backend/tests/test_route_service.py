@@ -0,0 +1,414 @@
+import asyncio
+import io
+import sys
+import threading
+import pytest
+import numpy as np
+import networkx as nx
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.api.schemas import BatchRouteRequest
+from app.core.database import Base
+from app.models import SearchHistory
+from app.services import GraphService, HistoryWriter, route_cache
+from app.services.route_service import RouteService
+from app.services.tour_service import TourService
+from app.services.vrp_service import VRPService
+from app.utils.init_data import load_cities_from_csv, load_connections_from_csv
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """RouteService bound to a small freshly loaded graph"""
+    G = nx.grid_2d_graph(6, 6)
+    G = nx.relabel_nodes(G, {n: f"N{n[0]}_{n[1]}" for n in G.nodes()})
+    for i, (u, v) in enumerate(G.edges()):
+        G[u][v]['distance'] = 1 + (i * 7) % 5
+
+    graph_service = GraphService()
+    graph_service.graph = G
+    graph_service._build_search_structures()
+    monkeypatch.setattr(sys.modules[RouteService.__module__], "graph_service", graph_service)
+    writer = HistoryWriter(queue_size=100, batch_size=50, flush_interval=5.0)
+    monkeypatch.setattr(sys.modules[RouteService.__module__], "history_writer", writer)
+    route_cache.clear()
+    yield RouteService()
+    route_cache.clear()
+    writer.shutdown()
+
+
+@pytest.fixture
+def writer(service):
+    return sys.modules[RouteService.__module__].history_writer
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+class TestCompareAlgorithms:
+    def test_parallel_compare_matches_sequential(self, service):
+        sequential = service.compare_algorithms("N0_0", "N5_5")
+        route_cache.clear()
+        parallel = asyncio.run(service.compare_algorithms_async("N0_0", "N5_5"))
+
+        assert parallel['summary'] == sequential['summary']
+        for algo, result in sequential['results'].items():
+            assert parallel['results'][algo]['total_distance'] == result['total_distance']
+
+    def test_history_written_in_one_batch(self, service, writer, db):
+        algorithms = ["dijkstra", "astar", "ch", "bogus"]
+        result = asyncio.run(service.compare_algorithms_async("N0_0", "N5_5", algorithms, db))
+
+        assert result['summary'] == {'total_algorithms': 4, 'successful': 3, 'failed': 1}
+        assert "Unknown algorithm" in result['results']['bogus']['error']
+        writer.flush()
+        assert db.query(SearchHistory).count() == 3
+        assert writer.get_stats()['batches'] == 1
+
+    def test_compare_does_not_reuse_cached_timings(self, service):
+        version = sys.modules[RouteService.__module__].graph_service.get_context().version
+        stale = service.find_route("N0_0", "N5_5", "dfs")
+        stale['execution_time'] = 0.0
+
+        for compare in (service.compare_algorithms, service.compare_algorithms_async):
+            route_cache.put(version, "N0_0", "N5_5", "dfs", stale)
+            result = compare("N0_0", "N5_5", ["dfs", "dijkstra"])
+            result = asyncio.run(result) if asyncio.iscoroutine(result) else result
+            assert result['results']['dfs']['execution_time'] > 0.0
+            # Fresh results are still cached for later route lookups
+            assert route_cache.get(version, "N0_0", "N5_5", "dfs")['execution_time'] > 0.0
+
+    def test_invalid_city_is_rejected_once(self, service):
+        with pytest.raises(ValueError, match="not found"):
+            asyncio.run(service.compare_algorithms_async("Nowhere", "N5_5"))
+
+
+class TestAlternativeRoutes:
+    def test_alternatives_start_with_the_shortest_route(self, service):
+        result = asyncio.run(service.find_route_async("N0_0", "N5_5", "dijkstra", k=3))
+        alternatives = result['alternatives']
+        assert len(alternatives) == 3
+        assert alternatives[0]['total_distance'] == result['total_distance']
+        distances = [alt['total_distance'] for alt in alternatives]
+        assert distances == sorted(distances)
+        assert len({tuple(alt['path']) for alt in alternatives}) == 3
+
+    def test_sync_and_async_agree(self, service):
+        expected = service.find_route("N0_0", "N5_5", k=4)['alternatives']
+        assert asyncio.run(service.find_route_async("N0_0", "N5_5", k=4))['alternatives'] == expected
+
+    def test_cached_route_has_no_alternatives(self, service):
+        service.find_route("N0_0", "N5_5", k=3)
+        assert 'alternatives' not in service.find_route("N0_0", "N5_5")
+
+    def test_k_out_of_range(self, service):
+        with pytest.raises(ValueError, match="k must be between"):
+            service.find_route("N0_0", "N5_5", k=0)
+
+
+class TestEdgeUpdates:
+    @pytest.fixture
+    def graph_service(self, service):
+        return sys.modules[RouteService.__module__].graph_service
+
+    def test_routes_follow_the_update(self, service, graph_service):
+        before = service.find_route("N0_0", "N0_2", "dijkstra")
+        old_context = graph_service.get_context()
+
+        result = graph_service.update_edges([
+            {'action': 'update', 'city1': 'N0_0', 'city2': 'N0_1', 'distance': 100},
+            {'action': 'add', 'city1': 'N0_0', 'city2': 'N0_2', 'distance': 0.5},
+        ])
+        assert result['version'] == old_context.version + 1
+        assert result['changed_connections'] == 2
+
+        after = service.find_route("N0_0", "N0_2", "astar")
+        assert after['path'] == ["N0_0", "N0_2"]
+        assert after['total_distance'] == 0.5
+        # Searches holding the previous context still see the previous graph
+        assert old_context.execute("dijkstra", "N0_0", "N0_2")['total_distance'] == before['total_distance']
+
+        # The networkx view is rebuilt from the new snapshot only when asked for
+        assert graph_service.graph is None
+        assert graph_service.get_graph()['N0_0']['N0_1']['distance'] == 100
+        assert graph_service.get_graph().has_edge('N0_0', 'N0_2')
+
+    def test_unaffected_cached_routes_survive_closures(self, service, graph_service):
+        service.find_route("N0_0", "N0_1", "dijkstra")
+        service.find_route("N5_0", "N5_5", "dijkstra")
+        result = graph_service.update_edges([{'action': 'remove', 'city1': 'N0_0', 'city2': 'N0_1'}])
+        assert result['cache_entries_kept'] == 1
+        assert route_cache.get(result['version'], "N5_0", "N5_5", "dijkstra") is not None
+
+    def test_inexact_cached_routes_are_dropped(self, service, graph_service):
+        service.find_route("N5_0", "N5_5", "dijkstra")
+        service.find_route("N5_0", "N5_5", "dfs")
+        result = graph_service.update_edges([{'action': 'remove', 'city1': 'N0_0', 'city2': 'N0_1'}])
+        assert result['cache_entries_kept'] == 1
+        assert route_cache.get(result['version'], "N5_0", "N5_5", "dfs") is None
+
+    def test_hierarchy_is_rebuilt_in_the_background(self, service, graph_service, monkeypatch):
+        context_module = sys.modules[graph_service.get_context().__module__]
+        build = context_module.ContractionHierarchy.build
+        release = threading.Event()
+        builds = []
+
+        def blocking_build(graph):
+            builds.append(graph)
+            release.wait(5)
+            return build(graph)
+
+        graph_service.get_context().get_hierarchy()
+        monkeypatch.setattr(context_module.ContractionHierarchy, "build", blocking_build)
+        graph_service.update_edges([{'action': 'remove', 'city1': 'N0_0', 'city2': 'N0_1'}])
+        context = graph_service.get_context()
+
+        # Queries during the contraction stay exact without waiting for it
+        pending = service.find_route("N0_0", "N0_1", "ch")
+        assert pending['algorithm'] == "BidirectionalDijkstraAlgorithm"
+        assert pending['total_distance'] == context.execute("dijkstra", "N0_0", "N0_1")['total_distance']
+
+        release.set()
+        context._hierarchy_thread.join(5)
+        assert context.hierarchy is not None and not context.hierarchy_pending
+        assert len(builds) == 1
+        assert context.execute("ch", "N0_0", "N0_1")['algorithm'] == "CHAlgorithm"
+
+    def test_invalid_batch_changes_nothing(self, service, graph_service):
+        version = graph_service.get_version()
+        with pytest.raises(ValueError, match="does not exist"):
+            graph_service.update_edges([
+                {'action': 'remove', 'city1': 'N0_0', 'city2': 'N0_1'},
+                {'action': 'update', 'city1': 'N0_0', 'city2': 'N5_5', 'distance': 3},
+            ])
+        assert graph_service.get_version() == version
+        assert graph_service.get_graph().has_edge('N0_0', 'N0_1')
+
+
+class TestTimeDependentRoutes:
+    @pytest.fixture
+    def graph_service(self, service):
+        return sys.modules[RouteService.__module__].graph_service
+
+    def test_default_speed_without_profiles(self, service):
+        result = asyncio.run(service.find_route_async("N0_0", "N5_5", departure_time=8.0))
+        assert result['travel_time'] == pytest.approx(result['total_distance'] / 60.0)
+        assert 'departure_time' not in service.find_route("N0_0", "N5_5")
+
+    def test_loaded_profiles_slow_routes_down(self, service, graph_service):
+        static = service.find_route("N0_0", "N0_5", "dijkstra")
+        rows = "\n".join(
+            f"{a},{b},{bucket},10" for a, b in zip(static['path'], static['path'][1:]) for bucket in range(32, 40)
+        )
+        loaded = graph_service.load_traffic(io.StringIO("city1,city2,bucket,speed\n" + rows))
+        assert loaded['profiled_edges'] == 2 * (len(static['path']) - 1)
+        # Static routes survive a profile load
+        assert route_cache.get(loaded['version'], "N0_0", "N0_5", "dijkstra") is not None
+
+        night = asyncio.run(service.find_route_async("N0_0", "N0_5", "astar", departure_time=2.0))
+        rush = asyncio.run(service.find_route_async("N0_0", "N0_5", "astar", departure_time=8.0))
+        assert night['travel_time'] == pytest.approx(static['total_distance'] / 60.0)
+        assert rush['travel_time'] > night['travel_time']
+
+    def test_unsupported_combinations(self, service):
+        with pytest.raises(ValueError, match="Departure times are supported by"):
+            asyncio.run(service.find_route_async("N0_0", "N5_5", "bfs", departure_time=8.0))
+        with pytest.raises(ValueError, match="not available with a departure time"):
+            service.find_route("N0_0", "N5_5", k=2, departure_time=8.0)
+
+    def test_missing_columns(self, graph_service):
+        with pytest.raises(ValueError, match="missing columns"):
+            graph_service.load_traffic(io.StringIO("city1,city2,speed\nN0_0,N0_1,10\n"))
+
+
+class TestGraphSnapshots:
+    def test_snapshot_serves_the_same_graph(self, service, tmp_path):
+        graph_service = sys.modules[RouteService.__module__].graph_service
+        graph_service.save_snapshot(str(tmp_path / "graph.snap"))
+
+        loaded = GraphService()
+        loaded.load_snapshot(str(tmp_path / "graph.snap"))
+        assert loaded.get_cities() == graph_service.get_cities()
+        assert loaded.get_graph_stats() == graph_service.get_graph_stats()
+        assert loaded.get_city_info("N2_3") == graph_service.get_city_info("N2_3")
+        assert loaded.get_city_info("Nowhere") is None
+        for algorithm in ("astar", "ch", "matrix"):
+            route = loaded.get_context().execute(algorithm, "N0_0", "N5_5")
+            assert route['total_distance'] == service.find_route("N0_0", "N5_5", algorithm)['total_distance']
+
+        # The networkx graph is only built for edge updates
+        assert loaded.graph is None
+        loaded.update_edges([{'action': 'remove', 'city1': 'N0_0', 'city2': 'N0_1'}])
+        assert not loaded.get_graph().has_edge('N0_0', 'N0_1')
+
+
+class TestDatabaseLoad:
+    def test_matches_csv_load(self, db, tmp_path):
+        rng = np.random.default_rng(3)
+        cities = [f"City{i}" for i in range(40)]
+        ends = rng.integers(0, 40, (150, 2))
+        pairs = list(dict.fromkeys(tuple(sorted(pair)) for pair in ends.tolist() if pair[0] != pair[1]))
+        with open(tmp_path / "connections.csv", "w") as f:
+            f.write("city1,city2,distance\n")
+            f.writelines(f"{cities[a]},{cities[b]},{rng.uniform(1, 50):.3f}\n" for a, b in pairs)
+        with open(tmp_path / "cities.csv", "w") as f:
+            f.write("city,latitude,longitude,population\n")
+            f.writelines(f"{city},{30 + i / 10},{70 + i / 10},{1000 * i}\n" for i, city in enumerate(cities))
+
+        load_cities_from_csv(db, str(tmp_path / "cities.csv"))
+        load_connections_from_csv(db, str(tmp_path / "connections.csv"))
+        from_csv = GraphService()
+        from_csv.load_from_csv(str(tmp_path / "connections.csv"), str(tmp_path / "cities.csv"))
+        from_db = GraphService()
+        queries = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: queries.append(args[2]))
+        snapshot = from_db.load_from_database(db)
+
+        assert len(queries) == 2
+        expected = from_csv.get_snapshot()
+        assert snapshot.names == expected.names
+        for name in ('indptr', 'indices', 'weights', 'latitudes', 'populations'):
+            assert np.array_equal(getattr(snapshot, name), getattr(expected, name), equal_nan=True)
+        assert from_db.get_city_info(cities[5]) == from_csv.get_city_info(cities[5])
+
+    def test_empty_database(self, db):
+        loaded = GraphService()
+        snapshot = loaded.load_from_database(db)
+        assert snapshot.num_nodes == 0
+        assert loaded.get_graph_stats() == {
+            'total_cities': 0, 'total_connections': 0, 'average_connections': 0, 'is_connected': False
+        }
+
+    def test_cities_without_connections(self, db, tmp_path):
+        with open(tmp_path / "cities.csv", "w") as f:
+            f.write("city,latitude,longitude,population\nLahore,31.5,74.3,11000000\n")
+        load_cities_from_csv(db, str(tmp_path / "cities.csv"))
+        loaded = GraphService()
+        snapshot = loaded.load_from_database(db)
+        assert snapshot.num_nodes == 0
+        assert loaded.get_graph_stats()['average_connections'] == 0
+
+
+class TestBatchRoutes:
+    def _collect(self, service, routes, db=None):
+        async def collect():
+            return [result async for result in service.find_routes_batch(routes, db)]
+        return asyncio.run(collect())
+
+    def test_results_cover_every_request(self, service, writer, db):
+        routes = [
+            ("N0_0", "N5_5", "dijkstra"),
+            ("N0_0", "N3_2", "dijkstra"),
+            ("N0_0", "N5_5", "astar"),
+            ("N2_2", "N0_0", "ucs"),
+            ("Nowhere", "N0_0", "dijkstra"),
+        ]
+        results = self._collect(service, routes, db)
+
+        by_index = {result['index']: result for result in results}
+        assert sorted(by_index) == list(range(len(routes)))
+        assert not by_index[4]['success']
+        for index, (start, goal, algorithm) in enumerate(routes[:4]):
+            expected = service.find_route(start, goal, algorithm)
+            assert by_index[index]['total_distance'] == expected['total_distance']
+
+        writer.flush()
+        assert db.query(SearchHistory).count() == 4
+        assert writer.get_stats()['batches'] == 1
+
+    @pytest.mark.parametrize("option", [{'k': 3}, {'departure_time': 8.0}])
+    def test_batch_items_reject_single_route_options(self, option):
+        route = {'start': "N0_0", 'goal': "N5_5", 'algorithm': "dijkstra"}
+        assert BatchRouteRequest(routes=[route]).routes[0].algorithm == "dijkstra"
+        with pytest.raises(ValidationError, match="Extra inputs are not permitted"):
+            BatchRouteRequest(routes=[{**route, **option}])
+
+    def test_requests_sharing_a_source_share_one_search(self, service):
+        routes = [("N0_0", goal, "dijkstra") for goal in ("N1_1", "N5_5", "N2_4")]
+        results = self._collect(service, routes)
+        assert len({result['nodes_explored'] for result in results}) == 1
+
+    def test_graph_not_initialized(self, service, monkeypatch):
+        monkeypatch.setattr(sys.modules[RouteService.__module__].graph_service, "context", None)
+        with pytest.raises(ValueError):
+            service.find_routes_batch([("A", "B", "bfs")])
+
+
+class TestDistanceMatrix:
+    def _expected(self, graph, origins, destinations):
+        return np.array([
+            [nx.shortest_path_length(graph, o, d, weight='distance') for d in destinations]
+            for o in origins
+        ])
+
+    @pytest.mark.parametrize("precomputed", [True, False])
+    def test_matches_networkx(self, service, monkeypatch, precomputed):
+        graph_service = sys.modules[RouteService.__module__].graph_service
+        if not precomputed:
+            monkeypatch.setattr(graph_service.get_context(), "matrix", None)
+        origins = ["N0_0", "N3_3", "N0_0", "N5_1"]
+        destinations = ["N5_5", "N0_0", "N2_4"]
+
+        distances = asyncio.run(service.distance_matrix(origins, destinations))
+        assert distances.shape == (4, 3)
+        np.testing.assert_allclose(distances, self._expected(graph_service.get_graph(), origins, destinations))
+
+    def test_unknown_city(self, service):
+        with pytest.raises(ValueError, match="Nowhere"):
+            asyncio.run(service.distance_matrix(["N0_0", "Nowhere"]))
+
+
+class TestTourService:
+    def test_tour_path_follows_ordered_stops(self, service):
+        stops = ["N0_0", "N5_5", "N0_5", "N5_0", "N2_3"]
+        tour = asyncio.run(TourService().optimize_tour(stops, start="N2_3"))
+
+        assert tour['stops'][0] == "N2_3"
+        assert sorted(tour['stops']) == sorted(stops)
+        assert tour['path'][0] == tour['path'][-1] == "N2_3"
+        assert tour['total_distance'] == pytest.approx(sum(leg['distance'] for leg in tour['legs']))
+        positions = [tour['path'].index(stop) for stop in tour['stops']]
+        assert positions == sorted(positions)
+
+    def test_single_stop_is_rejected(self, service):
+        with pytest.raises(ValueError):
+            asyncio.run(TourService().optimize_tour(["N0_0", "N0_0"]))
+
+
+class TestVRPService:
+    def test_plan_serves_deliveries_by_city(self, service):
+        vehicles = [
+            {'id': 'north', 'depot': 'N0_0', 'capacity': 4},
+            {'id': 'south', 'depot': 'N5_5', 'capacity': 4},
+        ]
+        cities = ["N0_3", "N1_1", "N4_4", "N5_2", "N3_5", "N2_0"]
+        deliveries = [
+            {'city': city, 'demand': 1, 'ready': 0, 'due': None, 'service_time': 0}
+            for city in cities
+        ]
+        plan = asyncio.run(VRPService().solve(vehicles, deliveries, speed=1.0, time_budget=0.5))
+
+        assert plan['unassigned'] == []
+        assert sorted(stop['city'] for route in plan['routes'] for stop in route['stops']) == sorted(cities)
+        for route in plan['routes']:
+            assert route['load'] <= 4
+            assert route['path'][0] == route['path'][-1] == route['depot']
+
+    def test_unknown_depot(self, service):
+        with pytest.raises(ValueError, match="Nowhere"):
+            asyncio.run(VRPService().solve(
+                [{'id': 'v', 'depot': 'Nowhere', 'capacity': 1}],
+                [{'city': 'N0_0', 'demand': 1, 'ready': 0, 'due': None, 'service_time': 0}]
+            ))
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+import pytest
+import networkx as nx
+from app.algorithms import CSRGraph
+from app.services.search_context import SearchContext
+from app.services.search_executor import SearchExecutor, SearchRejectedError, SearchTimeoutError
+
+
+@pytest.fixture
+def context():
+    G = nx.Graph()
+    for u, v, w in [('A', 'B', 1), ('B', 'C', 2), ('A', 'C', 4), ('C', 'D', 1)]:
+        G.add_edge(u, v, distance=w)
+    return SearchContext(version=1, graph=CSRGraph.from_networkx(G))
+
+
+class SlowContext(SearchContext):
+    """Context with a search that takes a while, to keep a process pool busy"""
+
+    def slow_execute(self, seconds, algorithm, start, goal):
+        time.sleep(seconds)
+        return self.execute(algorithm, start, goal)
+
+
+class BlockingContext(SearchContext):
+    """Context whose searches wait until released, to hold worker slots"""
+
+    def __init__(self, base: SearchContext):
+        super().__init__(base.version, base.graph)
+        self.release = threading.Event()
+
+    def execute(self, algorithm, start, goal):
+        self.release.wait(5)
+        return super().execute(algorithm, start, goal)
+
+
+class TestSearchExecutor:
+    def test_thread_mode_runs_search(self, context):
+        executor = SearchExecutor(mode="thread", max_workers=2)
+        try:
+            result = asyncio.run(executor.run(context, "dijkstra", "A", "D"))
+            assert result['success']
+            assert result['path'] == ['A', 'B', 'C', 'D']
+            assert executor.get_stats()['pending'] == 0
+        finally:
+            executor.shutdown()
+
+    def test_process_mode_runs_search(self, context):
+        executor = SearchExecutor(mode="process", max_workers=1)
+        try:
+            result = asyncio.run(executor.run(context, "ucs", "A", "D"))
+            assert result['total_distance'] == 4
+        finally:
+            executor.shutdown()
+
+    def test_process_pools_follow_versions_without_thrashing(self, context):
+        older = SlowContext(context.version, context.graph)
+        newer = context.with_edge_changes([(0, 2, 4.0, float('inf'))])
+        executor = SearchExecutor(mode="process", max_workers=2)
+        try:
+            old_search = executor._submit(older, "slow_execute", 0.5, "dijkstra", "A", "D")
+            new_search = executor.submit(newer, "dijkstra", "A", "D")
+            # The older pool still has a search in flight, so it is reused rather than replaced
+            old_pool = executor._pools[(older.version, 0)]
+            another_old = executor.submit(older, "dijkstra", "A", "D")
+            assert executor._pools[(older.version, 0)] is old_pool and len(executor._pools) == 2
+            assert old_search.result(30)['total_distance'] == another_old.result(30)['total_distance'] == 4
+            assert new_search.result(30)['total_distance'] == 4
+
+            deadline = time.monotonic() + 5
+            while len(executor._pools) > 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert list(executor._pools) == [(newer.version, 0)]
+        finally:
+            executor.shutdown()
+
+    def test_process_workers_receive_the_built_hierarchy(self, context):
+        executor = SearchExecutor(mode="process", max_workers=1)
+        try:
+            first = asyncio.run(executor.run(context, "ch", "A", "D"))
+            assert first['total_distance'] == 4
+            # The hierarchy is contracted once here, never in the workers
+            context._hierarchy_thread.join(5)
+            assert context.hierarchy is not None
+            result = asyncio.run(executor.run(context, "ch", "A", "D"))
+            assert result['algorithm'] == "CHAlgorithm" and result['total_distance'] == 4
+            assert (context.version, 2) in executor._pools
+        finally:
+            executor.shutdown()
+
+    def test_thread_mode_sends_process_calls_to_a_process_pool(self, context):
+        executor = SearchExecutor(mode="thread", max_workers=2)
+        try:
+            distances = asyncio.run(executor.call_in_processes(context, "distances", [0, 3], [3]))
+            assert distances.tolist() == [[4.0], [0.0]]
+            assert list(executor._pools) == [(context.version, 0)]
+            assert asyncio.run(executor.run(context, "dijkstra", "A", "D"))['success']
+            assert set(executor._pools) == {None, (context.version, 0)}
+        finally:
+            executor.shutdown()
+
+    def test_rejects_when_saturated(self, context):
+        blocking = BlockingContext(context)
+        executor = SearchExecutor(mode="thread", max_workers=1, queue_size=1)
+        try:
+            first = executor.submit(blocking, "bfs", "A", "D")
+            second = executor.submit(blocking, "bfs", "A", "D")
+            with pytest.raises(SearchRejectedError):
+                executor.submit(blocking, "bfs", "A", "D")
+            assert executor.get_stats()['rejected'] == 1
+
+            blocking.release.set()
+            assert first.result(5)['success'] and second.result(5)['success']
+            assert executor.get_stats()['pending'] == 0
+        finally:
+            blocking.release.set()
+            executor.shutdown()
+
+    def test_timeout_keeps_slot_until_worker_finishes(self, context):
+        blocking = BlockingContext(context)
+        executor = SearchExecutor(mode="thread", max_workers=1, queue_size=0, timeout=0.05)
+        try:
+            with pytest.raises(SearchTimeoutError):
+                asyncio.run(executor.run(blocking, "bfs", "A", "D"))
+            # The search is still running, so there is no capacity for another
+            with pytest.raises(SearchRejectedError):
+                executor.submit(blocking, "bfs", "A", "D")
+            assert executor.get_stats()['timed_out'] == 1
+        finally:
+            blocking.release.set()
+            executor.shutdown()
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            SearchExecutor(mode="fibers")
@@ -0,0 +1,63 @@
+import itertools
+import time
+import numpy as np
+import pytest
+from app.algorithms import optimize_tour, nearest_neighbor_tour, tour_length
+
+
+def _points_matrix(n, seed):
+    points = np.random.default_rng(seed).random((n, 2))
+    return np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+
+
+def _brute_force(distances, return_to_start):
+    n = len(distances)
+    return min(
+        tour_length(distances, [0, *rest], return_to_start)
+        for rest in itertools.permutations(range(1, n))
+    )
+
+
+class TestTourOptimization:
+    @pytest.mark.parametrize("return_to_start", [True, False])
+    def test_visits_every_stop_once_from_start(self, return_to_start):
+        distances = _points_matrix(40, seed=1)
+        order, length, _ = optimize_tour(distances, start=5, return_to_start=return_to_start)
+        assert order[0] == 5
+        assert sorted(order) == list(range(40))
+        assert length == pytest.approx(tour_length(distances, order, return_to_start))
+
+    @pytest.mark.parametrize("return_to_start", [True, False])
+    def test_improves_on_nearest_neighbor(self, return_to_start):
+        distances = _points_matrix(100, seed=2)
+        greedy = tour_length(distances, nearest_neighbor_tour(distances), return_to_start)
+        _, length, stats = optimize_tour(distances, return_to_start=return_to_start)
+        assert stats['initial_distance'] == pytest.approx(greedy)
+        assert length < greedy
+
+    @pytest.mark.parametrize("return_to_start", [True, False])
+    def test_near_optimal_on_small_instances(self, return_to_start):
+        for seed in range(10):
+            distances = _points_matrix(7, seed=seed)
+            _, length, _ = optimize_tour(distances, return_to_start=return_to_start)
+            assert length <= _brute_force(distances, return_to_start) * 1.05
+
+    def test_two_stops(self):
+        order, length, _ = optimize_tour(np.array([[0.0, 3.0], [3.0, 0.0]]))
+        assert order == [0, 1]
+        assert length == 6.0
+
+    def test_200_stops_well_under_a_second(self):
+        distances = _points_matrix(200, seed=3)
+        started = time.perf_counter()
+        _, _, stats = optimize_tour(distances, time_budget=5.0)
+        assert time.perf_counter() - started < 1.0
+        assert not stats['timed_out']
+
+    def test_time_budget_is_respected(self):
+        distances = _points_matrix(300, seed=4)
+        started = time.perf_counter()
+        order, _, stats = optimize_tour(distances, time_budget=0.0)
+        assert stats['timed_out']
+        assert sorted(order) == list(range(300))
+        assert time.perf_counter() - started < 1.0
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from app.algorithms import VRPProblem, solve_vrp
+from app.algorithms.vrp import savings_routes
+from app.services.vrp_service import VRPService
+
+
+def _problem(n=30, vehicles=4, depots=1, windows=True, seed=0, capacity=40):
+    rng = np.random.default_rng(seed)
+    points = rng.random((n + depots, 2)) * 100
+    distances = np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+    ready = rng.uniform(0, 100, n) if windows else None
+    due = ready + rng.uniform(60, 120, n) if windows else None
+    return VRPProblem(
+        distances,
+        vehicle_depots=[v % depots for v in range(vehicles)],
+        capacities=[capacity] * vehicles,
+        locations=list(range(depots, n + depots)),
+        demands=rng.integers(1, 8, n).tolist(),
+        ready=ready,
+        due=due,
+        service_times=[2.0] * n
+    )
+
+
+def _assert_valid(problem, solution):
+    served = [d for route in solution.routes for d in route]
+    assert sorted(served + solution.unassigned) == list(range(problem.num_deliveries))
+    for vehicle, route in enumerate(solution.routes):
+        assert problem.evaluate(vehicle, route) is not None
+        for delivery, (_, start) in zip(route, problem.schedule(vehicle, route)):
+            assert problem.ready[delivery] <= start <= problem.due[delivery] + 1e-9
+
+
+class TestVRP:
+    @pytest.mark.parametrize("windows", [True, False])
+    def test_routes_are_feasible(self, windows):
+        problem = _problem(windows=windows)
+        solution = solve_vrp(problem, seed=1, time_budget=1.0, workers=1)
+        _assert_valid(problem, solution)
+        assert solution.total_distance == pytest.approx(
+            sum(problem.evaluate(v, route) for v, route in enumerate(solution.routes))
+        )
+
+    def test_local_search_improves_savings(self):
+        problem = _problem(n=40, windows=False)
+        routes, unassigned = savings_routes(problem, np.random.default_rng(0))
+        initial = sum(problem.evaluate(v, route) for v, route in enumerate(routes))
+        solution = solve_vrp(problem, seed=0, time_budget=1.0, workers=1)
+        assert solution.key() <= (len(unassigned), initial)
+
+    def test_multiple_depots(self):
+        problem = _problem(n=40, vehicles=6, depots=2)
+        _assert_valid(problem, solve_vrp(problem, seed=2, time_budget=1.0, workers=1))
+
+    def test_same_seed_same_plan(self):
+        problem = _problem(n=25)
+        first = solve_vrp(problem, seed=5, time_budget=2.0, restarts=3, workers=1)
+        second = solve_vrp(problem, seed=5, time_budget=2.0, restarts=3, workers=1)
+        assert first.routes == second.routes
+        assert first.unassigned == second.unassigned
+
+    def test_oversized_delivery_is_unassigned(self):
+        problem = _problem(n=5, vehicles=1, windows=False, capacity=40)
+        problem.demands[2] = 50
+        solution = solve_vrp(problem, time_budget=0.5, workers=1)
+        assert solution.unassigned == [2]
+        _assert_valid(problem, solution)
+
+    def test_restarts_share_one_pool(self):
+        service = VRPService(workers=2)
+        try:
+            pool = service._get_pool()
+            assert service._get_pool() is pool
+            problem = _problem(n=12, vehicles=2, windows=False)
+            first = solve_vrp(problem, seed=3, time_budget=2.0, restarts=2, workers=2, pool=pool)
+            second = solve_vrp(problem, seed=3, time_budget=2.0, restarts=2, workers=2, pool=pool)
+            assert first.routes == second.routes
+            _assert_valid(problem, first)
+        finally:
+            service.shutdown()
+        assert service._pool is None
+        assert VRPService(workers=1)._get_pool() is None
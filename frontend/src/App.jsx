@@ -103,6 +103,9 @@ function App() {
     astar: '#9b59b6',
     dijkstra: '#e67e22',
     bidirectional: '#e91e63',
+    bidirectional_dijkstra: '#00897b',
+    ch: '#5d4037',
+    matrix: '#607d8b',
   };
 
   return (
@@ -71,7 +71,10 @@ const RouteForm = ({ onSearch, onCompare, loading }) => {
     ucs: 'UCS - Uniform Cost (Optimal)',
     astar: 'A* - Smart Route (Recommended)',
     dijkstra: 'Dijkstra - Shortest Path',
-    bidirectional: 'Bidirectional - Two-Way Search'
+    bidirectional: 'Bidirectional - Two-Way Search',
+    bidirectional_dijkstra: 'Bidirectional Dijkstra - Two-Way Shortest Path',
+    ch: 'Contraction Hierarchies - Precomputed (Fastest Queries)',
+    matrix: 'Distance Matrix - Precomputed Lookup'
   };
 
   return (